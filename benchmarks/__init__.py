@@ -0,0 +1,101 @@
+"""
+Micro-benchmarks for the SQLAlchemy-Continuum write and read paths.
+
+Each module in this package can be run as a script, for example::
+
+    python -m benchmarks.bulk_insert
+
+The benchmarks use an in-memory SQLite database by default. Set the
+DATABASE_URL environment variable to benchmark against another database.
+"""
+
+import os
+import warnings
+from contextlib import contextmanager
+from time import perf_counter
+
+import sqlalchemy as sa
+from sqlalchemy.orm import close_all_sessions, declarative_base, sessionmaker
+
+from sqlalchemy_continuum import make_versioned, remove_versioning, versioning_manager
+from sqlalchemy_continuum.transaction import TransactionFactory
+
+warnings.simplefilter('error', sa.exc.SAWarning)
+
+
+def get_url():
+    return os.environ.get('DATABASE_URL', 'sqlite:///:memory:')
+
+
+class Benchmark:
+    """
+    Context object that sets up versioning with given options, builds the
+    models returned by `create_models` and yields a session bound to a fresh
+    database. Everything is torn down again when the context exits so that
+    several configurations can be compared within one process.
+    """
+
+    def __init__(self, create_models, options=None, plugins=None, url=None):
+        self.create_models = create_models
+        self.options = options or {}
+        self.plugins = plugins or []
+        self.url = url or get_url()
+
+    def __enter__(self):
+        self.Model = declarative_base()
+        options = {'base_classes': (self.Model,)}
+        options.update(self.options)
+        make_versioned(user_cls=None, options=options)
+        versioning_manager.plugins = self.plugins
+        versioning_manager.transaction_cls = TransactionFactory()
+
+        self.models = self.create_models(self.Model, options)
+        sa.orm.configure_mappers()
+
+        self.engine = sa.create_engine(self.url)
+        self.Model.metadata.create_all(self.engine)
+        self.connection = self.engine.connect()
+        self.session = sessionmaker(bind=self.connection)(autoflush=False)
+        return self
+
+    def __exit__(self, *args):
+        self.session.rollback()
+        self.session.close()
+        close_all_sessions()
+        remove_versioning()
+        versioning_manager.reset()
+        self.connection.close()
+        self.Model.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+
+class Timer:
+    elapsed = 0.0
+
+
+@contextmanager
+def timed():
+    timer = Timer()
+    start = perf_counter()
+    yield timer
+    timer.elapsed = perf_counter() - start
+
+
+def article_models(Model, options):
+    class Article(Model):
+        __tablename__ = 'article'
+        __versioned__ = dict(options)
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255), nullable=False)
+        content = sa.Column(sa.UnicodeText)
+
+    return {'Article': Article}
+
+
+def report(title, **values):
+    print(title)
+    for key, value in values.items():
+        if isinstance(value, float):
+            value = f'{value:.4f}'
+        print(f'   {key}={value}')
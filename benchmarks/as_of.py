@@ -0,0 +1,50 @@
+"""
+Measure the latency of reading the state of a whole table as of a past
+transaction with `as_of`, for each versioning strategy and with the temporal
+indexes of `VersionIndexPolicy`.
+"""
+
+from benchmarks import Benchmark, article_models, report, timed
+from sqlalchemy_continuum import as_of
+from sqlalchemy_continuum.table_builder import VersionIndexPolicy
+
+ARTICLES = 500
+TRANSACTIONS = 20
+LOOKUPS = 10
+
+
+def run(strategy, temporal_indexes):
+    options = {
+        'strategy': strategy,
+        'index_policy': VersionIndexPolicy(temporal_indexes=temporal_indexes),
+    }
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        articles = [Article(name=f'Article {i}') for i in range(ARTICLES)]
+        session.add_all(articles)
+        session.commit()
+        transaction_ids = []
+        for i in range(TRANSACTIONS):
+            for article in articles:
+                article.content = f'Content {i}'
+            session.commit()
+            transaction_ids.append(articles[0].versions[i + 1].transaction_id)
+
+        with timed() as elapsed:
+            for transaction_id in transaction_ids[::2][:LOOKUPS]:
+                rows = len(as_of(session, Article, transaction_id).all())
+        session.expunge_all()
+        report(
+            f'strategy={strategy!r} temporal_indexes={temporal_indexes!r} '
+            f'version_rows={ARTICLES * (TRANSACTIONS + 1)}',
+            as_of_ms=elapsed.elapsed / LOOKUPS * 1000,
+            rows=rows,
+        )
+
+
+if __name__ == '__main__':
+    for strategy in ('subquery', 'validity', 'append_only'):
+        for temporal_indexes in (False, True):
+            run(strategy, temporal_indexes)
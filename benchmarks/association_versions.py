@@ -0,0 +1,68 @@
+"""
+Measure replacing a large many-to-many collection, which writes one
+association version row for every removed and every added link.
+"""
+
+import sqlalchemy as sa
+
+from benchmarks import Benchmark, report, timed
+
+TAGS = 500
+ROUNDS = 10
+
+
+def tagged_models(Model, options):
+    class Article(Model):
+        __tablename__ = 'article'
+        __versioned__ = dict(options)
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+    article_tag = sa.Table(
+        'article_tag',
+        Model.metadata,
+        sa.Column(
+            'article_id', sa.Integer, sa.ForeignKey('article.id'), primary_key=True
+        ),
+        sa.Column('tag_id', sa.Integer, sa.ForeignKey('tag.id'), primary_key=True),
+    )
+
+    class Tag(Model):
+        __tablename__ = 'tag'
+        __versioned__ = dict(options)
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+    Article.tags = sa.orm.relationship(Tag, secondary=article_tag)
+    return {'Article': Article, 'Tag': Tag}
+
+
+def run():
+    with Benchmark(tagged_models) as bench:
+        Article = bench.models['Article']
+        Tag = bench.models['Tag']
+        session = bench.session
+
+        tag_sets = [
+            [Tag(name=f'Tag {n}-{i}') for i in range(TAGS)] for n in range(ROUNDS + 1)
+        ]
+        session.add_all(tag for tags in tag_sets for tag in tags)
+        article = Article(name='Article', tags=tag_sets[0])
+        session.add(article)
+        session.commit()
+
+        with timed() as replace:
+            for tags in tag_sets[1:]:
+                article.tags = tags
+                session.commit()
+
+        report(
+            f'association_versions tags={TAGS} rounds={ROUNDS}',
+            ms_per_collection_replace=replace.elapsed / ROUNDS * 1e3,
+        )
+
+
+if __name__ == '__main__':
+    run()
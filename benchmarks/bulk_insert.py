@@ -0,0 +1,37 @@
+"""
+Compare the ORM version session write path with the Core 'bulk_insert' write
+path for large versioned transactions.
+"""
+
+from benchmarks import Benchmark, article_models, report, timed
+
+ROWS = 10000
+
+
+def run(bulk_insert, strategy):
+    options = {'bulk_insert': bulk_insert, 'strategy': strategy}
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        articles = [Article(name=f'Article {i}') for i in range(ROWS)]
+        session.add_all(articles)
+        with timed() as insert:
+            session.commit()
+
+        for article in articles:
+            article.content = 'Updated content'
+        with timed() as update:
+            session.commit()
+
+        report(
+            f'bulk_insert={bulk_insert!r} strategy={strategy!r} rows={ROWS}',
+            insert_seconds=insert.elapsed,
+            update_seconds=update.elapsed,
+        )
+
+
+if __name__ == '__main__':
+    for strategy in ('subquery', 'validity'):
+        for bulk_insert in (False, True):
+            run(bulk_insert, strategy)
@@ -0,0 +1,51 @@
+"""
+Count the version table write statements of a request handler style
+transaction that autoflushes many times, with and without the
+'deferred_versions' option.
+"""
+
+import sqlalchemy as sa
+
+from benchmarks import Benchmark, article_models, report, timed
+
+ARTICLES = 20
+FLUSHES = 30
+
+
+def run(deferred_versions):
+    options = {'deferred_versions': deferred_versions, 'strategy': 'validity'}
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        articles = [Article(name=f'Article {i}') for i in range(ARTICLES)]
+        session.add_all(articles)
+        session.commit()
+
+        statements = []
+
+        def count_version_writes(conn, cursor, statement, *args):
+            if statement.startswith(
+                ('INSERT INTO article_version', 'UPDATE article_version')
+            ):
+                statements.append(statement)
+
+        sa.event.listen(bench.engine, 'before_cursor_execute', count_version_writes)
+        with timed() as elapsed:
+            for i in range(FLUSHES):
+                for article in articles:
+                    article.content = f'Content {i}'
+                session.flush()
+            session.commit()
+        sa.event.remove(bench.engine, 'before_cursor_execute', count_version_writes)
+
+        report(
+            f'deferred_versions={deferred_versions!r} flushes={FLUSHES}',
+            version_write_statements=len(statements),
+            seconds=elapsed.elapsed,
+        )
+
+
+if __name__ == '__main__':
+    for deferred_versions in (False, True):
+        run(deferred_versions)
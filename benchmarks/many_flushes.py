@@ -0,0 +1,39 @@
+"""
+Measure the cost of a flush late in a long transaction with many flushes. The
+per flush cost should only depend on the number of changes in that flush, not
+on the number of changes made earlier within the same transaction.
+"""
+
+from benchmarks import Benchmark, article_models, report, timed
+
+FLUSHES = 5000
+SAMPLE = 500
+
+
+def run():
+    with Benchmark(article_models, {'strategy': 'subquery'}) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        with timed() as first:
+            for i in range(SAMPLE):
+                session.add(Article(name=f'Article {i}'))
+                session.flush()
+        for i in range(SAMPLE, FLUSHES - SAMPLE):
+            session.add(Article(name=f'Article {i}'))
+            session.flush()
+        with timed() as last:
+            for i in range(FLUSHES - SAMPLE, FLUSHES):
+                session.add(Article(name=f'Article {i}'))
+                session.flush()
+        session.commit()
+
+        report(
+            f'many_flushes flushes={FLUSHES}',
+            first_flushes_us_per_flush=first.elapsed / SAMPLE * 1e6,
+            last_flushes_us_per_flush=last.elapsed / SAMPLE * 1e6,
+        )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,62 @@
+"""
+Measure the commit throughput of many threads inserting and updating
+versioned rows concurrently, each thread using its own connection, as in
+tests/test_validity_strategy_multithreaded.py. Every commit looks up,
+creates and clears a unit of work in the process-global manager.
+
+The database is a temporary SQLite file (unless DATABASE_URL is set) since
+each connection of an in-memory SQLite database is a separate database.
+"""
+
+import os
+import tempfile
+from threading import Thread
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import Benchmark, article_models, report, timed
+from sqlalchemy_continuum import versioning_manager
+
+COMMITS = 200
+THREAD_COUNTS = (1, 4, 16)
+
+
+def insert_update_articles(bench, name):
+    Article = bench.models['Article']
+    with bench.engine.connect() as connection:
+        session = sessionmaker(bind=connection)(autoflush=False)
+        for i in range(COMMITS // 2):
+            article = Article(name=f'Article {name}-{i}')
+            session.add(article)
+            session.commit()
+            article.name += '.2'
+            session.commit()
+        session.close()
+
+
+def run(threads, url):
+    with Benchmark(article_models, {'strategy': 'validity'}, url=url) as bench:
+        workers = [
+            Thread(target=insert_update_articles, args=(bench, n))
+            for n in range(threads)
+        ]
+        with timed() as elapsed:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        report(
+            f'threads={threads} commits={threads * COMMITS}',
+            commits_per_second=threads * COMMITS / elapsed.elapsed,
+            units_of_work_left=len(versioning_manager.units_of_work),
+        )
+
+
+if __name__ == '__main__':
+    for threads in THREAD_COUNTS:
+        with tempfile.TemporaryDirectory() as directory:
+            url = os.environ.get('DATABASE_URL') or (
+                f'sqlite:///{os.path.join(directory, "benchmark.db")}'
+            )
+            run(threads, url)
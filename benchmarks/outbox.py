@@ -0,0 +1,43 @@
+"""
+Measure the commit latency of small versioned transactions with and without
+the 'outbox' option, and the time the outbox worker takes to expand the
+queued entries into the version tables.
+"""
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.outbox import OutboxWorker
+
+from benchmarks import Benchmark, article_models, report, timed
+
+TRANSACTIONS = 500
+ARTICLES = 5
+
+
+def run(outbox):
+    options = {'outbox': outbox, 'strategy': 'validity'}
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        articles = [Article(name=f'Article {i}') for i in range(ARTICLES)]
+        session.add_all(articles)
+        session.commit()
+
+        with timed() as elapsed:
+            for i in range(TRANSACTIONS):
+                for article in articles:
+                    article.content = f'Content {i}'
+                session.commit()
+
+        results = {'commit_ms': elapsed.elapsed / TRANSACTIONS * 1000}
+        if outbox:
+            worker = OutboxWorker(versioning_manager, bench.engine)
+            with timed() as drained:
+                worker.drain()
+            results['drain_seconds'] = drained.elapsed
+        report(f'outbox={outbox!r} transactions={TRANSACTIONS}', **results)
+
+
+if __name__ == '__main__':
+    for outbox in (False, True):
+        run(outbox)
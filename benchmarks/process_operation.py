@@ -0,0 +1,74 @@
+"""
+Measure the per row cost of UnitOfWork.process_operation, which runs for every
+changed versioned object on every flush, and compare the compiled versioning
+plan lookup with the uncached mapper inspection it replaces.
+"""
+
+from time import perf_counter
+
+import sqlalchemy as sa
+
+from benchmarks import Benchmark, report
+from sqlalchemy_continuum import Operation, versioning_manager
+from sqlalchemy_continuum.utils import versioned_column_properties
+
+ROWS = 20000
+
+
+def wide_models(Model, options):
+    columns = {f'column_{i}': sa.Column(sa.Unicode(50)) for i in range(20)}
+
+    Article = type(
+        'Article',
+        (Model,),
+        {
+            '__tablename__': 'article',
+            '__versioned__': dict(options),
+            'id': sa.Column(sa.Integer, autoincrement=True, primary_key=True),
+            **columns,
+        },
+    )
+    return {'Article': Article}
+
+
+def run():
+    with Benchmark(wide_models, {'strategy': 'validity'}) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        articles = [
+            Article(**{f'column_{i}': f'value {i}' for i in range(20)})
+            for n in range(ROWS)
+        ]
+        session.add_all(articles)
+        session.flush()
+        uow = versioning_manager.unit_of_work(session)
+        operations = [Operation(article, Operation.UPDATE) for article in articles]
+
+        start = perf_counter()
+        for operation in operations:
+            uow.process_operation(operation)
+        process_operation = perf_counter() - start
+
+        start = perf_counter()
+        for article in articles:
+            versioning_manager.plan(Article).versioned_keys
+        plan_lookup = perf_counter() - start
+
+        start = perf_counter()
+        for article in articles:
+            [prop.key for prop in versioned_column_properties(article)]
+            versioning_manager.option(article, 'strategy')
+            versioning_manager.option(article, 'transaction_column_name')
+        uncached_lookup = perf_counter() - start
+
+        report(
+            f'process_operation rows={ROWS} columns=21',
+            process_operation_us_per_row=process_operation / ROWS * 1e6,
+            plan_lookup_us_per_row=plan_lookup / ROWS * 1e6,
+            uncached_lookup_us_per_row=uncached_lookup / ROWS * 1e6,
+        )
+
+
+if __name__ == '__main__':
+    run()
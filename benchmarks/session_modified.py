@@ -0,0 +1,37 @@
+"""
+Measure the latency of a flush that changes a single versioned row while the
+session's identity map holds an increasing number of clean, loaded objects.
+"""
+
+from benchmarks import Benchmark, article_models, report, timed
+
+SIZES = [1000, 10000, 100000]
+FLUSHES = 50
+
+
+def run(size):
+    with Benchmark(article_models) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        session.add_all([Article(name=f'Article {i}') for i in range(size)])
+        session.commit()
+        articles = session.query(Article).all()
+
+        with timed() as flushes:
+            for i in range(FLUSHES):
+                articles[i].name = 'Updated'
+                session.flush()
+        with timed() as commit:
+            session.commit()
+
+        report(
+            f'identity_map_size={size}',
+            flush_ms=flushes.elapsed / FLUSHES * 1000,
+            commit_ms=commit.elapsed * 1000,
+        )
+
+
+if __name__ == '__main__':
+    for size in SIZES:
+        run(size)
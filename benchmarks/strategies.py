@@ -0,0 +1,54 @@
+"""
+Compare the 'subquery', 'validity' and 'append_only' versioning strategies:
+the commit latency of small versioned transactions, the number of version
+rows rewritten by them (each rewritten row is a dead tuple in PostgreSQL)
+and the latency of looking up the previous version of a version object.
+"""
+
+import sqlalchemy as sa
+
+from benchmarks import Benchmark, article_models, report, timed
+
+TRANSACTIONS = 500
+ARTICLES = 5
+
+
+def run(strategy):
+    options = {'strategy': strategy}
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        articles = [Article(name=f'Article {i}') for i in range(ARTICLES)]
+        session.add_all(articles)
+        session.commit()
+
+        rewritten = []
+
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('UPDATE article_version'):
+                rewritten.append(cursor.rowcount)
+
+        sa.event.listen(bench.engine, 'after_cursor_execute', count_updates)
+        with timed() as elapsed:
+            for i in range(TRANSACTIONS):
+                for article in articles:
+                    article.content = f'Content {i}'
+                session.commit()
+        sa.event.remove(bench.engine, 'after_cursor_execute', count_updates)
+
+        versions = articles[0].versions.all()
+        with timed() as previous:
+            for version in versions[1:]:
+                version.previous
+        report(
+            f'strategy={strategy!r} transactions={TRANSACTIONS}',
+            commit_ms=elapsed.elapsed / TRANSACTIONS * 1000,
+            rewritten_rows=sum(rewritten),
+            previous_ms=previous.elapsed / (len(versions) - 1) * 1000,
+        )
+
+
+if __name__ == '__main__':
+    for strategy in ('subquery', 'validity', 'append_only'):
+        run(strategy)
@@ -0,0 +1,52 @@
+"""
+Measure the peak resident memory of importing a large number of rows within a
+single versioned transaction, with and without the 'streaming' option.
+
+Each configuration runs in its own process since peak RSS never shrinks. The
+database is a temporary SQLite file (unless DATABASE_URL is set) so that the
+stored rows themselves do not count towards the measured memory. The import
+expunges the imported objects after every flush, as a bounded memory import
+would. Set BENCHMARK_ROWS to change the number of imported rows.
+"""
+
+import os
+import resource
+import tempfile
+from multiprocessing import get_context
+
+from benchmarks import Benchmark, article_models, report, timed
+
+ROWS = int(os.environ.get('BENCHMARK_ROWS', 1000000))
+BATCH = 1000
+
+
+def run(streaming, url):
+    with Benchmark(article_models, {'streaming': streaming}, url=url) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        with timed() as elapsed:
+            for i in range(ROWS):
+                session.add(Article(name=f'Article {i}'))
+                if i % BATCH == BATCH - 1:
+                    session.flush()
+                    session.expunge_all()
+            session.commit()
+
+        report(
+            f'streaming={streaming} rows={ROWS}',
+            peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            rows_per_second=ROWS / elapsed.elapsed,
+        )
+
+
+if __name__ == '__main__':
+    context = get_context('spawn')
+    for streaming in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            url = os.environ.get('DATABASE_URL') or (
+                f'sqlite:///{os.path.join(directory, "benchmark.db")}'
+            )
+            process = context.Process(target=run, args=(streaming, url))
+            process.start()
+            process.join()
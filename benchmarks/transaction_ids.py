@@ -0,0 +1,35 @@
+"""
+Measure transactions per second for many small versioned commits with and
+without transaction id preallocation. Preallocation requires PostgreSQL, so
+DATABASE_URL has to point at a PostgreSQL database.
+"""
+
+import sqlalchemy as sa
+
+from benchmarks import Benchmark, article_models, get_url, report, timed
+
+COMMITS = 3000
+
+
+def run(block_size):
+    options = {'transaction_id_block_size': block_size}
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        with timed() as commits:
+            for i in range(COMMITS):
+                session.add(Article(name=f'Article {i}'))
+                session.commit()
+
+        report(
+            f'transaction_id_block_size={block_size!r} commits={COMMITS}',
+            transactions_per_second=COMMITS / commits.elapsed,
+        )
+
+
+if __name__ == '__main__':
+    if sa.engine.make_url(get_url()).get_backend_name() != 'postgresql':
+        raise SystemExit('Set DATABASE_URL to a PostgreSQL database.')
+    for block_size in (None, 100):
+        run(block_size)
@@ -0,0 +1,68 @@
+"""
+Compare bulk flushes of an unversioned model with and without versioning
+enabled. Operation tracking listeners are only attached to versioned mappers
+so flushing unversioned models should cost the same in both cases.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from benchmarks import Benchmark, article_models, get_url, report, timed
+
+ROWS = 20000
+BATCH = 1000
+
+
+def item_models(Model, options):
+    class Item(Model):
+        __tablename__ = 'item'
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255), nullable=False)
+
+    models = article_models(Model, options)
+    models['Item'] = Item
+    return models
+
+
+def flush_items(Item, session):
+    with timed() as elapsed:
+        for index in range(0, ROWS, BATCH):
+            session.add_all(
+                [Item(name=f'Item {i}') for i in range(index, index + BATCH)]
+            )
+            session.flush()
+        items = session.query(Item).all()
+        for item in items:
+            item.name = item.name.upper()
+        session.flush()
+        for item in items:
+            session.delete(item)
+        session.flush()
+        session.commit()
+    return elapsed.elapsed
+
+
+def run_without_versioning():
+    Model = declarative_base()
+    Item = item_models(Model, {})['Item']
+    engine = sa.create_engine(get_url())
+    Model.metadata.create_all(engine)
+    with engine.connect() as connection:
+        session = sessionmaker(bind=connection)(autoflush=False)
+        seconds = flush_items(Item, session)
+        session.close()
+    Model.metadata.drop_all(engine)
+    engine.dispose()
+    report(f'versioning=False rows={ROWS}', seconds=seconds)
+
+
+def run_with_versioning():
+    with Benchmark(item_models) as bench:
+        seconds = flush_items(bench.models['Item'], bench.session)
+    report(f'versioning=True rows={ROWS}', seconds=seconds)
+
+
+if __name__ == '__main__':
+    run_without_versioning()
+    run_with_versioning()
@@ -0,0 +1,44 @@
+"""
+Measure the latency of version traversal (index, previous and next) on an
+entity with a long version history, with and without the 'version_chain'
+option.
+"""
+
+from benchmarks import Benchmark, article_models, report, timed
+
+VERSIONS = 2000
+LOOKUPS = 200
+
+
+def run(strategy, version_chain):
+    options = {'strategy': strategy, 'version_chain': version_chain}
+    with Benchmark(article_models, options) as bench:
+        Article = bench.models['Article']
+        session = bench.session
+
+        article = Article(name='Article')
+        session.add(article)
+        session.commit()
+        for i in range(VERSIONS - 1):
+            article.content = f'Content {i}'
+            session.commit()
+
+        versions = article.versions.all()[-LOOKUPS:]
+        results = {}
+        for attr in ('index', 'previous', 'next'):
+            session.expire_all()
+            with timed() as elapsed:
+                for version in versions:
+                    getattr(version, attr)
+            results[f'{attr}_ms'] = elapsed.elapsed / LOOKUPS * 1000
+        report(
+            f'strategy={strategy!r} version_chain={version_chain!r} '
+            f'versions={VERSIONS}',
+            **results,
+        )
+
+
+if __name__ == '__main__':
+    for strategy in ('subquery', 'validity'):
+        for version_chain in (False, True):
+            run(strategy, version_chain)
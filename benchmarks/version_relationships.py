@@ -0,0 +1,124 @@
+"""
+Measure reading the reflected relationships of a list of version objects,
+accessing each relationship lazily versus loading them in batches with
+`load_version_relationships`, and accessing the same relationships
+repeatedly. The in-memory SQLite default has no network round trips; set
+DATABASE_URL to see the effect of the saved queries.
+"""
+
+import sqlalchemy as sa
+
+from benchmarks import Benchmark, report, timed
+from sqlalchemy_continuum import load_version_relationships, version_class
+
+ARTICLES = 200
+TAGS = 3
+ACCESSES = 5
+
+
+def models(Model, options):
+    class Author(Model):
+        __tablename__ = 'author'
+        __versioned__ = dict(options)
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+    class Article(Model):
+        __tablename__ = 'article'
+        __versioned__ = dict(options)
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+        author_id = sa.Column(sa.Integer, sa.ForeignKey(Author.id))
+        author = sa.orm.relationship(Author)
+
+    class Tag(Model):
+        __tablename__ = 'tag'
+        __versioned__ = dict(options)
+
+        id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+        article_id = sa.Column(sa.Integer, sa.ForeignKey(Article.id))
+        article = sa.orm.relationship(Article, backref='tags')
+
+    return {'Author': Author, 'Article': Article, 'Tag': Tag}
+
+
+def run(strategy, batched):
+    with Benchmark(models, {'strategy': strategy}) as bench:
+        Article = bench.models['Article']
+        Author = bench.models['Author']
+        Tag = bench.models['Tag']
+        session = bench.session
+
+        author = Author(name='Author')
+        for i in range(ARTICLES):
+            article = Article(name=f'Article {i}', author=author)
+            article.tags = [Tag(name=f'Tag {j}') for j in range(TAGS)]
+            session.add(article)
+        session.commit()
+
+        queries = []
+        sa.event.listen(
+            bench.engine,
+            'before_cursor_execute',
+            lambda *args: queries.append(args[2]),
+        )
+        ArticleVersion = version_class(Article)
+        results = {}
+        # The first round compiles the statements, the second one reuses the
+        # compiled statements from the cache.
+        for phase in ('cold', 'warm'):
+            session.expire_all()
+            queries.clear()
+            with timed() as elapsed:
+                versions = session.query(ArticleVersion).all()
+                if batched:
+                    load_version_relationships(versions, 'tags', 'author')
+                for version in versions:
+                    version.author.name
+                    [tag.name for tag in version.tags]
+            results[f'{phase}_ms'] = elapsed.elapsed * 1000
+        report(
+            f'strategy={strategy!r} batched={batched!r} versions={ARTICLES}',
+            queries=len(queries),
+            **results,
+        )
+
+
+def run_repeated(strategy):
+    with Benchmark(models, {'strategy': strategy}) as bench:
+        Article = bench.models['Article']
+        Author = bench.models['Author']
+        Tag = bench.models['Tag']
+        session = bench.session
+
+        author = Author(name='Author')
+        for i in range(ARTICLES):
+            article = Article(name=f'Article {i}', author=author)
+            article.tags = [Tag(name=f'Tag {j}') for j in range(TAGS)]
+            session.add(article)
+        session.commit()
+
+        versions = session.query(version_class(Article)).all()
+        results = {}
+        with timed() as elapsed:
+            for version in versions:
+                version.author.name
+                [tag.name for tag in version.tags]
+        results['first_access_ms'] = elapsed.elapsed * 1000
+        with timed() as elapsed:
+            for _ in range(ACCESSES - 1):
+                for version in versions:
+                    version.author.name
+                    [tag.name for tag in version.tags]
+        results['repeated_access_ms'] = elapsed.elapsed * 1000 / (ACCESSES - 1)
+        report(f'strategy={strategy!r} repeated versions={ARTICLES}', **results)
+
+
+if __name__ == '__main__':
+    for strategy in ('subquery', 'validity'):
+        for batched in (False, True):
+            run(strategy, batched)
+        run_repeated(strategy)
@@ -4,8 +4,17 @@ from .exc import ClassNotVersioned as ClassNotVersioned
 from .exc import ImproperlyConfigured as ImproperlyConfigured
 from .manager import VersioningManager
 from .operation import Operation as Operation
+from .relationship_builder import (
+    load_version_relationships as load_version_relationships,
+)
 from .transaction import TransactionFactory as TransactionFactory
 from .unit_of_work import UnitOfWork as UnitOfWork
+from .utils import (
+    as_of as as_of,
+)
+from .utils import (
+    as_of_option as as_of_option,
+)
 from .utils import (
     changeset as changeset,
 )
@@ -24,6 +33,9 @@ from .utils import (
 from .utils import (
     parent_class as parent_class,
 )
+from .utils import (
+    resolve_transaction_id as resolve_transaction_id,
+)
 from .utils import (
     transaction_class as transaction_class,
 )
@@ -80,7 +92,6 @@ def make_versioned(
 
     manager.user_cls = user_cls
     manager.apply_class_configuration_listeners(mapper)
-    manager.track_operations(mapper)
     manager.track_session(session)
 
     sa.event.listen(
@@ -110,9 +121,9 @@ def remove_versioning(
     :param manager:
         SQLAlchemy-Continuum versioning manager.
     """
+    manager.remove_versioned_mappers_tracking()
     manager.reset()
     manager.remove_class_configuration_listeners(mapper)
-    manager.remove_operations_tracking(mapper)
     manager.remove_session_tracking(session)
     sa.event.remove(
         sa.engine.Engine, 'before_execute', manager.track_association_operations
@@ -0,0 +1,127 @@
+"""
+Helpers for reading version history with
+:class:`~sqlalchemy.ext.asyncio.AsyncSession`.
+
+Under asyncio SQLAlchemy can not emit lazy loads implicitly, so the history
+properties of version objects and the ``versions`` relationship of versioned
+objects have awaitable counterparts here.
+"""
+
+from collections import defaultdict
+
+import sqlalchemy as sa
+from sqlalchemy.util import greenlet_spawn
+
+from .utils import tx_column_name, version_class
+
+#: Maximum number of objects whose versions are loaded with a single query.
+batch_size = 500
+
+
+async def fetch_previous(version):
+    """
+    Return the previous version of given version object.
+
+    :param version: Version object
+    """
+    return await version.awaitable_attrs.previous
+
+
+async def fetch_next(version):
+    """
+    Return the next version of given version object.
+
+    :param version: Version object
+    """
+    return await version.awaitable_attrs.next
+
+
+async def fetch_index(version):
+    """
+    Return the index of given version object in its version history.
+
+    :param version: Version object
+    """
+    return await version.awaitable_attrs.index
+
+
+async def fetch_changeset(version):
+    """
+    Return the changeset of given version object.
+
+    :param version: Version object
+    """
+    return await version.awaitable_attrs.changeset
+
+
+async def fetch_versions(obj):
+    """
+    Return a list of all versions of given versioned object ordered by
+    transaction.
+
+    :param obj: Versioned object
+    """
+    return await greenlet_spawn(lambda: obj.versions.all())
+
+
+async def load_versions(session, objects):
+    """
+    Load the versions of given versioned objects with one query per class
+    (and per `batch_size` objects) instead of one query per object.
+
+    Returns a list of version lists in the same order as `objects`, each
+    ordered by transaction.
+
+    ::
+
+        articles = (await session.scalars(sa.select(Article))).all()
+        for article, versions in zip(
+            articles, await load_versions(session, articles)
+        ):
+            ...
+
+    :param session: AsyncSession object
+    :param objects: Versioned objects
+    """
+    return await session.run_sync(_load_versions, objects)
+
+
+def _load_versions(session, objects):
+    objects = list(objects)
+    identities = defaultdict(set)
+    for obj in objects:
+        identities[obj.__class__].add(_identity(obj))
+
+    versions = {}
+    for cls, class_identities in identities.items():
+        version_cls = version_class(cls)
+        keys = _primary_key_names(cls)
+        columns = [getattr(version_cls, key) for key in keys]
+        if len(columns) == 1:
+            column = columns[0]
+            values = [identity[0] for identity in class_identities]
+        else:
+            column = sa.tuple_(*columns)
+            values = list(class_identities)
+
+        for start in range(0, len(values), batch_size):
+            query = (
+                sa.select(version_cls)
+                .where(column.in_(values[start : start + batch_size]))
+                .order_by(getattr(version_cls, tx_column_name(cls)))
+            )
+            for version in session.scalars(query):
+                identity = tuple(getattr(version, key) for key in keys)
+                versions.setdefault((cls, identity), []).append(version)
+
+    return [versions.get((obj.__class__, _identity(obj)), []) for obj in objects]
+
+
+def _primary_key_names(cls):
+    return [
+        key for key, column in sa.inspect(cls).columns.items() if column.primary_key
+    ]
+
+
+def _identity(obj):
+    return tuple(getattr(obj, key) for key in _primary_key_names(obj.__class__))
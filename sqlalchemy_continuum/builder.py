@@ -8,6 +8,7 @@ from ._compat import get_declarative_base
 
 from .dialects.postgresql import create_versioning_trigger_listeners
 from .model_builder import ModelBuilder
+from .plan import VersioningPlan
 from .relationship_builder import RelationshipBuilder
 from .table_builder import TableBuilder
 
@@ -121,7 +122,9 @@ class Builder:
 
     def instrument_versioned_classes(self, mapper, cls):
         """
-        Collect versioned class and add it to pending_classes list.
+        Collect versioned class and add it to pending_classes list. The SQL
+        operations tracking listeners are attached to the mapper of each
+        versioned class.
 
         :mapper mapper: SQLAlchemy mapper object
         :cls cls: SQLAlchemy declarative class
@@ -129,13 +132,14 @@ class Builder:
         if not self.manager.options['versioning']:
             return
 
-        if hasattr(cls, '__versioned__'):
+        if hasattr(cls, '__versioned__') and not hasattr(cls, '__version_parent__'):
             if (
                 not cls.__versioned__.get('class')
                 and cls not in self.manager.pending_classes
             ):
                 self.manager.pending_classes.append(cls)
                 self.manager.metadata = cls.metadata
+            self.manager.track_versioned_mapper(mapper)
 
         if hasattr(cls, '__version_parent__'):
             parent = cls.__version_parent__
@@ -148,13 +152,15 @@ class Builder:
             cls = self.manager.pending_classes[0]
             self.manager.declarative_base = get_declarative_base(cls)
             self.manager.create_transaction_model()
+            if self.manager.options['outbox']:
+                self.manager.create_outbox_model()
             self.manager.plugins.after_build_tx_class(self.manager)
 
     @prevent_reentry
     def configure_versioned_classes(self):
         """
         Configures all versioned classes that were collected during
-        instrumentation process. The configuration has 6 steps:
+        instrumentation process. The configuration has 7 steps:
 
         1. Build tables for version models.
         2. Build the actual version model declarative classes.
@@ -163,6 +169,7 @@ class Builder:
            does not create multiple version classes
         5. Build aliases for columns.
         6. Assign all versioned attributes to use active history.
+        7. Compile versioning plans for the flush hot path.
 
         """
         if not self.manager.options['versioning']:
@@ -185,6 +192,19 @@ class Builder:
         self.build_relationships(pending_classes_copies)
         self.enable_active_history(pending_classes_copies)
         self.create_column_aliases(pending_classes_copies)
+        self.build_plans(pending_classes_copies)
+        self.manager.audit_table_list = None
+
+    def build_plans(self, versioned_classes):
+        """
+        Compile versioning plans for all versioned classes.
+
+        :param versioned_classes: list of configured versioned classes
+        """
+        for cls in versioned_classes:
+            if not self.manager.option(cls, 'versioning'):
+                continue
+            self.manager.plans[cls] = VersioningPlan(self.manager, cls)
 
     def enable_active_history(self, version_classes):
         """
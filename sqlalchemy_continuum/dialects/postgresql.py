@@ -79,6 +79,18 @@ $$
 LANGUAGE plpgsql
 """
 
+previous_transaction_sql = """
+(
+    SELECT MAX({transaction_column}) FROM {version_table_name}
+    WHERE {transaction_column} < transaction_id_value AND {primary_key_criteria}
+)"""
+
+version_number_sql = """
+(
+    SELECT COALESCE(MAX({version_number_column}), 0) + 1 FROM {version_table_name}
+    WHERE {transaction_column} < transaction_id_value AND {primary_key_criteria}
+)"""
+
 validity_sql = """
 UPDATE {version_table_name}
 SET {end_transaction_column} = transaction_id_value
@@ -108,11 +120,15 @@ class SQLConstruct:
         update_validity_for_tables=None,
         use_property_mod_tracking=False,
         end_transaction_column_name=None,
+        previous_transaction_column_name=None,
+        version_number_column_name=None,
     ):
         self.update_validity_for_tables = update_validity_for_tables
         self.operation_type_column_name = operation_type_column_name
         self.transaction_column_name = transaction_column_name
         self.end_transaction_column_name = end_transaction_column_name
+        self.previous_transaction_column_name = previous_transaction_column_name
+        self.version_number_column_name = version_number_column_name
         self.version_table_name_format = version_table_name_format
         self.use_property_mod_tracking = use_property_mod_tracking
         self.table = table
@@ -150,6 +166,7 @@ class SQLConstruct:
     @classmethod
     def for_manager(self, manager, cls):
         strategy = manager.option(cls, 'strategy')
+        version_chain = manager.option(cls, 'version_chain')
         operation_type_column = manager.option(cls, 'operation_type_column_name')
         excluded_columns = [
             c.name
@@ -166,6 +183,16 @@ class SQLConstruct:
             end_transaction_column_name=manager.option(
                 cls, 'end_transaction_column_name'
             ),
+            previous_transaction_column_name=(
+                manager.option(cls, 'previous_transaction_column_name')
+                if strategy == 'append_only' or version_chain
+                else None
+            ),
+            version_number_column_name=(
+                manager.option(cls, 'version_number_column_name')
+                if version_chain
+                else None
+            ),
             use_property_mod_tracking=uses_property_mod_tracking(manager),
             excluded_columns=excluded_columns,
             table=cls.__table__,
@@ -205,8 +232,20 @@ class UpsertSQL(SQLConstruct):
         column_names = [f'"{c.name}"' for c in self.columns]
         if self.use_property_mod_tracking:
             column_names += [f'{c.name}_mod' for c in self.columns_without_pks]
+        column_names += [f'"{name}"' for name in self.chain_column_names]
         return column_names
 
+    @property
+    def chain_column_names(self):
+        return [
+            name
+            for name in (
+                self.previous_transaction_column_name,
+                self.version_number_column_name,
+            )
+            if name is not None
+        ]
+
     def build_primary_key_criteria(self):
         return [f'"{c.name}" = NEW."{c.name}"' for c in self.columns if c.primary_key]
 
@@ -225,6 +264,20 @@ class UpsertSQL(SQLConstruct):
         values = self.build_values()
         if self.use_property_mod_tracking:
             values += self.build_mod_tracking_values()
+        return values + self.build_chain_values()
+
+    def build_chain_values(self):
+        params = {
+            'version_table_name': self.version_table_name,
+            'transaction_column': self.transaction_column_name,
+            'version_number_column': self.version_number_column_name,
+            'primary_key_criteria': ' AND '.join(self.build_primary_key_criteria()),
+        }
+        values = []
+        if self.previous_transaction_column_name is not None:
+            values.append(previous_transaction_sql.format(**params))
+        if self.version_number_column_name is not None:
+            values.append(version_number_sql.format(**params))
         return values
 
     def build_values(self):
@@ -454,6 +507,8 @@ def create_trigger(
     excluded_columns=None,
     use_property_mod_tracking=True,
     end_transaction_column_name=None,
+    previous_transaction_column_name=None,
+    version_number_column_name=None,
 ):
     params = {
         'table': table,
@@ -464,6 +519,8 @@ def create_trigger(
         'excluded_columns': excluded_columns,
         'use_property_mod_tracking': use_property_mod_tracking,
         'end_transaction_column_name': end_transaction_column_name,
+        'previous_transaction_column_name': previous_transaction_column_name,
+        'version_number_column_name': version_number_column_name,
     }
     session.execute(sa.text(str(CreateTriggerFunctionSQL(**params))))
     session.execute(sa.text(str(CreateTriggerSQL(**params))))
@@ -22,9 +22,11 @@ class VersionExpressionReflector(sa.sql.visitors.ReplacingCloningVisitor):
                 column in self.relationship.local_columns
                 and table == self.parent.__table__
             ):
-                reflected_column = bindparam(
-                    column.key, getattr(self.parent, column.key)
-                )
+                value = getattr(self.parent, column.key)
+                if isinstance(self.parent, sa.orm.util.AliasedClass):
+                    reflected_column = value.expression
+                else:
+                    reflected_column = bindparam(column.key, value)
 
         return reflected_column
 
@@ -3,7 +3,13 @@ import operator
 import sqlalchemy as sa
 from ._compat import get_primary_keys, identity
 
-from .utils import end_tx_column_name, tx_column_name
+from .utils import (
+    end_tx_column_name,
+    option,
+    previous_tx_column_name,
+    tx_column_name,
+    version_number_column_name,
+)
 
 
 def parent_identity(obj_or_class):
@@ -92,6 +98,7 @@ class VersionObjectFetcher:
 
     def _next_prev_query(self, obj, next_or_prev='next'):
         session = sa.orm.object_session(obj)
+        op = operator.gt if next_or_prev == 'next' else operator.lt
 
         subquery = self._transaction_id_subquery(obj, next_or_prev=next_or_prev)
         subquery = subquery.scalar_subquery()
@@ -99,6 +106,13 @@ class VersionObjectFetcher:
         return session.query(obj.__class__).filter(
             sa.and_(
                 getattr(obj.__class__, tx_column_name(obj)) == subquery,
+                # Redundant, but a constant bound on the transaction column
+                # lets PostgreSQL prune the partitions of partitioned version
+                # tables at planning time.
+                op(
+                    getattr(obj.__class__, tx_column_name(obj)),
+                    getattr(obj, tx_column_name(obj)),
+                ),
                 *parent_criteria(obj),
             )
         )
@@ -171,6 +185,78 @@ class ValidityFetcher(VersionObjectFetcher):
             sa.and_(
                 getattr(obj.__class__, end_tx_column_name(obj))
                 == getattr(obj, tx_column_name(obj)),
+                getattr(obj.__class__, tx_column_name(obj))
+                < getattr(obj, tx_column_name(obj)),
+                *parent_criteria(obj),
+            )
+        )
+
+
+class ChainFetcher(VersionObjectFetcher):
+    """
+    Fetcher for version classes whose version rows point back at their
+    previous version, either because the 'append_only' strategy is used or
+    because the 'version_chain' option is enabled. Previous and next versions
+    are fetched with point lookups. With the 'version_chain' option the index
+    of a version is read from its version number column.
+
+    Version rows written before the 'version_chain' option was enabled have
+    no previous transaction until :func:`update_version_chain_columns` has
+    been run. The previous and next versions of such rows are fetched with
+    the queries of the 'subquery' strategy. So are those of first versions
+    without a version number, which can not be told apart from them.
+    """
+
+    def is_chained(self, obj):
+        if getattr(obj, previous_tx_column_name(obj)) is not None:
+            return True
+        return (
+            option(obj, 'version_chain')
+            and getattr(obj, version_number_column_name(obj)) == 1
+        )
+
+    def index(self, obj):
+        """
+        Return the index of this version in the version history.
+        """
+        if option(obj, 'version_chain'):
+            version_number = getattr(obj, version_number_column_name(obj))
+            if version_number is not None:
+                return version_number - 1
+        return VersionObjectFetcher.index(self, obj)
+
+    def next_query(self, obj):
+        """
+        Returns the query that fetches the next version relative to this
+        version in the version history.
+        """
+        if not self.is_chained(obj):
+            return self._next_prev_query(obj, 'next')
+        session = sa.orm.object_session(obj)
+
+        return session.query(obj.__class__).filter(
+            sa.and_(
+                getattr(obj.__class__, previous_tx_column_name(obj))
+                == getattr(obj, tx_column_name(obj)),
+                getattr(obj.__class__, tx_column_name(obj))
+                > getattr(obj, tx_column_name(obj)),
+                *parent_criteria(obj),
+            )
+        )
+
+    def previous_query(self, obj):
+        """
+        Returns the query that fetches the previous version relative to this
+        version in the version history.
+        """
+        if not self.is_chained(obj):
+            return self._next_prev_query(obj, 'previous')
+        session = sa.orm.object_session(obj)
+
+        return session.query(obj.__class__).filter(
+            sa.and_(
+                getattr(obj.__class__, tx_column_name(obj))
+                == getattr(obj, previous_tx_column_name(obj)),
                 *parent_criteria(obj),
             )
         )
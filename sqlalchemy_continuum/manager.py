@@ -5,12 +5,18 @@ from sqlalchemy.orm import object_session
 from ._compat import get_column_key
 
 from .builder import Builder
-from .fetcher import SubqueryFetcher, ValidityFetcher
+from .fetcher import ChainFetcher, SubqueryFetcher, ValidityFetcher
 from .operation import Operation
+from .outbox import OutboxFactory
+from .plan import VersioningPlan
 from .plugins import PluginCollection
-from .transaction import TransactionFactory
+from .transaction import (
+    TransactionFactory,
+    TransactionIdAllocator,
+    TransactionResolver,
+)
 from .unit_of_work import UnitOfWork
-from .utils import is_modified, is_versioned, version_table
+from .utils import is_modified, is_session_modified, is_versioned, version_table
 
 
 def tracked_operation(func):
@@ -19,7 +25,12 @@ def tracked_operation(func):
         if not is_versioned(target):
             return
         session = object_session(target)
-        uow = self._uow_from_conn(session.connection())
+        try:
+            uow = self._uow_from_conn(session.connection())
+        except KeyError:
+            # Changes made during the flush itself (such as orphan deletes)
+            # can reach a session that had no versioned changes beforehand.
+            uow = self.unit_of_work(session)
         return func(self, uow, target)
 
     return wrapper
@@ -85,9 +96,21 @@ class VersioningManager:
             'create_tables': True,
             'transaction_column_name': 'transaction_id',
             'end_transaction_column_name': 'end_transaction_id',
+            'previous_transaction_column_name': 'previous_transaction_id',
+            'version_number_column_name': 'version_number',
             'operation_type_column_name': 'operation_type',
             'strategy': 'validity',
+            'version_chain': False,
             'use_module_name': False,
+            'bulk_insert': False,
+            'streaming': False,
+            'deferred_versions': False,
+            'transaction_id_block_size': None,
+            'outbox': False,
+            'audit_bind': None,
+            'read_router': None,
+            'index_policy': None,
+            'partition_size': None,
         }
         if plugins is None:
             self.plugins = []
@@ -102,9 +125,14 @@ class VersioningManager:
     @plugins.setter
     def plugins(self, plugin_collection):
         self._plugins = PluginCollection(plugin_collection)
+        self.plans = {}
+        self.audit_table_list = None
 
     def fetcher(self, obj):
-        if self.option(obj, 'strategy') == 'subquery':
+        strategy = self.option(obj, 'strategy')
+        if strategy == 'append_only' or self.option(obj, 'version_chain'):
+            return ChainFetcher(self)
+        elif strategy == 'subquery':
             return SubqueryFetcher(self)
         else:
             return ValidityFetcher(self)
@@ -124,10 +152,15 @@ class VersioningManager:
         self.declarative_base = None
         self.version_class_map = {}
         self.parent_class_map = {}
+        # A dictionary of compiled VersioningPlan objects. Keys as versioned
+        # classes and values as plans.
+        self.plans = {}
         self.session_listeners = {
             'before_flush': self.before_flush,
             'after_flush': self.after_flush,
-            'after_commit': self.clear,
+            'before_commit': self.before_commit,
+            'do_orm_execute': self.do_orm_execute,
+            'after_commit': self.after_commit,
             'after_rollback': self.clear,
         }
         self.mapper_listeners = {
@@ -135,6 +168,9 @@ class VersioningManager:
             'after_update': self.track_updates,
             'after_insert': self.track_inserts,
         }
+        # Mappers of versioned classes which have the mapper_listeners
+        # attached.
+        self.versioned_mappers = set()
         self.class_config_listeners = {
             'instrument_class': self.builder.instrument_versioned_classes,
             'after_configured': self.builder.configure_versioned_classes,
@@ -144,7 +180,27 @@ class VersioningManager:
         # as UnitOfWork objects.
         self.units_of_work = {}
 
+        # Keys as sessions and values as the connections they are bound to.
         self.session_connection_map = {}
+        # Reverse of session_connection_map: keys as connection objects and
+        # values as sets of the sessions bound to them.
+        self.connection_session_map = {}
+        # Keys as connection objects and values as sets of the connections
+        # cloned from them by Connection.execution_options (SQLAlchemy 1.4),
+        # which share their units of work.
+        self.connection_clones = {}
+
+        if getattr(self, 'transaction_id_allocator', None) is not None:
+            self.transaction_id_allocator.close()
+        self.transaction_id_allocator = None
+        self.transaction_resolver = None
+
+        # VersionOutbox class, only created when the 'outbox' option is
+        # enabled.
+        self.outbox_cls = None
+
+        # Tables routed to the 'audit_bind' engine, collected on first use.
+        self.audit_table_list = None
 
         self.metadata = None
 
@@ -157,6 +213,157 @@ class VersioningManager:
             self.transaction_cls = self.transaction_cls(self)
         return self.transaction_cls
 
+    def create_outbox_model(self):
+        """
+        Create VersionOutbox class but only if it doesn't already exist in
+        declarative model registry.
+        """
+        self.outbox_cls = OutboxFactory()(self)
+        return self.outbox_cls
+
+    def audit_tables(self):
+        """
+        Return the tables that are routed to the 'audit_bind' engine and
+        whose ORM reads are routed by the 'read_router': version tables,
+        association version tables, the transaction table, the outbox table
+        and the tables of plugin models.
+        """
+        if self.audit_table_list is None:
+            tables = []
+            for version_cls in self.version_class_map.values():
+                tables.extend(sa.inspect(version_cls).tables)
+            tables.extend(self.association_version_tables)
+            if not isinstance(self.transaction_cls, TransactionFactory):
+                tables.append(self.transaction_cls.__table__)
+            if self.outbox_cls is not None:
+                tables.append(self.outbox_cls.__table__)
+            for plugin_tables in self.plugins.audit_tables(self):
+                tables.extend(plugin_tables)
+            self.audit_table_list = list(dict.fromkeys(tables))
+        return self.audit_table_list
+
+    def bind_audit_tables(self, session):
+        """
+        Bind the audit tables of this manager to the 'audit_bind' engine in
+        given session, so that both the version rows written and the history
+        read through given session go to that engine. Does nothing if the
+        'audit_bind' option is not set.
+
+        :param session: SQLAlchemy session object
+        """
+        bind = self.options['audit_bind']
+        if bind is None:
+            return
+        if isinstance(session.bind, sa.engine.Connection) and (
+            session.bind.engine is bind
+        ):
+            # Version sessions are bound to a connection of the audit engine.
+            return
+        tables = self.audit_tables()
+        bound = session.info.get('versioning_audit_bind')
+        if bound is not None and bound[0] is bind and bound[1] is tables:
+            return
+        for table in tables:
+            session.bind_table(table, bind)
+        session.info['versioning_audit_bind'] = (bind, tables)
+
+    def history_bind(self, session):
+        """
+        Return the bind history reads of given session are routed to by the
+        'read_router' or None if they use the bind of the session itself.
+        Sessions with uncommitted versions always read their own writes.
+
+        :param session: SQLAlchemy session object
+        """
+        router = self.options['read_router']
+        if router is None or self.has_uncommitted_versions(session):
+            return None
+        return router.get_bind(self, session)
+
+    def has_uncommitted_versions(self, session):
+        """
+        Return whether or not given session has recorded versions within its
+        current transaction that have not been committed yet.
+
+        :param session: SQLAlchemy session object
+        """
+        conn = self.session_connection_map.get(session)
+        if conn is None:
+            return False
+        uow = self.units_of_work.get(conn)
+        return uow is not None and uow.current_transaction is not None
+
+    def version_connection(self, session):
+        """
+        Return the connection of given session that version rows and
+        transaction rows are written to. This is the connection to the
+        'audit_bind' engine if the option is set and the connection of given
+        session otherwise.
+
+        :param session: SQLAlchemy session object
+        """
+        if self.options['audit_bind'] is None:
+            return session.connection()
+        self.bind_audit_tables(session)
+        return session.connection(
+            bind_arguments={'clause': self.transaction_cls.__table__}
+        )
+
+    def plan(self, model):
+        """
+        Return the compiled :class:`.VersioningPlan` for given versioned class.
+
+        Plans are normally compiled when versioned classes are configured. If
+        no plan exists for given class or the plugins of this manager have
+        changed since the plan was compiled a new plan is compiled.
+
+        :param model: SQLAlchemy declarative versioned class
+        """
+        try:
+            plan = self.plans[model]
+        except KeyError:
+            pass
+        else:
+            if plan.plugins_revision == self._plugins.revision:
+                return plan
+        plan = self.plans[model] = VersioningPlan(self, model)
+        return plan
+
+    def allocate_transaction_id(self, connection):
+        """
+        Return a preallocated transaction id for given connection or None if
+        transaction id preallocation is not enabled or not available for the
+        engine of given connection, in which case the transaction row is
+        inserted right away.
+
+        Preallocation is enabled with the 'transaction_id_block_size' option.
+        It is not used with native versioning since the database triggers need
+        the transaction row to exist before any versioned rows are written.
+
+        :param connection: SQLAlchemy Connection object
+        """
+        block_size = self.options['transaction_id_block_size']
+        if not block_size or self.options['native_versioning']:
+            return None
+        if self.transaction_id_allocator is None:
+            self.transaction_id_allocator = TransactionIdAllocator(
+                self.transaction_cls, block_size
+            )
+        return self.transaction_id_allocator(connection)
+
+    def resolve_transaction_id(self, session, moment):
+        """
+        Return the id of the last transaction issued at or before given point
+        in time or None if there is no such transaction. Resolutions are
+        cached, see :class:`~sqlalchemy_continuum.transaction.TransactionResolver`.
+
+        :param session: SQLAlchemy session object
+        :param moment: datetime object
+        """
+        if self.transaction_resolver is None:
+            self.transaction_resolver = TransactionResolver(self.transaction_cls)
+        return self.transaction_resolver(session, moment)
+
     def is_excluded_column(self, model, column):
         try:
             key = get_column_key(model, column)
@@ -246,6 +453,28 @@ class VersioningManager:
         for event_name, listener in self.mapper_listeners.items():
             sa.event.remove(mapper, event_name, listener)
 
+    def track_versioned_mapper(self, mapper):
+        """
+        Attach the SQL operations tracking listeners to the mapper of a
+        versioned class. This is called when versioned classes are
+        instrumented so that mappers of unversioned classes have no listeners
+        at all.
+
+        :param mapper: mapper of a versioned class
+        """
+        if mapper not in self.versioned_mappers:
+            self.track_operations(mapper)
+            self.versioned_mappers.add(mapper)
+
+    def remove_versioned_mappers_tracking(self):
+        """
+        Remove the SQL operations tracking listeners from all versioned
+        mappers.
+        """
+        for mapper in self.versioned_mappers:
+            self.remove_operations_tracking(mapper)
+        self.versioned_mappers = set()
+
     def track_session(self, session):
         """
         Attach listeners that track the operations (flushing, committing and
@@ -295,6 +524,19 @@ class VersioningManager:
         """
         uow.operations.add_delete(target)
 
+    def is_session_modified(self, session):
+        """
+        Return whether or not given session has been modified. Session has been
+        modified if any versioned property of any version object in given
+        session has been modified or if any of the plugins returns that
+        session has been modified.
+
+        :param session: SQLAlchemy session object
+        """
+        return is_session_modified(session) or any(
+            self.plugins.is_session_modified(session)
+        )
+
     def unit_of_work(self, session):
         """
         Return the associated SQLAlchemy-Continuum UnitOfWork object for given
@@ -306,34 +548,43 @@ class VersioningManager:
         :param session: SQLAlchemy session object
         """
         conn = session.connection()
-        if conn not in self.session_connection_map.values():
+        previous = self.session_connection_map.get(session)
+        if previous is not conn:
+            if previous is not None:
+                sessions = self.connection_session_map[previous]
+                sessions.discard(session)
+                if not sessions:
+                    del self.connection_session_map[previous]
             self.session_connection_map[session] = conn
+            self.connection_session_map.setdefault(conn, set()).add(session)
 
-        if conn in self.units_of_work:
-            return self.units_of_work[conn]
-        else:
-            uow = self.uow_class(self)
-            self.units_of_work[conn] = uow
-            return uow
+        uow = self.units_of_work.get(conn)
+        if uow is None:
+            uow = self.units_of_work[conn] = self.uow_class(self)
+        return uow
 
     def _uow_from_conn(self, conn):
-        try:
-            uow = self.units_of_work[conn]
-        except KeyError:
-            try:
-                uow = self.units_of_work[conn.engine]
-            except KeyError:
-                for connection in self.units_of_work.keys():
-                    if (
-                        not connection.closed
-                        and connection.connection is conn.connection
-                    ):
-                        uow = self.unit_of_work(conn.session)
-                        break  # The ConnectionFairy is the same, this connection is a clone
-                else:
-                    raise
+        return self.units_of_work[conn]
 
-        return uow
+    def track_cloned_connections(self, conn, opts):
+        """
+        Engine listener which registers connections cloned by
+        `Connection.execution_options` under the UnitOfWork of the connection
+        they were cloned from. A clone shares the transaction of its parent
+        connection. SQLAlchemy 2.0 sets the options of connections in place,
+        there the listener receives the parent connection itself.
+
+        :param conn: SQLAlchemy Connection object
+        :param opts: the execution options that were set
+        """
+        transaction = conn.get_transaction()
+        if transaction is None or transaction.connection is conn:
+            return
+        parent = transaction.connection
+        uow = self.units_of_work.get(parent)
+        if uow is not None:
+            self.units_of_work[conn] = uow
+            self.connection_clones.setdefault(parent, set()).add(conn)
 
     def before_flush(self, session, flush_context, instances):
         """
@@ -346,8 +597,15 @@ class VersioningManager:
         if not self.options['versioning']:
             return
 
+        self.bind_audit_tables(session)
+
+        # Leave early without touching the connection of given session if
+        # there is nothing to version.
+        if not self.is_session_modified(session):
+            return
+
         uow = self.unit_of_work(session)
-        uow.process_before_flush(session)
+        uow.process_before_flush(session, modified=True)
 
     def after_flush(self, session, flush_context):
         """
@@ -360,9 +618,112 @@ class VersioningManager:
         """
         if not self.options['versioning']:
             return
-        uow = self.unit_of_work(session)
+        uow = self.units_of_work.get(session.connection())
+        if uow is None:
+            # No versioned changes within the current transaction.
+            return
         uow.process_after_flush(session)
 
+    def flush_versions(self, session):
+        """
+        Flush given session and write the version rows of all operations that
+        have been recorded within the current transaction but not yet
+        written.
+
+        When the 'deferred_versions' option is enabled version rows are
+        written only when the transaction is committed, or when version
+        classes are queried. This method can be used for writing them at any
+        other point, for example before reading version tables with plain SQL.
+
+        :param session: SQLAlchemy session
+        """
+        if not self.options['versioning']:
+            return
+        session.flush()
+        self.write_deferred_versions(session)
+
+    def write_deferred_versions(self, session):
+        conn = self.session_connection_map.get(session)
+        if conn is None and self.units_of_work:
+            conn = session.connection()
+        uow = self.units_of_work.get(conn)
+        if uow is not None:
+            uow.process_deferred_versions(session)
+
+    def before_commit(self, session):
+        """
+        Before commit listener for SQLAlchemy sessions. If the
+        'deferred_versions' option is enabled this listener writes the version
+        rows of the transaction being committed.
+
+        :param session: SQLAlchemy session
+        """
+        if self.options['deferred_versions']:
+            self.flush_versions(session)
+
+    def do_orm_execute(self, orm_execute_state):
+        """
+        ORM execute listener for SQLAlchemy sessions. If the
+        'deferred_versions' option is enabled and given statement involves
+        version classes this listener writes the deferred version rows before
+        the statement is executed so that the statement sees them.
+
+        If the 'audit_bind' option is set this listener also routes the
+        audit tables of this manager to that engine before the statement is
+        executed. If the 'read_router' option is set SELECT statements that
+        involve version classes, the transaction class or plugin models are
+        executed on the bind returned by :meth:`history_bind`.
+
+        :param orm_execute_state: SQLAlchemy ORMExecuteState object
+        """
+        session = orm_execute_state.session
+        if self.options['audit_bind'] is not None:
+            self.bind_audit_tables(session)
+        deferred_versions = (
+            self.options['deferred_versions'] and self.options['versioning']
+        )
+        router = self.options['read_router']
+        if not deferred_versions and router is None:
+            return
+        mappers = list(orm_execute_state.all_mappers)
+        mappers.append(orm_execute_state.bind_mapper)
+        mappers = [mapper for mapper in mappers if mapper is not None]
+
+        if deferred_versions and any(
+            mapper.class_ in self.parent_class_map for mapper in mappers
+        ):
+            if session.autoflush and not session._flushing:
+                session.flush()
+            self.write_deferred_versions(session)
+
+        if router is None or not orm_execute_state.is_select:
+            return
+        audit_tables = self.audit_tables()
+        if not any(mapper.local_table in audit_tables for mapper in mappers):
+            return
+        bind = self.history_bind(session)
+        if bind is not None:
+            return orm_execute_state.invoke_statement(bind_arguments={'bind': bind})
+
+    def after_commit(self, session):
+        """
+        After commit listener for SQLAlchemy sessions. Reports the committed
+        transaction to the 'read_router', if set, and resets the UnitOfWork
+        of given session.
+
+        :param session: SQLAlchemy session object
+        """
+        router = self.options['read_router']
+        if router is not None and not session.in_nested_transaction():
+            uow = self.units_of_work.get(self.session_connection_map.get(session))
+            if uow is not None and uow.current_transaction is not None:
+                # The transaction has been expired by the commit, its identity
+                # is read without refreshing it.
+                identity = sa.inspect(uow.current_transaction).identity
+                if identity is not None:
+                    router.record_write(session, identity[0])
+        self.clear(session)
+
     def clear(self, session):
         """
         Simple SQLAlchemy listener that is being invoked after successful
@@ -377,56 +738,41 @@ class VersioningManager:
         conn = self.session_connection_map.pop(session, None)
         if conn is None:
             return
+        for other in self.connection_session_map.pop(conn, ()):
+            self.session_connection_map.pop(other, None)
 
-        if conn in self.units_of_work:
-            uow = self.units_of_work[conn]
-            uow.reset(session)
-            del self.units_of_work[conn]
+        for clone in self.connection_clones.pop(conn, ()):
+            self.units_of_work.pop(clone, None)
 
-        for connection in dict(self.units_of_work).keys():
-            if connection.closed or conn.connection is connection.connection:
-                uow = self.units_of_work[connection]
-                uow.reset(session)
-                del self.units_of_work[connection]
+        uow = self.units_of_work.pop(conn, None)
+        if uow is not None:
+            uow.reset(session)
 
     def clear_connection(self, conn):
-        if conn in self.units_of_work:
-            uow = self.units_of_work[conn]
-            uow.reset()
-            del self.units_of_work[conn]
+        """
+        Engine rollback listener which resets and forgets the UnitOfWork
+        object of given connection.
 
-        for session, connection in dict(self.session_connection_map).items():
-            if connection is conn:
-                del self.session_connection_map[session]
+        :param conn: SQLAlchemy Connection object
+        """
+        for clone in self.connection_clones.pop(conn, ()):
+            self.units_of_work.pop(clone, None)
 
-        for connection in dict(self.units_of_work).keys():
-            if connection.closed or conn.connection is connection.connection:
-                uow = self.units_of_work[connection]
-                uow.reset()
-                del self.units_of_work[connection]
+        uow = self.units_of_work.pop(conn, None)
+        if uow is not None:
+            uow.reset()
 
-    def append_association_operation(self, conn, table_name, params, op):
-        """
-        Append history association operation to pending_statements list.
-        """
-        stmt = (
-            self.metadata.tables[self.options['table_name'] % table_name]
-            .insert()
-            .values({**params, 'operation_type': op})
-        )
-        uow = self.uow_from_conn(conn)
-        uow.pending_statements.append(stmt)
+        for session in self.connection_session_map.pop(conn, ()):
+            del self.session_connection_map[session]
 
-    def track_cloned_connections(self, c, opt):
+    def append_association_operation(self, conn, table_name, params, op):
         """
-        Track cloned connections from association tables.
+        Append history association operation to the pending association
+        rows of the unit of work of given connection.
         """
-        if c not in self.units_of_work.keys():
-            for connection, uow in dict(self.units_of_work).items():
-                if (
-                    not connection.closed and connection.connection is c.connection
-                ):  # ConnectionFairy is the same - this is a clone
-                    self.units_of_work[c] = uow
+        table = self.metadata.tables[self.options['table_name'] % table_name]
+        uow = self._uow_from_conn(conn)
+        uow.append_association_row(table, params, op)
 
     def track_association_operations(
         self,
@@ -452,17 +798,13 @@ class VersioningManager:
             if not multiparams:
                 multiparams = [params]
 
-            uow = self._uow_from_conn(conn)
+            try:
+                uow = self._uow_from_conn(conn)
+            except KeyError:
+                # The transaction has no versioned changes so there is no
+                # transaction the association versions could belong to.
+                return
+            table = version_table(clauseelement.table)
 
             for params in multiparams:
-                stmt = (
-                    version_table(clauseelement.table)
-                    .insert()
-                    .values(
-                        {
-                            **params,
-                            'operation_type': op,
-                        }
-                    )
-                )
-                uow.pending_statements.append(stmt)
+                uow.append_association_row(table, params, op)
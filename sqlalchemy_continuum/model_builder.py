@@ -201,10 +201,20 @@ class ModelBuilder:
                 self.manager.option(self.model, 'operation_type_column_name'),
                 self.manager.option(self.model, 'transaction_column_name'),
             ]
-            if self.manager.option(self.model, 'strategy') == 'validity':
+            strategy = self.manager.option(self.model, 'strategy')
+            if strategy == 'validity':
                 columns.append(
                     self.manager.option(self.model, 'end_transaction_column_name')
                 )
+            version_chain = self.manager.option(self.model, 'version_chain')
+            if strategy == 'append_only' or version_chain:
+                columns.append(
+                    self.manager.option(self.model, 'previous_transaction_column_name')
+                )
+            if version_chain:
+                columns.append(
+                    self.manager.option(self.model, 'version_number_column_name')
+                )
 
             for column in columns:
                 args[column] = column_property(
@@ -212,6 +222,45 @@ class ModelBuilder:
                 )
         return args
 
+    def build_end_transaction_property(self):
+        """
+        Builds a read-only end transaction property for version classes using
+        the 'append_only' strategy. Version rows of this strategy are never
+        updated, hence the end transaction of a version is the transaction of
+        the version pointing back to it::
+
+            (SELECT v2.transaction_id FROM article_version AS v2
+            WHERE v2.previous_transaction_id = article_version.transaction_id
+            AND v2.id = article_version.id)
+
+        The property is deferred so that it is only computed when accessed
+        or explicitly undeferred.
+        """
+        if find_closest_versioned_parent(self.manager, self.model):
+            return
+        table = self.version_class.__table__
+        tx_column_name = option(self.model, 'transaction_column_name')
+        next_version = table.alias()
+        subquery = (
+            sa.select(next_version.c[tx_column_name])
+            .where(
+                next_version.c[option(self.model, 'previous_transaction_column_name')]
+                == table.c[tx_column_name],
+                *[
+                    next_version.c[column.key] == column
+                    for column in table.primary_key
+                    if column.name != tx_column_name
+                ],
+            )
+            .correlate_except(next_version)
+            .scalar_subquery()
+        )
+        setattr(
+            self.version_class,
+            option(self.model, 'end_transaction_column_name'),
+            column_property(subquery, deferred=True),
+        )
+
     def build_model(self, table):
         """
         Build history model class.
@@ -255,6 +304,8 @@ class ModelBuilder:
         self.model.__versioned__ = copy(self.model.__versioned__)
         self.model.__versioning_manager__ = self.manager
         self.version_class = self.build_model(table)
+        if option(self.model, 'strategy') == 'append_only':
+            self.build_end_transaction_property()
         self.build_parent_relationship()
         self.build_transaction_relationship(tx_class)
         return self.version_class
@@ -1,11 +1,9 @@
-from collections import OrderedDict
-from copy import copy
-
-import sqlalchemy as sa
-from ._compat import identity
+from .utils import get_versioning_manager
 
 
 class Operation:
+    __slots__ = ('target', 'type', 'processed')
+
     INSERT = 0
     UPDATE = 1
     DELETE = 2
@@ -21,52 +19,71 @@ class Operation:
     def __ne__(self, other):
         return not (self == other)
 
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.target!r} type={self.type}>'
+
 
 class Operations:
     """
-    A collection of operations
+    A journal of the operations of a single transaction.
+
+    New operations are queued in `pending`, keyed by the class and identity
+    of their target, until they are drained by :meth:`drain` once per flush.
+    Only the keys of already drained operations are remembered so that memory
+    and time scale with the number of changes per flush instead of the number
+    of changes per transaction.
     """
 
     def __init__(self):
-        self.objects = OrderedDict()
+        #: Operations recorded since the last drain, keyed by
+        #: (class, identity) pairs
+        self.pending = {}
+        #: Keys of all operations recorded within the transaction
+        self.keys = set()
+        #: Changed versioned classes within the transaction
+        self.entities = set()
 
     def format_key(self, target):
         # We cannot use target._sa_instance_state.identity here since object's
         # identity is not yet updated at this phase
-        return (target.__class__, identity(target))
+        plan = get_versioning_manager(target).plan(target.__class__)
+        return (target.__class__, plan.identity(target))
 
     def __contains__(self, target):
-        return self.format_key(target) in self.objects
+        return self.format_key(target) in self.keys
 
     def __setitem__(self, key, operation):
-        self.objects[key] = operation
+        self.pending[key] = operation
+        self.keys.add(key)
+        self.entities.add(key[0])
 
     def __getitem__(self, key):
-        return self.objects[key]
+        return self.pending[key]
 
     def __delitem__(self, key):
-        del self.objects[key]
+        del self.pending[key]
 
     def __bool__(self):
-        return bool(self.objects)
+        return bool(self.keys)
 
     def __nonzero__(self):
         return self.__bool__()
 
     def __repr__(self):
-        return repr(self.objects)
+        return repr(self.pending)
 
-    @property
-    def entities(self):
-        """
-        Return a set of changed versioned entities for given session.
+    def items(self):
+        return self.pending.items()
 
-        :param session: SQLAlchemy session object
+    def drain(self):
         """
-        return {k[0] for k in self.objects}
-
-    def items(self):
-        return self.objects.items()
+        Return the pending operations in the order they were first recorded
+        and clear the pending queue. Operations recorded while the returned
+        operations are being processed are queued for the next drain.
+        """
+        pending = self.pending
+        self.pending = {}
+        return pending.values()
 
     def add(self, operation):
         self[self.format_key(operation.target)] = operation
@@ -80,16 +97,13 @@ class Operations:
             self.add(Operation(target, Operation.INSERT))
 
     def add_update(self, target):
-        state_copy = copy(sa.inspect(target).committed_state)
-        relationships = sa.inspect(target.__class__).relationships
-        # Remove all ONETOMANY and MANYTOMANY relationships
-        for rel_key, relationship in relationships.items():
-            if relationship.direction.name in ['ONETOMANY', 'MANYTOMANY']:
-                if rel_key in state_copy:
-                    del state_copy[rel_key]
-
-        if state_copy:
-            self.add(Operation(target, Operation.UPDATE))
+        plan = get_versioning_manager(target).plan(target.__class__)
+        # Ignore changes of ONETOMANY and MANYTOMANY relationships
+        collection_keys = plan.collection_relationship_keys
+        for key in target._sa_instance_state.committed_state:
+            if key not in collection_keys:
+                self.add(Operation(target, Operation.UPDATE))
+                return
 
     def add_delete(self, target):
         self.add(Operation(target, Operation.DELETE))
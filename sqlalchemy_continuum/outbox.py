@@ -0,0 +1,515 @@
+"""
+When the 'outbox' option is enabled the version rows of each flush are not
+written to the version tables within the versioned transaction. Instead they
+are serialized into a single row of the `version_outbox` table, in the same
+transaction, and expanded into the version tables later on by an
+:class:`OutboxWorker`. This keeps the commit latency of versioned
+transactions low at the cost of the version history being eventually
+consistent.
+
+::
+
+    worker = OutboxWorker(versioning_manager, engine)
+    worker.start()  # expand outbox entries in a background thread
+
+    ...
+
+    worker.lag()  # OutboxLag(entries=0, oldest_issued_at=None, seconds=0.0)
+    worker.stop()
+
+Outbox entries must be applied in the order they were written. Only run a
+single worker per database.
+"""
+
+import base64
+import json
+import logging
+import threading
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import sqlalchemy as sa
+from sqlalchemy.engine.default import DefaultDialect
+
+from .factory import ModelFactory
+from .transaction import utc_now
+from .unit_of_work import (
+    close_previous_versions,
+    insert_rows,
+    latest_versions,
+    update_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+
+OutboxLag = namedtuple('OutboxLag', ['entries', 'oldest_issued_at', 'seconds'])
+
+
+# Encoders of the values JSON has no type for, as (type, tag, encode, decode)
+# tuples. datetime has to precede its base class date.
+value_codecs = [
+    (datetime, 'datetime', datetime.isoformat, datetime.fromisoformat),
+    (date, 'date', date.isoformat, date.fromisoformat),
+    (time, 'time', time.isoformat, time.fromisoformat),
+    (
+        timedelta,
+        'timedelta',
+        lambda value: [value.days, value.seconds, value.microseconds],
+        lambda value: timedelta(*value),
+    ),
+    (Decimal, 'decimal', str, Decimal),
+    (uuid.UUID, 'uuid', str, uuid.UUID),
+    (
+        bytes,
+        'bytes',
+        lambda value: base64.b64encode(value).decode('ascii'),
+        base64.b64decode,
+    ),
+]
+
+TYPE_KEY = '__continuum_type__'
+
+
+def encode_value(value):
+    for type_, tag, encode, _ in value_codecs:
+        if isinstance(value, type_):
+            return {TYPE_KEY: tag, 'value': encode(value)}
+    raise TypeError(
+        f'Values of type {type(value).__name__} can not be written to the '
+        'version outbox'
+    )
+
+
+decoders = {tag: decode for _, tag, _, decode in value_codecs}
+
+
+def decode_value(obj):
+    if len(obj) == 2 and TYPE_KEY in obj:
+        return decoders[obj[TYPE_KEY]](obj['value'])
+    return obj
+
+
+class PayloadDialect(DefaultDialect):
+    """
+    Dialect the column values of outbox payloads are processed with. Values
+    JSON or `value_codecs` have a type for are left as they are, others (such
+    as enums and the values of TypeDecorator types) are converted with the
+    bind processing of their column types when the payload is written and
+    with the result processing when it is read back.
+    """
+
+    supports_native_boolean = True
+    supports_native_decimal = True
+    supports_native_enum = False
+    supports_native_uuid = True
+    _json_serializer = None
+    _json_deserializer = None
+
+
+payload_dialect = PayloadDialect()
+
+
+def value_processor(type_, result=False):
+    impl = type_.dialect_impl(payload_dialect)
+    if result:
+        return impl.result_processor(payload_dialect, None)
+    return impl.bind_processor(payload_dialect)
+
+
+def process_rows(table, rows, result=False):
+    """
+    Return given rows of given version table with their values processed by
+    the types of their columns.
+
+    :param table: version table
+    :param rows: list of parameter dictionaries
+    :param result:
+        Whether to apply the result processing instead of the bind processing
+    """
+    processors = {}
+    processed = []
+    for row in rows:
+        values = {}
+        for key, value in row.items():
+            if key not in processors:
+                processors[key] = value_processor(table.c[key].type, result)
+            processor = processors[key]
+            values[key] = value if processor is None else processor(value)
+        processed.append(values)
+    return processed
+
+
+def process_identities(columns, identities, result=False):
+    """
+    Return given primary key value tuples processed by the types of given
+    columns.
+
+    :param columns: primary key columns without the transaction column
+    :param identities: list of primary key value tuples
+    :param result:
+        Whether to apply the result processing instead of the bind processing
+    """
+    processors = [value_processor(column.type, result) for column in columns]
+    return [
+        tuple(
+            value if processor is None else processor(value)
+            for processor, value in zip(processors, identity)
+        )
+        for identity in identities
+    ]
+
+
+def encode_payload(tables, payload, result=False):
+    """
+    Return given outbox payload with the values of its rows and identities
+    processed by the types of their version table columns. Payloads are
+    encoded before they are written and decoded with `result` after they are
+    read.
+
+    :param tables: dictionary of tables by key containing the version tables
+    :param payload: outbox payload
+    :param result:
+        Whether to decode the payload instead of encoding it
+    """
+    encoded = dict(payload)
+    for key in ('inserts', 'updates'):
+        if key in payload:
+            encoded[key] = [
+                (table_key, process_rows(tables[table_key], rows, result))
+                for table_key, rows in payload[key]
+            ]
+    if 'validity' in payload:
+        encoded['validity'] = []
+        for table_key, tx_key, end_tx_key, pk_keys, identities in payload['validity']:
+            table = tables[table_key]
+            identities = process_identities(
+                [table.c[key] for key in pk_keys], identities, result
+            )
+            encoded['validity'].append(
+                (table_key, tx_key, end_tx_key, pk_keys, identities)
+            )
+    return encoded
+
+
+def decode_payload(tables, payload):
+    """
+    Return given outbox payload read back from the outbox table with the
+    values of its rows and identities converted back to their types.
+
+    :param tables: dictionary of tables by key containing the version tables
+    :param payload: outbox payload
+    """
+    return encode_payload(tables, payload, result=True)
+
+
+class OutboxPayload(sa.types.TypeDecorator):
+    """
+    Stores outbox payloads as JSON text. Datetimes, dates, times,
+    timedeltas, decimals, UUIDs and bytes are encoded as tagged objects so
+    that they are read back with their original types. Column values of other
+    types are converted by :func:`encode_payload` before the payload is
+    written.
+    """
+
+    impl = sa.UnicodeText
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return json.dumps(value, default=encode_value, separators=(',', ':'))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return json.loads(value, object_hook=decode_value)
+
+
+class OutboxFactory(ModelFactory):
+    model_name = 'VersionOutbox'
+
+    def create_class(self, manager):
+        """
+        Create VersionOutbox class.
+        """
+
+        class VersionOutbox(manager.declarative_base):
+            __tablename__ = 'version_outbox'
+
+            id = sa.Column(sa.types.BigInteger, primary_key=True, autoincrement=True)
+            transaction_id = sa.Column(sa.types.BigInteger, nullable=False)
+            issued_at = sa.Column(sa.DateTime, default=utc_now)
+            payload = sa.Column(OutboxPayload, nullable=False)
+
+        return VersionOutbox
+
+
+class OutboxWorker:
+    """
+    Expands the entries of the outbox table into the version tables. Entries
+    are processed in batches of `batch_size`: the rows of all entries of a
+    batch are inserted with one executemany INSERT per version table, the
+    previous versions they close are updated with set based UPDATE statements
+    and the entries are deleted, all in a single transaction.
+
+    The worker can either be run in a background thread with :meth:`start`,
+    in a process of its own with :meth:`run` or driven manually with
+    :meth:`process` and :meth:`drain`.
+
+    :param manager: VersioningManager object
+    :param bind: Engine of the database containing the outbox table
+    :param batch_size: Maximum number of outbox entries processed at a time
+    :param interval: Seconds to wait when the outbox is empty
+    """
+
+    #: Maximum number of previous versions closed by a single UPDATE
+    #: statement.
+    validity_batch_size = 500
+
+    #: Maximum number of identities whose previous versions are looked up by a
+    #: single SELECT statement.
+    chain_batch_size = 500
+
+    def __init__(self, manager, bind, batch_size=1000, interval=1.0):
+        self.manager = manager
+        self.bind = bind
+        self.batch_size = batch_size
+        self.interval = interval
+        self.processed_entries = 0
+        self.last_processed_at = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    @property
+    def table(self):
+        return self.manager.outbox_cls.__table__
+
+    def process(self):
+        """
+        Process the next batch of outbox entries and return the number of
+        processed entries.
+        """
+        table = self.table
+        with self.bind.begin() as connection:
+            entries = connection.execute(
+                sa.select(table.c.id, table.c.transaction_id, table.c.payload)
+                .order_by(table.c.id)
+                .limit(self.batch_size)
+            ).all()
+            if not entries:
+                return 0
+            self.apply(connection, entries)
+            connection.execute(
+                table.delete().where(table.c.id.in_([entry.id for entry in entries]))
+            )
+        self.processed_entries += len(entries)
+        self.last_processed_at = utc_now()
+        return len(entries)
+
+    def apply(self, connection, entries):
+        """
+        Write the version rows of given outbox entries.
+
+        The previous transactions and version numbers of rows of tables using
+        the 'append_only' strategy or the 'version_chain' option are assigned
+        first. Then rows are inserted, rows written by
+        earlier flushes of the same transactions are updated and finally the
+        previous versions are closed in transaction order.
+
+        :param connection: SQLAlchemy Connection object
+        :param entries: outbox rows ordered by id
+        """
+        tables = self.table.metadata.tables
+        inserts = {}
+        updates = []
+        validity = []
+        chain = {}
+        for entry in entries:
+            payload = decode_payload(tables, entry.payload)
+            for table_key, rows in payload.get('inserts', ()):
+                inserts.setdefault(table_key, []).extend(rows)
+            for table_key, rows in payload.get('updates', ()):
+                updates.append((table_key, rows))
+            for item in payload.get('validity', ()):
+                validity.append((entry.transaction_id, item))
+            for item in payload.get('chain', ()):
+                chain[item[0]] = item
+
+        for table_key, tx_key, previous_key, number_key, pk_keys in chain.values():
+            self.assign_chain_columns(
+                connection,
+                tables[table_key],
+                tx_key,
+                previous_key,
+                number_key,
+                pk_keys,
+                inserts.get(table_key, []),
+            )
+        for table_key, rows in inserts.items():
+            insert_rows(connection, tables[table_key], rows)
+        for table_key, rows in updates:
+            update_rows(connection, tables[table_key], rows)
+
+        validity.sort(key=lambda item: item[0])
+        for transaction_id, item in validity:
+            table_key, tx_key, end_tx_key, pk_keys, identities = item
+            table = tables[table_key]
+            close_previous_versions(
+                connection,
+                table,
+                table.c[tx_key],
+                table.c[end_tx_key],
+                [table.c[key] for key in pk_keys],
+                transaction_id,
+                identities,
+                self.validity_batch_size,
+            )
+
+    def assign_chain_columns(
+        self, connection, table, tx_key, previous_key, number_key, pk_keys, rows
+    ):
+        """
+        Assign the previous transaction id and the version number of given
+        rows about to be inserted into given version table. The latest
+        versions already written are looked up with one SELECT per
+        `chain_batch_size` identities, rows of the same identity within the
+        batch are chained in transaction order.
+
+        Outbox entries are processed in the order they were written, which
+        is not necessarily the order their transactions were committed in.
+        Rows whose identity already has a version of a later transaction
+        written are looked up once more, bounded by their own transaction
+        like the versions written by the flush itself.
+
+        :param connection: SQLAlchemy Connection object
+        :param table: version table
+        :param tx_key: key of the transaction column
+        :param previous_key: key of the previous transaction column
+        :param number_key: key of the version number column or None
+        :param pk_keys: keys of the primary key columns without the
+            transaction column
+        :param rows: list of parameter dictionaries
+        """
+        tx_column = table.c[tx_key]
+        pk_columns = [table.c[key] for key in pk_keys]
+        number_column = None if number_key is None else table.c[number_key]
+        identities = {tuple(row[key] for key in pk_keys): None for row in rows}
+        written = latest_versions(
+            connection,
+            table,
+            tx_column,
+            pk_columns,
+            list(identities),
+            self.chain_batch_size,
+            version_number_column=number_column,
+        )
+
+        late = {}
+        for row in rows:
+            identity = tuple(row[key] for key in pk_keys)
+            latest_tx = written.get(identity, (None, None))[0]
+            if latest_tx is not None and latest_tx >= row[tx_key]:
+                late.setdefault(row[tx_key], {})[identity] = None
+        preceding = {}
+        for transaction_id, late_identities in late.items():
+            versions = latest_versions(
+                connection,
+                table,
+                tx_column,
+                pk_columns,
+                list(late_identities),
+                self.chain_batch_size,
+                transaction_id,
+                number_column,
+            )
+            for identity in late_identities:
+                preceding[identity, transaction_id] = versions.get(
+                    identity, (None, None)
+                )
+
+        chained = {}
+        for row in sorted(rows, key=lambda row: row[tx_key]):
+            identity = tuple(row[key] for key in pk_keys)
+            previous = preceding.get(
+                (identity, row[tx_key]), written.get(identity, (None, None))
+            )
+            if identity in chained and (
+                previous[0] is None or chained[identity][0] > previous[0]
+            ):
+                previous = chained[identity]
+            previous_tx, previous_number = previous
+            row[previous_key] = previous_tx
+            number = None
+            if number_key is not None:
+                number = row[number_key] = (previous_number or 0) + 1
+            chained[identity] = (row[tx_key], number)
+
+    def drain(self):
+        """
+        Process outbox entries until the outbox is empty and return the
+        number of processed entries.
+        """
+        count = 0
+        while True:
+            processed = self.process()
+            if not processed:
+                return count
+            count += processed
+
+    def lag(self):
+        """
+        Return an `OutboxLag` tuple describing how far the version tables are
+        behind: the number of unprocessed entries, the time the oldest of them
+        was written and its age in seconds.
+        """
+        table = self.table
+        with self.bind.connect() as connection:
+            entries, oldest = connection.execute(
+                sa.select(sa.func.count(table.c.id), sa.func.min(table.c.issued_at))
+            ).one()
+        seconds = 0.0
+        if oldest is not None:
+            now = utc_now()
+            if oldest.tzinfo is None:
+                now = now.replace(tzinfo=None)
+            seconds = max((now - oldest).total_seconds(), 0.0)
+        return OutboxLag(entries, oldest, seconds)
+
+    def run(self):
+        """
+        Process outbox entries until :meth:`stop` is called. Whenever the
+        outbox is empty or processing fails the worker waits for `interval`
+        seconds before trying again.
+        """
+        while not self.stopping.is_set():
+            try:
+                processed = self.process()
+            except Exception:
+                logger.exception('Processing version outbox entries failed')
+                processed = 0
+            if processed < self.batch_size:
+                self.stopping.wait(self.interval)
+
+    def start(self):
+        """
+        Run this worker in a background daemon thread.
+        """
+        self.stopping.clear()
+        self.thread = threading.Thread(
+            target=self.run, name='continuum-outbox', daemon=True
+        )
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the background thread of this worker.
+
+        :param timeout: Seconds to wait for the thread to finish
+        """
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
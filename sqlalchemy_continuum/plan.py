@@ -0,0 +1,196 @@
+import sqlalchemy as sa
+from sqlalchemy.orm.exc import UnmappedColumnError
+
+from .plugins.base import Plugin
+from .utils import is_table_column
+
+
+class VersionTableLayout:
+    """
+    Column layout of a single version table of a version class. Holds the
+    (column key, property key) pairs needed for turning version objects into
+    plain parameter dictionaries as well as the columns needed for
+    maintaining the validity of version rows.
+    """
+
+    __slots__ = (
+        'table',
+        'columns',
+        'pk_columns',
+        'pk_keys',
+        'tx_column',
+        'end_tx_column',
+        'previous_tx_column',
+        'version_number_column',
+    )
+
+    def __init__(
+        self,
+        mapper,
+        table,
+        tx_column_name,
+        end_tx_column_name,
+        previous_tx_column_name,
+        version_number_column_name,
+    ):
+        columns = []
+        for column in table.c:
+            try:
+                prop = mapper.get_property_by_column(column)
+            except UnmappedColumnError:
+                continue
+            columns.append((column.key, prop.key))
+        pk_columns = tuple(
+            column for column in table.primary_key if column.name != tx_column_name
+        )
+        self.table = table
+        self.columns = tuple(columns)
+        self.pk_columns = pk_columns
+        self.pk_keys = tuple(
+            mapper.get_property_by_column(column).key for column in pk_columns
+        )
+        self.tx_column = table.c.get(tx_column_name)
+        self.end_tx_column = table.c.get(end_tx_column_name)
+        self.previous_tx_column = table.c.get(previous_tx_column_name)
+        self.version_number_column = table.c.get(version_number_column_name)
+
+    def values(self, state_dict):
+        """
+        Return the column values of given version object state dictionary.
+        Attributes that were never assigned are left out so that column
+        defaults apply.
+
+        :param state_dict: __dict__ of a version object
+        """
+        return {
+            column_key: state_dict[prop_key]
+            for column_key, prop_key in self.columns
+            if prop_key in state_dict
+        }
+
+
+class VersioningPlan:
+    """
+    Immutable, precompiled versioning metadata of a single versioned class.
+
+    Plans are compiled once per versioned class when the versioned classes are
+    configured (see :meth:`VersioningManager.plan`) so that the flush hot path
+    does not need to inspect mappers or look up versioning options for every
+    changed object.
+
+    :param manager: VersioningManager object
+    :param model: SQLAlchemy declarative versioned class
+    """
+
+    __slots__ = (
+        'model',
+        'version_cls',
+        'versioned_keys',
+        'versioned_column_keys',
+        'versioned_relationship_keys',
+        'collection_relationship_keys',
+        'primary_keys',
+        'transaction_column_name',
+        'end_transaction_column_name',
+        'previous_transaction_column_name',
+        'version_number_column_name',
+        'operation_type_column_name',
+        'strategy',
+        'version_chain',
+        'validity',
+        'chain',
+        'version_object_hooks',
+        'version_tables',
+        'plugins_revision',
+    )
+
+    def __init__(self, manager, model):
+        set_ = object.__setattr__
+        mapper = sa.inspect(model)
+
+        versioned_keys = tuple(
+            key
+            for key, column in mapper.columns.items()
+            if is_table_column(column) and not manager.is_excluded_property(model, key)
+        )
+        set_(self, 'model', model)
+        set_(self, 'version_cls', manager.version_class_map.get(model))
+        set_(self, 'versioned_keys', versioned_keys)
+        set_(self, 'versioned_column_keys', frozenset(versioned_keys))
+        set_(
+            self,
+            'versioned_relationship_keys',
+            frozenset(
+                prop.key
+                for prop in mapper.relationships
+                if any(c.key in versioned_keys for c in prop.local_columns)
+            ),
+        )
+        set_(
+            self,
+            'collection_relationship_keys',
+            frozenset(
+                prop.key
+                for prop in mapper.relationships
+                if prop.direction.name in ('ONETOMANY', 'MANYTOMANY')
+            ),
+        )
+        set_(
+            self,
+            'primary_keys',
+            tuple(key for key, column in mapper.columns.items() if column.primary_key),
+        )
+        for name in (
+            'transaction_column_name',
+            'end_transaction_column_name',
+            'previous_transaction_column_name',
+            'version_number_column_name',
+            'operation_type_column_name',
+            'strategy',
+            'version_chain',
+        ):
+            set_(self, name, manager.option(model, name))
+        set_(self, 'validity', self.strategy == 'validity')
+        set_(self, 'chain', self.strategy == 'append_only' or self.version_chain)
+        set_(
+            self,
+            'version_object_hooks',
+            tuple(
+                plugin.after_create_version_object
+                for plugin in manager.plugins
+                if getattr(type(plugin), 'after_create_version_object', None)
+                is not Plugin.after_create_version_object
+            ),
+        )
+        set_(self, 'plugins_revision', manager.plugins.revision)
+        if self.version_cls is not None:
+            version_mapper = sa.inspect(self.version_cls)
+            version_tables = tuple(
+                VersionTableLayout(
+                    version_mapper,
+                    table,
+                    self.transaction_column_name,
+                    self.end_transaction_column_name,
+                    self.previous_transaction_column_name,
+                    self.version_number_column_name,
+                )
+                for table in version_mapper.tables
+            )
+        else:
+            version_tables = ()
+        set_(self, 'version_tables', version_tables)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable.')
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.model.__name__}>'
+
+    def identity(self, obj):
+        """
+        Return the identity of given object of the planned class as a tuple.
+        Works for transient objects as well.
+
+        :param obj: SQLAlchemy declarative model object
+        """
+        return tuple(getattr(obj, key) for key in self.primary_keys)
@@ -189,6 +189,8 @@ target is the given article.
     https://sqlalchemy-utils.readthedocs.io/en/latest/generic_relationship.html
 """
 
+from itertools import chain
+
 import sqlalchemy as sa
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.inspection import inspect
@@ -315,21 +317,37 @@ class ActivityPlugin(Plugin):
         self.activity_cls = ActivityFactory()(manager)
         manager.activity_cls = self.activity_cls
 
+    def audit_tables(self, manager):
+        if self.activity_cls is None:
+            return []
+        return [self.activity_cls.__table__]
+
+    def changed_activities(self, session):
+        """
+        Return the new and modified activity objects of given session. Only
+        the new and dirty collections of the session are inspected, not the
+        whole identity map.
+
+        :param session: SQLAlchemy session object
+        """
+        for obj in chain(session.new, session.dirty):
+            if isinstance(obj, self.activity_cls):
+                yield obj
+
     def is_session_modified(self, session):
         """
-        Return that the session has been modified if the session contains an
-        activity class.
+        Return that the session has been modified if the session contains a
+        new or modified activity object.
 
         :param session: SQLAlchemy session object
         """
-        return any(isinstance(obj, self.activity_cls) for obj in session)
+        return any(True for obj in self.changed_activities(session))
 
     def before_flush(self, uow, session):
-        for obj in session:
-            if isinstance(obj, self.activity_cls):
-                obj.transaction = uow.current_transaction
-                obj.calculate_target_tx_id()
-                obj.calculate_object_tx_id()
+        for obj in self.changed_activities(session):
+            obj.transaction = uow.current_transaction
+            obj.calculate_target_tx_id()
+            obj.calculate_object_tx_id()
 
     def after_version_class_built(self, parent_cls, version_cls):
         pass
@@ -32,6 +32,9 @@ class Plugin:
     def after_construct_changeset(self, version_obj, changeset):
         pass
 
+    def audit_tables(self, manager):
+        return []
+
 
 class PluginCollection:
     def __init__(self, plugins=None):
@@ -41,6 +44,9 @@ class PluginCollection:
             self.plugins = plugins.plugins
         else:
             self.plugins = plugins
+        # Incremented on every modification so that cached versioning plans
+        # can detect that their plugin hooks are stale.
+        self.revision = 0
 
     def __iter__(self):
         yield from self.plugins
@@ -59,9 +65,11 @@ class PluginCollection:
 
     def __setitem__(self, index, element):
         self.plugins[index] = element
+        self.revision += 1
 
     def __delitem__(self, index):
         del self.plugins[index]
+        self.revision += 1
 
     def __getattr__(self, attr):
         def wrapper(*args, **kwargs):
@@ -71,3 +79,4 @@ class PluginCollection:
 
     def append(self, el):
         self.plugins.append(el)
+        self.revision += 1
@@ -51,6 +51,13 @@ class PropertyModTrackerPlugin(Plugin):
                     columns.append(self.create_mod_column(column))
 
     def after_create_version_object(self, uow, parent_obj, version_obj):
+        changed_keys = uow.changed_keys(parent_obj)
+        if changed_keys is not None:
+            for prop in versioned_column_properties(parent_obj):
+                if prop.key in changed_keys:
+                    setattr(version_obj, prop.key + self.column_suffix, True)
+            return
+
         session = sa.orm.object_session(parent_obj)
         is_deleted = parent_obj in session.deleted
 
@@ -59,6 +59,7 @@ class TransactionChangesFactory(ModelFactory):
 
 class TransactionChangesPlugin(Plugin):
     objects = None
+    model_class = None
 
     def after_build_tx_class(self, manager):
         self.model_class = TransactionChangesFactory()(manager)
@@ -79,6 +80,11 @@ class TransactionChangesPlugin(Plugin):
                 )
                 session.add(changes)
 
+    def audit_tables(self, manager):
+        if self.model_class is None:
+            return []
+        return [self.model_class.__table__]
+
     def clear(self):
         self.objects = None
 
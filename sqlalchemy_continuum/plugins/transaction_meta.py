@@ -93,6 +93,8 @@ class TransactionMetaFactory(ModelFactory):
 
 
 class TransactionMetaPlugin(Plugin):
+    model_class = None
+
     def after_build_tx_class(self, manager):
         self.model_class = TransactionMetaFactory()(manager)
         manager.transaction_meta_cls = self.model_class
@@ -100,3 +102,8 @@ class TransactionMetaPlugin(Plugin):
     def after_build_models(self, manager):
         self.model_class = TransactionMetaFactory()(manager)
         manager.transaction_meta_cls = self.model_class
+
+    def audit_tables(self, manager):
+        if self.model_class is None:
+            return []
+        return [self.model_class.__table__]
@@ -6,6 +6,91 @@ from .operation import Operation
 from .table_builder import TableBuilder
 from .utils import adapt_columns, option, version_class
 
+#: Maximum number of version objects whose relationships are loaded with a
+#: single query by :func:`load_version_relationships`.
+batch_size = 200
+
+
+def loaded_relationships(obj):
+    """
+    Return the dictionary holding the loaded reflected relationships of given
+    version object. Keys are relationship names and values the related
+    versions.
+
+    :param obj: Version object
+    """
+    return sa.inspect(obj).info.setdefault('reflected_relationships', {})
+
+
+def clear_loaded_relationships(state, *args):
+    state.info.pop('reflected_relationships', None)
+
+
+def correlated_owner(obj):
+    """
+    Return the FROM clauses the subqueries of the criteria of given version
+    object are correlated to. Version objects are bound as parameters, while
+    the owner alias used by :meth:`RelationshipBuilder.load_batch` is a FROM
+    clause of the enclosing query.
+
+    :param obj: Version object or aliased version class
+    """
+    if isinstance(obj, sa.orm.util.AliasedClass):
+        return (obj,)
+    return ()
+
+
+def load_version_relationships(versions, *names):
+    """
+    Load given reflected relationships of given version objects with one
+    query per relationship (and per `batch_size` version objects) instead of
+    one query per version object and relationship. The related versions are
+    stored on each version object and returned by the relationship
+    attributes until the version object is expired or refreshed.
+
+    ::
+
+        from sqlalchemy_continuum import load_version_relationships
+
+
+        versions = session.query(ArticleVersion).all()
+        load_version_relationships(versions, 'tags', 'author')
+
+        for version in versions:
+            print(version.author.name, [tag.name for tag in version.tags])
+
+
+    :param versions: Version objects
+    :param names: Names of the relationships to load
+    """
+    versions = list(versions)
+    for name in names:
+        groups = {}
+        for version in versions:
+            descriptor = getattr(version.__class__, name, None)
+            if not isinstance(descriptor, ReflectedRelationship):
+                raise ValueError(
+                    f'{version.__class__.__name__}.{name} is not a reflected '
+                    'relationship'
+                )
+            groups.setdefault(descriptor.builder, []).append(version)
+        for builder, group in groups.items():
+            for start in range(0, len(group), batch_size):
+                builder.load_batch(group[start : start + batch_size])
+
+
+class ReflectedRelationship(property):
+    """
+    Property of a version class returning the versions related to a version
+    object through a relationship of its parent class.
+
+    :param builder: RelationshipBuilder object of the relationship
+    """
+
+    def __init__(self, builder):
+        property.__init__(self, builder.load)
+        self.builder = builder
+
 
 class RelationshipBuilder:
     def __init__(self, versioning_manager, model, property_):
@@ -13,7 +98,63 @@ class RelationshipBuilder:
         self.property = property_
         self.model = model
 
+    @property
+    def remote_append_only(self):
+        return option(self.remote_cls, 'strategy') == 'append_only'
+
+    def append_only_subquery(self, obj):
+        """
+        Returns the criteria matching the versions of the remote class that
+        were current at the transaction of `obj` when the remote class uses
+        the 'append_only' strategy. Instead of aggregating the whole history
+        of each remote object this only checks that the version has not been
+        superseded by a version pointing back to it::
+
+            tags_version.transaction_id <= 5
+            AND NOT EXISTS (
+                SELECT 1
+                FROM tags_version AS tags_version_next
+                WHERE tags_version_next.previous_transaction_id =
+                    tags_version.transaction_id
+                AND tags_version_next.id = tags_version.id
+                AND tags_version_next.transaction_id <= 5
+            )
+
+        :param obj: SQLAlchemy declarative object
+        """
+        tx_column = option(obj, 'transaction_column_name')
+        previous_tx_column = option(self.remote_cls, 'previous_transaction_column_name')
+
+        next_alias = sa.orm.aliased(self.remote_cls)
+        primary_keys = [
+            column.name
+            for column in sa.inspect(next_alias).mapper.columns
+            if column.primary_key and column.name != tx_column
+        ]
+
+        return sa.and_(
+            getattr(self.remote_cls, tx_column) <= getattr(obj, tx_column),
+            ~sa.exists(
+                sa.select(1)
+                .where(
+                    sa.and_(
+                        getattr(next_alias, previous_tx_column)
+                        == getattr(self.remote_cls, tx_column),
+                        getattr(next_alias, tx_column) <= getattr(obj, tx_column),
+                        *[
+                            getattr(next_alias, pk) == getattr(self.remote_cls, pk)
+                            for pk in primary_keys
+                        ],
+                    )
+                )
+                .correlate(self.remote_cls, *correlated_owner(obj))
+            ),
+        )
+
     def one_to_many_subquery(self, obj):
+        if self.remote_append_only:
+            return self.append_only_subquery(obj)
+
         tx_column = option(obj, 'transaction_column_name')
 
         remote_alias = sa.orm.aliased(self.remote_cls)
@@ -23,27 +164,33 @@ class RelationshipBuilder:
             if column.primary_key and column.name != tx_column
         ]
 
-        return sa.exists(
-            sa.select(1)
-            .where(
-                sa.and_(
-                    getattr(remote_alias, tx_column) <= getattr(obj, tx_column),
-                    *[
-                        getattr(remote_alias, pk.name)
-                        == getattr(self.remote_cls, pk.name)
-                        for pk in primary_keys
-                    ],
+        return sa.and_(
+            getattr(self.remote_cls, tx_column) <= getattr(obj, tx_column),
+            sa.exists(
+                sa.select(1)
+                .where(
+                    sa.and_(
+                        getattr(remote_alias, tx_column) <= getattr(obj, tx_column),
+                        *[
+                            getattr(remote_alias, pk.name)
+                            == getattr(self.remote_cls, pk.name)
+                            for pk in primary_keys
+                        ],
+                    )
                 )
-            )
-            .group_by(*primary_keys)
-            .having(
-                sa.func.max(getattr(remote_alias, tx_column))
-                == getattr(self.remote_cls, tx_column)
-            )
-            .correlate(self.local_cls, self.remote_cls)
+                .group_by(*primary_keys)
+                .having(
+                    sa.func.max(getattr(remote_alias, tx_column))
+                    == getattr(self.remote_cls, tx_column)
+                )
+                .correlate(self.local_cls, self.remote_cls, *correlated_owner(obj))
+            ),
         )
 
     def many_to_one_subquery(self, obj):
+        if self.remote_append_only:
+            return self.append_only_subquery(obj)
+
         tx_column = option(obj, 'transaction_column_name')
         reflector = VersionExpressionReflector(obj, self.property)
         subquery = sa.select(sa.func.max(getattr(self.remote_cls, tx_column))).where(
@@ -52,14 +199,90 @@ class RelationshipBuilder:
                 reflector(self.property.primaryjoin),
             )
         )
+        if correlated_owner(obj):
+            subquery = subquery.correlate(obj)
         subquery = subquery.scalar_subquery()
 
-        return getattr(self.remote_cls, tx_column) == subquery
+        return sa.and_(
+            getattr(self.remote_cls, tx_column) == subquery,
+            getattr(self.remote_cls, tx_column) <= getattr(obj, tx_column),
+        )
 
     def query(self, obj):
         session = sa.orm.object_session(obj)
         return session.query(self.remote_cls).filter(self.criteria(obj))
 
+    def load(self, obj):
+        """
+        Return the versions related to given version object, either loaded
+        by :func:`load_version_relationships` or queried.
+
+        Version rows do not change once committed, so queried results are
+        stored on the version object as well and returned until it is
+        expired or refreshed. Results are not stored for dynamic
+        relationships, relationships to non-versioned classes and while the
+        session has uncommitted versions.
+
+        :param obj: Version object
+        """
+        loaded = loaded_relationships(obj)
+        if self.property.key in loaded:
+            return loaded[self.property.key]
+        result = self.process_query(self.query(obj))
+        if self.is_memoizable(obj):
+            loaded[self.property.key] = result
+        return result
+
+    def is_memoizable(self, obj):
+        return (
+            self.versioned
+            and self.property.lazy != 'dynamic'
+            and not self.manager.has_uncommitted_versions(sa.orm.object_session(obj))
+        )
+
+    def load_batch(self, objs):
+        """
+        Query the versions related to given version objects with a single
+        query and store them on the version objects. The criteria of the
+        relationship are applied once, to an alias of the local version class
+        standing in for the version objects, whose primary keys are matched
+        with an IN clause::
+
+            SELECT tags_version.*, article_version.id,
+                article_version.transaction_id
+            FROM tags_version, article_version AS owner
+            WHERE (owner.id, owner.transaction_id) IN (...)
+            AND tags_version.article_id = owner.id
+            AND tags_version.transaction_id <= owner.transaction_id
+            AND ...
+
+        :param objs: Version objects
+        """
+        if self.property.lazy == 'dynamic':
+            raise ValueError(
+                f'Dynamic relationship {self.property.key!r} can not be loaded'
+            )
+        session = sa.orm.object_session(objs[0])
+        owner = sa.orm.aliased(self.local_cls)
+        mapper = sa.inspect(self.local_cls)
+        owner_keys = [
+            getattr(owner, mapper.get_property_by_column(column).key)
+            for column in mapper.primary_key
+        ]
+        query = sa.select(self.remote_cls, *owner_keys).where(
+            sa.tuple_(*owner_keys).in_([sa.inspect(obj).identity for obj in objs]),
+            self.criteria(owner),
+        )
+
+        related = {sa.inspect(obj).identity: [] for obj in objs}
+        for remote, *identity in session.execute(query):
+            related[tuple(identity)].append(remote)
+        for obj in objs:
+            remotes = related[sa.inspect(obj).identity]
+            if self.property.uselist is False:
+                remotes = remotes[0] if remotes else None
+            loaded_relationships(obj)[self.property.key] = remotes
+
     def process_query(self, query):
         """
         Process given SQLAlchemy Query object depending on the associated
@@ -163,6 +386,7 @@ class RelationshipBuilder:
         SELECT *
         FROM articles_version
         WHERE id = 4
+        AND transaction_id <= 5
         AND transaction_id = (
             SELECT max(transaction_id)
             FROM articles_version
@@ -198,6 +422,7 @@ class RelationshipBuilder:
         FROM tags_version
         WHERE tags_version.article_id = 3
         AND tags_version.operation_type != 2
+        AND tags_version.transaction_id <= 5
         AND EXISTS (
             SELECT 1
             FROM tags_version as tags_version_last
@@ -224,12 +449,7 @@ class RelationshipBuilder:
         relationship between two version classes.
         """
 
-        @property
-        def relationship(obj):
-            query = self.query(obj)
-            return self.process_query(query)
-
-        return relationship
+        return ReflectedRelationship(self)
 
     def association_subquery(self, obj):
         """
@@ -293,19 +513,21 @@ class RelationshipBuilder:
                 sa.func.max(association_table_alias.c[tx_column])
                 == self.association_version_table.c[tx_column]
             )
-            .correlate(self.association_version_table)
+            .correlate(self.association_version_table, *correlated_owner(obj))
         )
         return sa.exists(
             sa.select(1)
             .where(
                 sa.and_(
                     reflector(self.property.primaryjoin),
+                    self.association_version_table.c[tx_column]
+                    <= getattr(obj, tx_column),
                     association_exists,
                     self.association_version_table.c.operation_type != Operation.DELETE,
                     adapt_columns(self.property.secondaryjoin),
                 )
             )
-            .correlate(self.local_cls, self.remote_cls)
+            .correlate(self.local_cls, self.remote_cls, *correlated_owner(obj))
         )
 
     def build_association_version_tables(self):
@@ -363,3 +585,10 @@ class RelationshipBuilder:
                     self.remote_to_association_column_pairs.append(column_pair)
 
         setattr(self.local_cls, self.property.key, self.reflected_relationship)
+        for identifier in ('expire', 'refresh'):
+            if not sa.event.contains(
+                self.local_cls, identifier, clear_loaded_relationships
+            ):
+                sa.event.listen(
+                    self.local_cls, identifier, clear_loaded_relationships, raw=True
+                )
@@ -0,0 +1,79 @@
+"""
+Read routing for version history. When the 'read_router' option is set ORM
+queries that load version objects, transactions or plugin models (such as
+``article.versions``, version traversal, reflected version relationships and
+``Transaction.changed_entities``) are executed on the bind returned by the
+router instead of the bind of the session.
+
+::
+
+    from sqlalchemy_continuum.routing import ReplicaReadRouter
+
+    make_versioned(options={'read_router': ReplicaReadRouter(replica_engine)})
+"""
+
+import sqlalchemy as sa
+
+
+class ReplicaReadRouter:
+    """
+    Routes history reads to a read replica while keeping reads of a session
+    consistent with its own writes.
+
+    Sessions that have uncommitted versions always read from the primary.
+    Once a session commits a versioned transaction its id is remembered and
+    the session keeps reading history from the primary until that
+    transaction has been replicated.
+
+    Subclass and override :meth:`get_bind` for other routing policies.
+
+    :param replica: Engine of the read replica
+    """
+
+    #: Key of the last committed transaction id in `Session.info`.
+    info_key = 'versioning_written_transaction_id'
+
+    def __init__(self, replica):
+        self.replica = replica
+
+    def record_write(self, session, transaction_id):
+        """
+        Remember that given session committed given transaction.
+
+        :param session: SQLAlchemy session object
+        :param transaction_id: id of the committed transaction
+        """
+        if transaction_id > session.info.get(self.info_key, 0):
+            session.info[self.info_key] = transaction_id
+
+    def is_replicated(self, manager, transaction_id):
+        """
+        Return whether or not given transaction exists on the replica.
+
+        :param manager: VersioningManager object
+        :param transaction_id: id of the transaction to look up
+        """
+        table = manager.transaction_cls.__table__
+        with self.replica.connect() as connection:
+            return (
+                connection.execute(
+                    sa.select(table.c.id).where(table.c.id == transaction_id)
+                ).first()
+                is not None
+            )
+
+    def get_bind(self, manager, session):
+        """
+        Return the bind history reads of given session are executed on or
+        None for the bind of the session itself.
+
+        :param manager: VersioningManager object
+        :param session: SQLAlchemy session object
+        """
+        transaction_id = session.info.get(self.info_key)
+        if transaction_id is None:
+            return self.replica
+        if self.is_replicated(manager, transaction_id):
+            del session.info[self.info_key]
+            return self.replica
+        return None
@@ -1,3 +1,5 @@
+import re
+
 import sqlalchemy as sa
 
 
@@ -168,3 +170,257 @@ def update_property_mod_flags(
             criteria = [getattr(table.c, pk) == getattr(row, pk) for pk in primary_keys]
             query = table.update().where(sa.and_(*criteria)).values(values)
             conn.execute(query)
+
+
+def update_version_chain_columns(
+    table,
+    previous_tx_column_name='previous_transaction_id',
+    version_number_column_name='version_number',
+    tx_column_name='transaction_id',
+    conn=None,
+    chunk_size=1000,
+):
+    """
+    Calculates previous transaction and version number columns and updates the
+    version table with the calculated values. This function can be used for
+    migrating an existing version table to the 'version_chain' option or to
+    the 'append_only' versioning strategy.
+
+    Version rows are read in primary key order, `chunk_size` rows at a time,
+    and each chunk is updated with one executemany UPDATE statement.
+
+    :param table: SQLAlchemy table object
+    :param previous_tx_column_name:
+        Name of the previous transaction column or None if the table has no
+        such column
+    :param version_number_column_name:
+        Name of the version number column or None if the table has no such
+        column
+    :param tx_column_name: Transaction column name
+    :param conn:
+        Either SQLAlchemy Connection, Engine, Session or Alembic
+        Operations object. Basically this should be an object that can execute
+        the queries needed to update the chain column values.
+
+        If no object is given then this function tries to use alembic.op for
+        executing the queries.
+    :param chunk_size: Number of version rows read and updated at a time
+    """
+    if conn is None:
+        from alembic import op
+
+        conn = op.get_bind()
+
+    tx_column = table.c[tx_column_name]
+    pk_columns = [c for c in table.primary_key if c.name != tx_column_name]
+    key_columns = pk_columns + [tx_column]
+    query = sa.select(*key_columns).order_by(*key_columns).limit(chunk_size)
+
+    values = {}
+    if previous_tx_column_name is not None:
+        values[previous_tx_column_name] = sa.bindparam('chain_previous_tx')
+    if version_number_column_name is not None:
+        values[version_number_column_name] = sa.bindparam('chain_version_number')
+    update_stmt = (
+        table.update()
+        .where(sa.and_(*[c == sa.bindparam('key_' + c.name) for c in key_columns]))
+        .values(values)
+    )
+
+    identity = previous_tx = None
+    version_number = 0
+    last_key = None
+    while True:
+        chunk_query = query
+        if last_key is not None:
+            chunk_query = query.where(sa.tuple_(*key_columns) > sa.tuple_(*last_key))
+        rows = conn.execute(chunk_query).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            if tuple(row[:-1]) != identity:
+                identity = tuple(row[:-1])
+                previous_tx = None
+                version_number = 0
+            version_number += 1
+            params.append(
+                {
+                    **{'key_' + c.name: value for c, value in zip(key_columns, row)},
+                    'chain_previous_tx': previous_tx,
+                    'chain_version_number': version_number,
+                }
+            )
+            previous_tx = row[-1]
+        conn.execute(update_stmt, params)
+        last_key = tuple(rows[-1])
+
+
+def version_partition_name(table, start):
+    """
+    Returns the name of the partition of given version table starting from
+    given transaction id.
+
+    :param table: SQLAlchemy table object
+    :param start: Lower bound of the partition
+    """
+    return f'{table.name}_p{start}'
+
+
+def _dialect(conn):
+    if hasattr(conn, 'get_bind'):
+        conn = conn.get_bind()
+    return conn.dialect
+
+
+def _qualified_name(conn, name, schema):
+    preparer = _dialect(conn).identifier_preparer
+    if schema is None:
+        return preparer.quote(name)
+    return preparer.quote_schema(schema) + '.' + preparer.quote(name)
+
+
+def create_version_partitions(
+    table,
+    partition_size,
+    count=4,
+    transaction_id=None,
+    tx_column_name='transaction_id',
+    conn=None,
+):
+    """
+    Creates the partitions of a version table partitioned by range of its
+    transaction column, see the 'partition_size' option. Partitions are
+    created from the partition containing `transaction_id` up to `count`
+    partitions beyond it. Existing partitions are left untouched, so this
+    function can be run periodically to create partitions ahead of the
+    transaction ids handed out.
+
+    On dialects other than PostgreSQL version tables are not partitioned and
+    this function does nothing.
+
+    :param table: SQLAlchemy table object
+    :param partition_size: Number of transaction ids per partition
+    :param count: Number of partitions to create beyond the current one
+    :param transaction_id:
+        Transaction id the partitions are created from. Defaults to the
+        highest transaction id of the version table.
+    :param tx_column_name: Transaction column name
+    :param conn:
+        Either SQLAlchemy Connection, Engine, Session or Alembic
+        Operations object. Basically this should be an object that can execute
+        the queries needed to create the partitions.
+
+        If no object is given then this function tries to use alembic.op for
+        executing the queries.
+    :return: Names of the partitions created or already existing
+    """
+    if conn is None:
+        from alembic import op
+
+        conn = op.get_bind()
+
+    if _dialect(conn).name != 'postgresql':
+        return []
+
+    if transaction_id is None:
+        transaction_id = conn.execute(
+            sa.select(sa.func.max(table.c[tx_column_name]))
+        ).scalar()
+    start = (transaction_id or 0) // partition_size * partition_size
+    parent = _qualified_name(conn, table.name, table.schema)
+    names = []
+    for index in range(count + 1):
+        lower = start + index * partition_size
+        name = version_partition_name(table, lower)
+        conn.execute(
+            sa.text(
+                f'CREATE TABLE IF NOT EXISTS '
+                f'{_qualified_name(conn, name, table.schema)} '
+                f'PARTITION OF {parent} '
+                f'FOR VALUES FROM ({lower}) TO ({lower + partition_size})'
+            )
+        )
+        names.append(name)
+    return names
+
+
+def version_partitions(table, conn=None):
+    """
+    Returns the partitions of given version table as a list of (name,
+    lower bound, upper bound) tuples ordered by their lower bound. The
+    default partition, if any, is not included.
+
+    :param table: SQLAlchemy table object
+    :param conn:
+        Either SQLAlchemy Connection, Engine, Session or Alembic
+        Operations object.
+
+        If no object is given then this function tries to use alembic.op for
+        executing the queries.
+    """
+    if conn is None:
+        from alembic import op
+
+        conn = op.get_bind()
+
+    if _dialect(conn).name != 'postgresql':
+        return []
+
+    rows = conn.execute(
+        sa.text(
+            'SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) '
+            'FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = CAST(:table AS regclass)'
+        ),
+        {'table': _qualified_name(conn, table.name, table.schema)},
+    )
+    partitions = []
+    for name, bound in rows:
+        match = re.search(r"FROM \('?(-?\d+)'?\) TO \('?(-?\d+)'?\)", bound)
+        if match:
+            partitions.append((name, int(match.group(1)), int(match.group(2))))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def detach_version_partitions(table, before_transaction_id, drop=False, conn=None):
+    """
+    Detaches the partitions of given version table that only contain versions
+    created before given transaction. Detached partitions are ordinary tables
+    which can be archived or dropped without touching the rest of the version
+    history.
+
+    On dialects other than PostgreSQL version tables are not partitioned and
+    this function does nothing.
+
+    :param table: SQLAlchemy table object
+    :param before_transaction_id:
+        Partitions whose upper bound is less than or equal to this
+        transaction id are detached.
+    :param drop: Whether or not to drop the detached partitions
+    :param conn:
+        Either SQLAlchemy Connection, Engine, Session or Alembic
+        Operations object. Basically this should be an object that can execute
+        the queries needed to detach the partitions.
+
+        If no object is given then this function tries to use alembic.op for
+        executing the queries.
+    :return: Names of the detached partitions
+    """
+    if conn is None:
+        from alembic import op
+
+        conn = op.get_bind()
+
+    parent = _qualified_name(conn, table.name, table.schema)
+    names = []
+    for name, _, upper in version_partitions(table, conn=conn):
+        if upper > before_transaction_id:
+            continue
+        partition = _qualified_name(conn, name, table.schema)
+        conn.execute(sa.text(f'ALTER TABLE {parent} DETACH PARTITION {partition}'))
+        if drop:
+            conn.execute(sa.text(f'DROP TABLE {partition}'))
+        names.append(name)
+    return names
@@ -1,6 +1,88 @@
 import sqlalchemy as sa
 
 
+class VersionIndexPolicy:
+    """
+    Decides which indexes the version tables built by :class:`TableBuilder`
+    get. The default policy reproduces the indexes of the parent table and
+    indexes each internal column separately. The primary key of version
+    tables, (pk..., transaction_id), is always present and serves lookups of
+    the versions of an object in transaction order.
+
+    ::
+
+        make_versioned(
+            options={
+                'index_policy': VersionIndexPolicy(
+                    copy_parent_indexes=False,
+                    temporal_indexes=True,
+                    current_version_index=True,
+                )
+            }
+        )
+
+    :param copy_parent_indexes:
+        Whether or not columns indexed in the parent table are indexed in the
+        version table as well.
+    :param temporal_indexes:
+        Replace the separate end_transaction_id and previous_transaction_id
+        indexes with composite (pk..., end_transaction_id) and (pk...,
+        previous_transaction_id) indexes.
+    :param current_version_index:
+        Add a partial (pk...) index covering the rows whose end_transaction_id
+        is NULL, i.e. the current versions. Only applies to the 'validity'
+        strategy. Dialects without partial indexes get a plain index.
+    :param brin_transaction_index:
+        Index the transaction column with a BRIN index on PostgreSQL. Other
+        dialects get a plain index.
+    """
+
+    def __init__(
+        self,
+        copy_parent_indexes=True,
+        temporal_indexes=False,
+        current_version_index=False,
+        brin_transaction_index=False,
+    ):
+        self.copy_parent_indexes = copy_parent_indexes
+        self.temporal_indexes = temporal_indexes
+        self.current_version_index = current_version_index
+        self.brin_transaction_index = brin_transaction_index
+
+    def indexes(self, table, builder):
+        """
+        Create the indexes of given version table that are not defined by its
+        columns.
+
+        :param table: version table
+        :param builder: TableBuilder object that built given table
+        """
+        tx_column = table.c[builder.option('transaction_column_name')]
+        end_tx_column = table.c.get(builder.option('end_transaction_column_name'))
+        previous_tx_column = table.c.get(
+            builder.option('previous_transaction_column_name')
+        )
+        pk_columns = [c for c in table.primary_key if c is not tx_column]
+
+        if self.brin_transaction_index:
+            sa.Index(
+                f'ix_{table.name}_{tx_column.name}',
+                tx_column,
+                postgresql_using='brin',
+            )
+        if self.temporal_indexes:
+            for column in (end_tx_column, previous_tx_column):
+                if column is not None:
+                    sa.Index(f'ix_{table.name}_{column.name}', *pk_columns, column)
+        if self.current_version_index and end_tx_column is not None:
+            sa.Index(
+                f'ix_{table.name}_current',
+                *pk_columns,
+                postgresql_where=end_tx_column.is_(None),
+                sqlite_where=end_tx_column.is_(None),
+            )
+
+
 class ColumnReflector:
     def __init__(self, manager, parent_table, model=None):
         self.parent_table = parent_table
@@ -13,6 +95,10 @@ class ColumnReflector:
         except TypeError:
             return self.manager.options[name]
 
+    @property
+    def index_policy(self):
+        return self.option('index_policy') or VersionIndexPolicy()
+
     def reflect_column(self, column):
         """
         Make a copy of parent table column and some alterations to it.
@@ -22,6 +108,8 @@ class ColumnReflector:
         # Make a copy of the column so that it does not point to wrong table.
         column_copy = column._copy()
         column_copy.unique = False
+        if not self.index_policy.copy_parent_indexes:
+            column_copy.index = None
         column_copy.onupdate = None
         if column_copy.autoincrement:
             column_copy.autoincrement = False
@@ -61,7 +149,7 @@ class ColumnReflector:
             self.option('transaction_column_name'),
             sa.BigInteger,
             primary_key=True,
-            index=True,
+            index=not self.index_policy.brin_transaction_index,
             autoincrement=False,  # This is needed for MySQL
         )
 
@@ -72,9 +160,31 @@ class ColumnReflector:
         'end_transaction_id'.
         """
         return sa.Column(
-            self.option('end_transaction_column_name'), sa.BigInteger, index=True
+            self.option('end_transaction_column_name'),
+            sa.BigInteger,
+            index=not self.index_policy.temporal_indexes,
         )
 
+    @property
+    def previous_transaction_column(self):
+        """
+        Returns previous_transaction column. By default the name of this
+        column is 'previous_transaction_id'.
+        """
+        return sa.Column(
+            self.option('previous_transaction_column_name'),
+            sa.BigInteger,
+            index=not self.index_policy.temporal_indexes,
+        )
+
+    @property
+    def version_number_column(self):
+        """
+        Returns version_number column. By default the name of this column is
+        'version_number'.
+        """
+        return sa.Column(self.option('version_number_column_name'), sa.Integer)
+
     @property
     def reflected_parent_columns(self):
         for column in self.parent_table.c:
@@ -90,8 +200,17 @@ class ColumnReflector:
         # single table inheritance
         if not self.model or not sa.inspect(self.model).single:
             yield self.transaction_column
-            if self.option('strategy') == 'validity':
+            strategy = self.option('strategy')
+            if strategy == 'validity':
                 yield self.end_transaction_column
+            # Association version tables are written without looking up
+            # previous versions, hence they never get the chain columns.
+            if self.model is not None:
+                version_chain = self.option('version_chain')
+                if strategy == 'append_only' or version_chain:
+                    yield self.previous_transaction_column
+                if version_chain:
+                    yield self.version_number_column
             yield self.operation_type_column
 
 
@@ -129,10 +248,50 @@ class TableBuilder:
         """
         columns = self.columns if extends is None else []
         self.manager.plugins.after_build_version_table_columns(self, columns)
-        return sa.schema.Table(
+        kwargs = {}
+        if extends is None and self.option('partition_size'):
+            kwargs['postgresql_partition_by'] = (
+                f'RANGE ({self.option("transaction_column_name")})'
+            )
+        table = sa.schema.Table(
             extends.name if extends is not None else self.table_name,
             self.parent_table.metadata,
             *columns,
             schema=self.parent_table.schema,
             extend_existing=extends is not None,
+            **kwargs,
+        )
+        if extends is None:
+            policy = self.option('index_policy') or VersionIndexPolicy()
+            policy.indexes(table, self)
+            if kwargs:
+                sa.event.listen(table, 'after_create', self.create_partitions)
+        return table
+
+    def create_partitions(self, table, connection, **kw):
+        """
+        Creates the first partitions of a version table partitioned with the
+        'partition_size' option. The partitions start from the partition of
+        the latest transaction id so that version tables added to an existing
+        database can be written to right away. Tables are only partitioned
+        on PostgreSQL.
+        """
+        if connection.dialect.name != 'postgresql':
+            return
+        from .schema import create_version_partitions
+
+        transaction_id = None
+        transaction_table = getattr(self.manager.transaction_cls, '__table__', None)
+        if transaction_table is not None and sa.inspect(connection).has_table(
+            transaction_table.name, schema=transaction_table.schema
+        ):
+            transaction_id = connection.scalar(
+                sa.select(sa.func.max(transaction_table.c.id))
+            )
+        create_version_partitions(
+            table,
+            self.option('partition_size'),
+            transaction_id=transaction_id,
+            tx_column_name=self.option('transaction_column_name'),
+            conn=connection,
         )
@@ -1,6 +1,10 @@
-from collections import OrderedDict
-from datetime import datetime
+from collections import OrderedDict, deque, namedtuple
+from datetime import datetime, timedelta, timezone
+import logging
 import sys
+from threading import Event, Lock, get_ident
+from weakref import WeakKeyDictionary
+import zlib
 
 import sqlalchemy as sa
 from sqlalchemy.ext.compiler import compiles
@@ -13,6 +17,8 @@ from .dialects.postgresql import (
 from .exc import ImproperlyConfigured
 from .factory import ModelFactory
 
+logger = logging.getLogger(__name__)
+
 
 # Compatibility function for datetime.utcnow() deprecation
 def utc_now():
@@ -41,8 +47,293 @@ class NoChangesAttribute(Exception):
     pass
 
 
+# Advisory lock acquisition in progress for an engine: the id of the thread
+# acquiring the lock and an Event set once it is done.
+LockClaim = namedtuple('LockClaim', ['thread_id', 'done'])
+
+
+class TransactionIdAllocator:
+    """
+    Hands out transaction ids from blocks that are fetched from the sequence
+    of the transaction id column ahead of time, so that creating a
+    transaction does not need its own INSERT round trip. Blocks are kept per
+    engine and the allocator is safe to use from multiple threads.
+
+    Versions are ordered by transaction id, which only matches the order in
+    which transactions are committed if the ids are handed out by a single
+    process. When another process holds a block of lower ids the versions
+    it writes would be ordered before versions that were committed earlier,
+    leaving more than one version of an object open. Before fetching its
+    first block for an engine the allocator therefore takes a session level
+    advisory lock on a dedicated connection of the engine. If another process
+    already holds it a warning is logged and no ids are preallocated for the
+    engine. The lock is released by :meth:`close` or when the process exits.
+
+    Preallocation is only supported on PostgreSQL with a sequence on the
+    transaction id column. For other engines no ids are preallocated and the
+    transaction rows are inserted right away.
+
+    The allocator can also be shared by coroutines using asyncio drivers, as
+    no lock is held while a block is being fetched.
+
+    :param transaction_cls: Transaction class
+    :param block_size: Number of ids fetched at a time
+    """
+
+    def __init__(self, transaction_cls, block_size):
+        self.transaction_cls = transaction_cls
+        self.block_size = block_size
+        self.lock = Lock()
+        self.blocks = WeakKeyDictionary()
+        # Keys as engines and values as LockClaim tuples.
+        self.claims = {}
+        # Keys as engines and values as the connections holding the advisory
+        # lock, or None if another process holds it.
+        self.lock_connections = {}
+
+    @property
+    def id_column(self):
+        return self.transaction_cls.__table__.c.id
+
+    @property
+    def sequence(self):
+        default = self.id_column.default
+        if isinstance(default, sa.schema.Sequence):
+            return default
+
+    @property
+    def lock_key(self):
+        """
+        Key of the advisory lock held by the process allocating the ids of
+        the transaction table.
+        """
+        table = self.transaction_cls.__table__
+        name = f'sqlalchemy_continuum.transaction_id:{table.fullname}'
+        return zlib.crc32(name.encode())
+
+    def is_supported(self, connection):
+        """
+        Return whether or not transaction ids can be preallocated for the
+        engine of given connection.
+
+        :param connection: SQLAlchemy Connection object
+        """
+        return connection.dialect.name == 'postgresql' and self.sequence is not None
+
+    def acquire_lock(self, engine):
+        """
+        Return a dedicated connection of given engine holding the advisory
+        lock of this allocator or None if another process holds the lock.
+
+        :param engine: SQLAlchemy Engine object
+        """
+        connection = engine.connect()
+        try:
+            locked = connection.scalar(
+                sa.select(sa.func.pg_try_advisory_lock(self.lock_key))
+            )
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not locked:
+            connection.close()
+            logger.warning(
+                'Transaction ids are already being preallocated by another '
+                'process, transaction rows are inserted without preallocation. '
+                'The transaction_id_block_size option requires that a single '
+                'process writes versioned data.'
+            )
+            return None
+        return connection
+
+    def claim_lock(self, engine, claim):
+        """
+        Acquire the advisory lock for given engine on behalf of all threads
+        waiting for given claim.
+
+        :param engine: SQLAlchemy Engine object
+        :param claim: LockClaim of given engine
+        """
+        try:
+            lock_connection = self.acquire_lock(engine)
+        except Exception:
+            # Let the next transaction try again.
+            with self.lock:
+                self.claims.pop(engine, None)
+            raise
+        else:
+            with self.lock:
+                self.lock_connections[engine] = lock_connection
+        finally:
+            claim.done.set()
+
+    def wait_for_lock(self, claim):
+        """
+        Wait until the advisory lock of given claim has been acquired and
+        return whether or not the claim is done. Coroutines sharing the
+        thread of the claiming coroutine do not wait, which would block the
+        claiming coroutine forever.
+
+        :param claim: LockClaim
+        """
+        if claim.done.is_set():
+            return True
+        if claim.thread_id == get_ident():
+            return False
+        claim.done.wait()
+        return True
+
+    def fetch_block(self, connection):
+        """
+        Return a list of `block_size` unused transaction ids.
+
+        :param connection: SQLAlchemy Connection object
+        """
+        query = sa.select(self.sequence.next_value()).select_from(
+            sa.func.generate_series(1, self.block_size)
+        )
+        return list(connection.scalars(query))
+
+    def close(self):
+        """
+        Release the advisory locks held by this allocator and forget the
+        remaining ids of all blocks.
+        """
+        with self.lock:
+            connections = [c for c in self.lock_connections.values() if c]
+            self.lock_connections = {}
+            self.claims = {}
+            self.blocks = WeakKeyDictionary()
+        for connection in connections:
+            # Closing returns the connection to the pool, which would keep
+            # the session level lock of its DBAPI connection.
+            connection.execute(sa.select(sa.func.pg_advisory_unlock(self.lock_key)))
+            connection.commit()
+            connection.close()
+
+    def __call__(self, connection):
+        """
+        Return the next free transaction id for the engine of given
+        connection or None if no ids are preallocated for it.
+
+        :param connection: SQLAlchemy Connection object
+        """
+        if not self.is_supported(connection):
+            return None
+        engine = connection.engine
+        with self.lock:
+            ids = self.blocks.get(engine)
+            if ids:
+                return ids.popleft()
+            claim = self.claims.get(engine)
+            claiming = claim is None
+            if claiming:
+                claim = self.claims[engine] = LockClaim(get_ident(), Event())
+
+        # Queries are executed without holding the lock: with asyncio drivers
+        # they yield to other tasks running in the same thread, which would
+        # block forever on a lock held by the suspended task.
+        if claiming:
+            self.claim_lock(engine, claim)
+        elif not self.wait_for_lock(claim):
+            return None
+        if self.lock_connections.get(engine) is None:
+            return None
+        block = self.fetch_block(connection)
+        with self.lock:
+            ids = self.blocks.setdefault(engine, deque())
+            ids.extend(block)
+            return ids.popleft()
+
+
+class TransactionResolver:
+    """
+    Resolves points in time to the id of the last transaction issued at or
+    before them, using the index on the `issued_at` column of the transaction
+    table. Resolutions are cached per engine in a least recently used cache of
+    `cache_size` entries.
+
+    Transactions get their `issued_at` timestamp when they start, not when
+    they commit, so a transaction committed later may still be issued before
+    a given point in time. Resolutions of points in time less than
+    `settle_time` ago are therefore not cached.
+
+    :param transaction_cls: Transaction class
+    :param cache_size: Maximum number of cached resolutions
+    :param settle_time:
+        timedelta after which resolutions of a point in time no longer
+        change
+    """
+
+    def __init__(self, transaction_cls, cache_size=1024, settle_time=None):
+        self.transaction_cls = transaction_cls
+        self.cache_size = cache_size
+        if settle_time is None:
+            settle_time = timedelta(minutes=5)
+        self.settle_time = settle_time
+        self.lock = Lock()
+        self.cache = OrderedDict()
+
+    def query(self, moment):
+        """
+        Return the query selecting the id of the last transaction issued at
+        or before given point in time.
+
+        :param moment: datetime object
+        """
+        cls = self.transaction_cls
+        return (
+            sa.select(cls.id)
+            .where(cls.issued_at <= moment)
+            .order_by(cls.issued_at.desc(), cls.id.desc())
+            .limit(1)
+        )
+
+    def is_settled(self, moment):
+        now = utc_now()
+        if moment.tzinfo is None:
+            now = now.replace(tzinfo=None)
+        return moment <= now - self.settle_time
+
+    def __call__(self, session, moment):
+        """
+        Return the id of the last transaction issued at or before given point
+        in time or None if there is no such transaction.
+
+        :param session: SQLAlchemy session object
+        :param moment: datetime object
+        """
+        if moment.tzinfo is not None:
+            # The issued_at column holds naive UTC datetimes. Comparing it to
+            # aware datetimes would go through the time zone of the database
+            # session on PostgreSQL.
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        bind = session.get_bind(mapper=sa.inspect(self.transaction_cls))
+        key = (getattr(bind, 'engine', bind), moment)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+        transaction_id = session.execute(self.query(moment)).scalar()
+        if transaction_id is not None and self.is_settled(moment):
+            with self.lock:
+                self.cache[key] = transaction_id
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return transaction_id
+
+    def clear(self):
+        """
+        Empty the cache of this resolver.
+        """
+        with self.lock:
+            self.cache.clear()
+
+
 class TransactionBase:
-    issued_at = sa.Column(sa.DateTime, default=utc_now)
+    issued_at = sa.Column(sa.DateTime, default=utc_now, index=True)
 
     @property
     def entity_names(self):
@@ -1,19 +1,22 @@
-from copy import copy
-
 import sqlalchemy as sa
-from ._compat import get_primary_keys, identity
 
-from .operation import Operations
-from .utils import (
-    end_tx_column_name,
-    is_session_modified,
-    tx_column_name,
-    version_class,
-    versioned_column_properties,
-)
+from .operation import Operation, Operations
 
 
 class UnitOfWork:
+    #: Maximum number of previous versions closed by a single UPDATE statement
+    #: when using the 'validity' versioning strategy.
+    validity_batch_size = 500
+
+    #: Maximum number of identities whose previous versions are looked up by a
+    #: single SELECT statement when using the 'append_only' versioning
+    #: strategy or the 'version_chain' option.
+    chain_batch_size = 500
+
+    #: Maximum number of objects whose unloaded attributes are loaded by a
+    #: single SELECT statement.
+    load_batch_size = 500
+
     def __init__(self, manager):
         self.manager = manager
         self.reset()
@@ -26,8 +29,24 @@ class UnitOfWork:
         self.version_session = None
         self.current_transaction = None
         self.operations = Operations()
-        self.pending_statements = []
+        self.pending_association_rows = {}
         self.version_objs = {}
+        self.pending_version_keys = {}
+        self.written_version_keys = set()
+        self.pending_validity_objs = []
+        self.pending_chain_objs = []
+        self.flushed_changes = {}
+        self.outbox_payload = {}
+
+    @property
+    def bulk_writes(self):
+        """
+        Return whether or not version rows are written with Core statements
+        instead of the version session. This is the case when the
+        'bulk_insert', the 'streaming' or the 'outbox' option is enabled.
+        """
+        options = self.manager.options
+        return options['bulk_insert'] or options['streaming'] or options['outbox']
 
     def is_modified(self, session):
         """
@@ -38,11 +57,9 @@ class UnitOfWork:
 
         :param session: SQLAlchemy session object
         """
-        return is_session_modified(session) or any(
-            self.manager.plugins.is_session_modified(session)
-        )
+        return self.manager.is_session_modified(session)
 
-    def process_before_flush(self, session):
+    def process_before_flush(self, session, modified=None):
         """
         Before flush processor for given session.
 
@@ -55,15 +72,22 @@ class UnitOfWork:
         objects this method does nothing.
 
         :param session: SQLAlchemy session object
+        :param modified:
+            Whether or not given session has been modified, if already known.
+            By default this is checked with :meth:`is_modified`.
         """
         if session == self.version_session:
             return
 
-        if not self.is_modified(session):
+        if modified is None:
+            modified = self.is_modified(session)
+        if not modified:
             return
 
         if not self.version_session:
-            self.version_session = sa.orm.session.Session(bind=session.connection())
+            self.version_session = sa.orm.session.Session(
+                bind=self.manager.version_connection(session)
+            )
 
         if not self.current_transaction:
             self.create_transaction(session)
@@ -86,9 +110,68 @@ class UnitOfWork:
             return
 
         if not self.version_session:
-            self.version_session = sa.orm.session.Session(bind=session.connection())
+            self.version_session = sa.orm.session.Session(
+                bind=self.manager.version_connection(session)
+            )
+
+        if self.manager.options['deferred_versions']:
+            self.record_flushed_changes()
+        else:
+            self.make_versions(session)
 
+    def record_flushed_changes(self):
+        """
+        Remember which attributes of the targets of pending operations were
+        changed by the current flush. The attribute history of an object is
+        reset once the flush completes, so plugins that inspect it (such as
+        PropertyModTrackerPlugin) would otherwise not see the changes when the
+        versions are written later on.
+
+        This method is only used when the 'deferred_versions' option is
+        enabled.
+        """
+        for key, operation in self.operations.items():
+            state = sa.inspect(operation.target)
+            changes = self.flushed_changes.setdefault(key, set())
+            if operation.type == Operation.DELETE:
+                changes.update(state.attrs.keys())
+                continue
+            for attr_key in state.committed_state:
+                if state.attrs[attr_key].history.has_changes():
+                    changes.add(attr_key)
+
+    def changed_keys(self, target):
+        """
+        Return the keys of the attributes of given object that were changed
+        by the flushes since its versions were last written or None if the
+        changes were not recorded, in which case the attribute history of the
+        object is up to date.
+
+        :param target: Parent object
+        """
+        return self.flushed_changes.get(self.operations.format_key(target))
+
+    def process_deferred_versions(self, session):
+        """
+        Write the version rows of the operations that were recorded since the
+        last write. Normally this is called before the transaction is
+        committed.
+
+        This method is only used when the 'deferred_versions' option is
+        enabled.
+
+        :param session: SQLAlchemy session object
+        """
+        if not self.current_transaction:
+            return
+        if not self.operations.pending and not self.pending_association_rows:
+            return
+        if not self.version_session:
+            self.version_session = sa.orm.session.Session(
+                bind=self.manager.version_connection(session)
+            )
         self.make_versions(session)
+        self.flushed_changes = {}
 
     def transaction_args(self, session):
         args = {}
@@ -100,6 +183,10 @@ class UnitOfWork:
         """
         Create transaction object for given SQLAlchemy session.
 
+        By default the transaction row is inserted immediately. If transaction
+        id preallocation is enabled the transaction gets a preallocated id and
+        its row is inserted by the next flush of given session instead.
+
         :param session: SQLAlchemy session object
         """
         args = self.transaction_args(session)
@@ -109,31 +196,55 @@ class UnitOfWork:
 
         for key, value in args.items():
             setattr(self.current_transaction, key, value)
+
+        transaction_id = self.manager.allocate_transaction_id(
+            self.manager.version_connection(session)
+        )
+        if transaction_id is not None:
+            # The transaction row is written by the flush of given session
+            # along with the versioned objects.
+            self.current_transaction.id = transaction_id
+            session.add(self.current_transaction)
+            return self.current_transaction
+
         if not self.version_session:
-            self.version_session = sa.orm.session.Session(bind=session.connection())
+            self.version_session = sa.orm.session.Session(
+                bind=self.manager.version_connection(session)
+            )
         self.version_session.add(self.current_transaction)
         self.version_session.flush()
         self.version_session.expunge(self.current_transaction)
         session.add(self.current_transaction)
         return self.current_transaction
 
-    def get_or_create_version_object(self, target):
+    def get_or_create_version_object(self, target, plan=None):
         """
         Return version object for given parent object. If no version object
         exists for given parent object, create one.
 
         :param target: Parent object to create the version object for
+        :param plan: VersioningPlan of the parent object's class
         """
-        version_cls = version_class(target.__class__)
-        version_id = identity(target) + (self.current_transaction.id,)
+        if plan is None:
+            plan = self.manager.plan(target.__class__)
+        version_cls = plan.version_cls
+        version_id = plan.identity(target) + (self.current_transaction.id,)
         version_key = (version_cls, version_id)
 
+        bulk_writes = self.bulk_writes
+        if bulk_writes:
+            self.pending_version_keys[version_key] = plan
+
         if version_key not in self.version_objs:
             version_obj = version_cls()
             self.version_objs[version_key] = version_obj
-            self.version_session.add(version_obj)
-            tx_column = self.manager.option(target, 'transaction_column_name')
-            setattr(version_obj, tx_column, self.current_transaction.id)
+            if not bulk_writes:
+                self.version_session.add(version_obj)
+            setattr(
+                version_obj, plan.transaction_column_name, self.current_transaction.id
+            )
+            if plan.chain:
+                self.pending_chain_objs.append((plan, version_obj))
             return version_obj
         else:
             return self.version_objs[version_key]
@@ -145,19 +256,22 @@ class UnitOfWork:
         1. Get or create a version object for given parent object
         2. Assign the operation type for this object
         3. Invoke listeners
-        4. Update version validity in case validity strategy is used
+        4. Queue the version object for validity update in case validity
+           strategy is used
         5. Mark operation as processed
 
         :param operation: Operation object
         """
         target = operation.target
-        version_obj = self.get_or_create_version_object(target)
+        plan = self.manager.plan(target.__class__)
+        version_obj = self.get_or_create_version_object(target, plan)
         version_obj.operation_type = operation.type
-        self.assign_attributes(target, version_obj)
+        self.assign_attributes(target, version_obj, plan)
 
-        self.manager.plugins.after_create_version_object(self, target, version_obj)
-        if self.manager.option(target, 'strategy') == 'validity':
-            self.update_version_validity(target, version_obj)
+        for hook in plan.version_object_hooks:
+            hook(self, target, version_obj)
+        if plan.validity:
+            self.pending_validity_objs.append((plan, version_obj))
         operation.processed = True
 
     def create_version_objects(self, session):
@@ -173,95 +287,368 @@ class UnitOfWork:
         ):
             return
 
-        for _key, operation in copy(self.operations).items():
-            if operation.processed:
-                continue
-
+        operations = list(self.operations.drain())
+        self.load_unloaded_attributes(session, operations)
+        for operation in operations:
             if not self.current_transaction:
                 raise Exception('Current transaction not available.')
             self.process_operation(operation)
 
+        if self.manager.options['outbox']:
+            self.queue_outbox_rows()
+        else:
+            if self.pending_chain_objs:
+                self.assign_chain_columns(self.pending_chain_objs)
+                self.pending_chain_objs = []
+            if self.bulk_writes:
+                self.write_version_objects()
         self.version_session.flush()
 
-    def version_validity_subquery(self, parent, version_obj, alias=None):
+        if self.pending_validity_objs:
+            self.update_version_validity(self.pending_validity_objs)
+            self.pending_validity_objs = []
+
+    def load_unloaded_attributes(self, session, operations):
         """
-        Return the subquery needed by :func:`update_version_validity`.
+        Load the unloaded versioned attributes of the targets of given
+        operations. Attributes are often expired after a flush (server
+        defaults, onupdate columns) or never loaded at all (deferred columns).
+        Instead of letting each attribute access trigger its own lazy load
+        they are loaded with one SELECT per versioned class (chunked by
+        `load_batch_size`)::
 
-        This method is only used when using 'validity' versioning strategy.
+            SELECT article.id, article.updated_at FROM article
+            WHERE article.id IN (...)
 
-        :param parent: SQLAlchemy declarative parent object
-        :parem version_obj: SQLAlchemy declarative version object
+        :param session: SQLAlchemy session object
+        :param operations: Operation objects about to be processed
+        """
+        unloaded = {}
+        for operation in operations:
+            if operation.type == Operation.DELETE:
+                continue
+            state = sa.inspect(operation.target)
+            if state.key is None:
+                continue
+            plan = self.manager.plan(state.class_)
+            keys = plan.versioned_column_keys.intersection(state.unloaded)
+            if keys:
+                states, all_keys = unloaded.setdefault(plan, ({}, set()))
+                states[state.key[1]] = state
+                all_keys.update(keys)
+
+        for plan, (states, keys) in unloaded.items():
+            model = plan.model
+            mapper = sa.inspect(model)
+            pk_keys = [
+                mapper.get_property_by_column(column).key
+                for column in mapper.primary_key
+            ]
+            keys = [key for key in plan.versioned_keys if key in keys]
+            pk_attrs = [getattr(model, key) for key in pk_keys]
+            if len(pk_attrs) == 1:
+                pk_expr = pk_attrs[0]
+            else:
+                pk_expr = sa.tuple_(*pk_attrs)
+            stmt = sa.select(*pk_attrs, *[getattr(model, key) for key in keys])
+
+            identities = list(states)
+            for index in range(0, len(identities), self.load_batch_size):
+                chunk = identities[index : index + self.load_batch_size]
+                if len(pk_attrs) == 1:
+                    chunk = [identity[0] for identity in chunk]
+                with session.no_autoflush:
+                    rows = session.execute(stmt.where(pk_expr.in_(chunk)))
+                for row in rows:
+                    state = states[tuple(row[: len(pk_keys)])]
+                    obj = state.obj()
+                    unloaded_keys = state.unloaded
+                    for key, value in zip(keys, row[len(pk_keys) :]):
+                        if key in unloaded_keys:
+                            sa.orm.attributes.set_committed_value(obj, key, value)
+
+    def version_rows(self, version_obj):
+        """
+        Return the column values of given version object as (table, values)
+        pairs, one pair for each table the version class is mapped to.
+        Attributes that were never assigned are left out so that column
+        defaults apply.
 
-        .. seealso:: :func:`update_version_validity`
+        :param version_obj: SQLAlchemy declarative version object
         """
-        fetcher = self.manager.fetcher(parent)
-        sa.orm.object_session(version_obj)
+        plan = self.manager.plan(self.manager.parent_class_map[version_obj.__class__])
+        for layout in plan.version_tables:
+            yield layout.table, layout.values(version_obj.__dict__)
 
-        subquery = fetcher._transaction_id_subquery(
-            version_obj, next_or_prev='prev', alias=alias
-        )
-        return subquery
+    def pending_version_rows(self):
+        """
+        Return the rows of the version objects processed since the last write
+        as two dictionaries, the rows to insert and the rows of version
+        objects written earlier within the same transaction to update. Keys
+        are version tables and values lists of column values.
+        """
+        inserts = {}
+        updates = {}
+        for version_key, plan in self.pending_version_keys.items():
+            if version_key in self.written_version_keys:
+                rows = updates
+            else:
+                rows = inserts
+            state_dict = self.version_objs[version_key].__dict__
+            for layout in plan.version_tables:
+                rows.setdefault(layout.table, []).append(layout.values(state_dict))
+        self.written_version_keys.update(self.pending_version_keys)
+        self.pending_version_keys = {}
+        return inserts, updates
+
+    def write_version_objects(self):
+        """
+        Write the version objects processed since the last write using Core
+        statements instead of the version session. Version rows are inserted
+        with one executemany INSERT per version table. Version objects that
+        were already written earlier within the same transaction are updated
+        in place with one executemany UPDATE per version table.
+
+        This method is only used when the 'bulk_insert' or the 'streaming'
+        option is enabled.
+        """
+        inserts, updates = self.pending_version_rows()
+        connection = self.version_session.connection()
+        for table, rows in inserts.items():
+            insert_rows(connection, table, rows)
+        for table, rows in updates.items():
+            update_rows(connection, table, rows)
+
+    def queue_outbox_rows(self):
+        """
+        Add the version rows processed since the last write, the previous
+        versions they close and the tables whose previous versions need to be
+        looked up to the outbox payload of the current flush, instead of
+        writing them to the version tables.
+
+        This method is only used when the 'outbox' option is enabled.
+        """
+        payload = self.outbox_payload
+        inserts, updates = self.pending_version_rows()
+        for table, rows in inserts.items():
+            payload.setdefault('inserts', []).append((table.key, rows))
+        for table, rows in updates.items():
+            payload.setdefault('updates', []).append((table.key, rows))
+
+        for layout, identities in self.validity_identities(self.pending_validity_objs):
+            payload.setdefault('validity', []).append(
+                (
+                    layout.table.key,
+                    layout.tx_column.key,
+                    layout.end_tx_column.key,
+                    [column.key for column in layout.pk_columns],
+                    identities,
+                )
+            )
+        self.pending_validity_objs = []
+
+        layouts = {}
+        for plan, _ in self.pending_chain_objs:
+            for layout in plan.version_tables:
+                layouts[layout.table] = layout
+        for layout in layouts.values():
+            payload.setdefault('chain', []).append(
+                (
+                    layout.table.key,
+                    layout.tx_column.key,
+                    layout.previous_tx_column.key,
+                    (
+                        None
+                        if layout.version_number_column is None
+                        else layout.version_number_column.key
+                    ),
+                    [column.key for column in layout.pk_columns],
+                )
+            )
+        self.pending_chain_objs = []
 
-    def update_version_validity(self, parent, version_obj):
+    def write_outbox_entry(self):
         """
-        Updates previous version object end_transaction_id based on given
-        parent object and newly created version object.
+        Write the outbox payload of the current flush as a single row of the
+        outbox table. The rows are expanded into the version tables later on
+        by an :class:`~sqlalchemy_continuum.outbox.OutboxWorker`.
 
-        This method is only used when using 'validity' versioning strategy.
+        This method is only used when the 'outbox' option is enabled.
+        """
+        # The outbox module imports this module.
+        from .outbox import encode_payload
 
-        :param parent: SQLAlchemy declarative parent object
-        :parem version_obj: SQLAlchemy declarative version object
+        if not self.outbox_payload:
+            return
+        table = self.manager.outbox_cls.__table__
+        self.version_session.connection().execute(
+            table.insert(),
+            {
+                'transaction_id': self.current_transaction.id,
+                'payload': encode_payload(table.metadata.tables, self.outbox_payload),
+            },
+        )
+        self.outbox_payload = {}
 
-        .. seealso:: :func:`version_validity_subquery`
+    def update_version_validity(self, version_objs):
         """
-        session = sa.orm.object_session(version_obj)
+        Updates the end_transaction_id of the previous versions of given
+        version objects to point at the current transaction.
 
-        for class_ in version_obj.__class__.__mro__:
-            if class_ in self.manager.parent_class_map:
-                subquery = self.version_validity_subquery(
-                    parent, version_obj, alias=sa.orm.aliased(class_.__table__)
-                )
-                subquery = subquery.scalar_subquery()
-
-                vobj_tx_col = getattr(class_, tx_column_name(version_obj))
-                query = (
-                    sa.select(class_)
-                    .where(
-                        vobj_tx_col == subquery,
-                        *[
-                            getattr(version_obj, pk) == getattr(class_.__table__.c, pk)
-                            for pk in get_primary_keys(class_)
-                            if pk != tx_column_name(class_)
-                        ],
-                    )
-                    .execution_options(synchronize_session=False)
-                )
+        Previous versions are closed with set based UPDATE statements, one
+        for each version table (chunked by `validity_batch_size`)::
+
+            UPDATE article_version SET end_transaction_id = :tx
+            WHERE end_transaction_id IS NULL
+            AND transaction_id < :tx
+            AND id IN (...)
+
+        For joined table inheritance hierarchies each table of the hierarchy
+        is updated once regardless of how many classes share it.
+
+        This method is only used when using 'validity' versioning strategy.
+
+        :param version_objs:
+            (VersioningPlan, version object) pairs of newly created version
+            objects
+        """
+        connection = self.version_session.connection()
+        for layout, identities in self.validity_identities(version_objs):
+            close_previous_versions(
+                connection,
+                layout.table,
+                layout.tx_column,
+                layout.end_tx_column,
+                layout.pk_columns,
+                self.current_transaction.id,
+                identities,
+                self.validity_batch_size,
+            )
 
-                old_versions = session.scalars(query).all()
-                for old_version in old_versions:
+    def validity_identities(self, version_objs):
+        """
+        Return (VersionTableLayout, identities) pairs for closing the previous
+        versions of given version objects, one pair for each version table
+        with an end transaction column. Identities are the distinct primary
+        key values (without the transaction column) of the version rows.
+
+        :param version_objs:
+            (VersioningPlan, version object) pairs of newly created version
+            objects
+        """
+        identities = {}
+        for plan, version_obj in version_objs:
+            state_dict = version_obj.__dict__
+            for layout in plan.version_tables:
+                if layout.end_tx_column is None:
+                    continue
+                identities.setdefault(layout.table, (layout, {}))[1][
+                    tuple(state_dict.get(key) for key in layout.pk_keys)
+                ] = None
+        return [(layout, list(values)) for layout, values in identities.values()]
+
+    def assign_chain_columns(self, version_objs):
+        """
+        Assign the previous transaction id, and with the 'version_chain'
+        option the version number, of given newly created version objects.
+        The latest versions preceding the current transaction are looked up
+        with one SELECT per versioned class hierarchy (chunked by
+        `chain_batch_size`)::
+
+            SELECT id, max(transaction_id), max(version_number)
+            FROM article_version
+            WHERE transaction_id < :tx AND id IN (...)
+            GROUP BY id
+
+        This method is only used when using 'append_only' versioning
+        strategy or when the 'version_chain' option is enabled.
+
+        :param version_objs:
+            (VersioningPlan, version object) pairs of newly created version
+            objects
+        """
+        connection = self.version_session.connection()
+        for layout, identities in self.chain_identities(version_objs):
+            latest = latest_versions(
+                connection,
+                layout.table,
+                layout.tx_column,
+                layout.pk_columns,
+                list(identities),
+                self.chain_batch_size,
+                self.current_transaction.id,
+                layout.version_number_column,
+            )
+            for identity, objs in identities.items():
+                previous_tx, previous_number = latest.get(identity, (None, None))
+                for plan, version_obj in objs:
                     setattr(
-                        old_version,
-                        end_tx_column_name(version_obj),
-                        self.current_transaction.id,
+                        version_obj, plan.previous_transaction_column_name, previous_tx
                     )
+                    if plan.version_chain:
+                        setattr(
+                            version_obj,
+                            plan.version_number_column_name,
+                            (previous_number or 0) + 1,
+                        )
+
+    def chain_identities(self, version_objs):
+        """
+        Return (VersionTableLayout, identities) pairs for looking up the
+        previous versions of given version objects, one pair for the topmost
+        version table of each class hierarchy. Identities is a dictionary with
+        primary key values (without the transaction column) as keys and lists
+        of (VersioningPlan, version object) pairs as values.
+
+        :param version_objs:
+            (VersioningPlan, version object) pairs of newly created version
+            objects
+        """
+        identities = {}
+        for plan, version_obj in version_objs:
+            layout = plan.version_tables[0]
+            identity = tuple(version_obj.__dict__.get(key) for key in layout.pk_keys)
+            identities.setdefault(layout.table, (layout, {}))[1].setdefault(
+                identity, []
+            ).append((plan, version_obj))
+        return list(identities.values())
+
+    def append_association_row(self, table, params, operation_type):
+        """
+        Queue an association version row for given association version table.
+        The transaction id is bound when the rows are written.
+
+        :param table: association version table
+        :param params: column values of the association row
+        :param operation_type: the operation type of the row
+        """
+        self.pending_association_rows.setdefault(table, []).append(
+            {**params, 'operation_type': operation_type}
+        )
 
     def create_association_versions(self, session):
         """
-        Creates association table version records for given session.
+        Creates association table version records for given session. The
+        queued rows of each association version table are written with a
+        single executemany INSERT.
 
         :param session: SQLAlchemy session object
         """
-        statements = copy(self.pending_statements)
-        for stmt in statements:
-            stmt = stmt.values(
-                **{
-                    self.manager.options[
-                        'transaction_column_name'
-                    ]: self.current_transaction.id
-                }
+        transaction_column_name = self.manager.options['transaction_column_name']
+        for table, rows in self.pending_association_rows.items():
+            if self.manager.options['outbox']:
+                rows = [
+                    {**row, transaction_column_name: self.current_transaction.id}
+                    for row in rows
+                ]
+                self.outbox_payload.setdefault('inserts', []).append((table.key, rows))
+                continue
+            stmt = table.insert().values(
+                {transaction_column_name: self.current_transaction.id}
             )
-            session.execute(stmt)
-        self.pending_statements = []
+            for group in group_by_keys(rows):
+                session.execute(stmt, group)
+        self.pending_association_rows = {}
 
     def make_versions(self, session):
         """
@@ -272,22 +659,40 @@ class UnitOfWork:
         if not self.manager.options['versioning']:
             return
 
-        if self.pending_statements:
+        if self.pending_association_rows:
             self.create_association_versions(session)
 
         if self.operations:
             self.manager.plugins.before_create_version_objects(self, session)
             self.create_version_objects(session)
             self.manager.plugins.after_create_version_objects(self, session)
+            if self.manager.options['streaming'] or self.manager.options['outbox']:
+                self.release_version_objects()
+
+        if self.manager.options['outbox']:
+            self.write_outbox_entry()
+
+    def release_version_objects(self):
+        """
+        Forget the version objects written by the current flush so that they
+        can be garbage collected. Only the compact keys of the written version
+        rows are kept. If the same parent object changes again within the
+        transaction a new version object is created and its row is updated in
+        place.
+
+        This method is only used when the 'streaming' or the 'outbox' option
+        is enabled.
+        """
+        self.version_objs = {}
 
     @property
     def has_changes(self):
         """
         Return whether or not this unit of work has changes.
         """
-        return self.operations or self.pending_statements
+        return self.operations or self.pending_association_rows
 
-    def assign_attributes(self, parent_obj, version_obj):
+    def assign_attributes(self, parent_obj, version_obj, plan=None):
         """
         Assign attributes values from parent object to version object.
 
@@ -295,10 +700,170 @@ class UnitOfWork:
             Parent object to get the attribute values from
         :param version_obj:
             Version object to assign the attribute values to
+        :param plan:
+            VersioningPlan of the parent object's class
         """
-        for prop in versioned_column_properties(parent_obj):
+        if plan is None:
+            plan = self.manager.plan(parent_obj.__class__)
+        for key in plan.versioned_keys:
             try:
-                value = getattr(parent_obj, prop.key)
+                value = getattr(parent_obj, key)
             except sa.orm.exc.ObjectDeletedError:
                 value = None
-            setattr(version_obj, prop.key, value)
+            setattr(version_obj, key, value)
+
+
+def insert_rows(connection, table, rows):
+    """
+    Insert given rows into given table with one executemany INSERT per
+    distinct set of keys.
+
+    :param connection: SQLAlchemy Connection object
+    :param table: table to insert the rows into
+    :param rows: list of parameter dictionaries
+    """
+    for params in group_by_keys(rows):
+        connection.execute(table.insert(), params)
+
+
+def update_rows(connection, table, rows):
+    """
+    Update the rows of given table identified by the primary key values of
+    given rows with the rest of their values. Rows are updated with one
+    executemany UPDATE per distinct set of keys.
+
+    :param connection: SQLAlchemy Connection object
+    :param table: table to update
+    :param rows: list of parameter dictionaries including primary key values
+    """
+    pk_keys = [column.key for column in table.primary_key]
+    stmt = table.update().where(
+        sa.and_(
+            *[
+                column == sa.bindparam('pk_' + column.key)
+                for column in table.primary_key
+            ]
+        )
+    )
+    params = []
+    for values in rows:
+        row = {'pk_' + key: values[key] for key in pk_keys}
+        row.update((key, value) for key, value in values.items() if key not in pk_keys)
+        params.append(row)
+    for group in group_by_keys(params):
+        if len(group[0]) > len(pk_keys):
+            connection.execute(stmt, group)
+
+
+def close_previous_versions(
+    connection,
+    table,
+    tx_column,
+    end_tx_column,
+    pk_columns,
+    transaction_id,
+    identities,
+    batch_size,
+):
+    """
+    Point the end transaction column of the open versions of given identities
+    that precede given transaction at given transaction. Versions are closed
+    with one UPDATE per `batch_size` identities.
+
+    :param connection: SQLAlchemy Connection object
+    :param table: version table
+    :param tx_column: transaction column of the version table
+    :param end_tx_column: end transaction column of the version table
+    :param pk_columns: primary key columns without the transaction column
+    :param transaction_id: id of the transaction closing the versions
+    :param identities: list of primary key value tuples
+    :param batch_size: maximum number of identities per UPDATE
+    """
+    if len(pk_columns) == 1:
+        identities = [identity[0] for identity in identities]
+        pk_expr = pk_columns[0]
+    else:
+        pk_expr = sa.tuple_(*pk_columns)
+
+    for index in range(0, len(identities), batch_size):
+        chunk = identities[index : index + batch_size]
+        connection.execute(
+            table.update()
+            .where(
+                sa.and_(
+                    end_tx_column.is_(None),
+                    tx_column < transaction_id,
+                    pk_expr.in_(chunk),
+                )
+            )
+            .values({end_tx_column.key: transaction_id})
+        )
+
+
+def latest_versions(
+    connection,
+    table,
+    tx_column,
+    pk_columns,
+    identities,
+    batch_size,
+    transaction_id=None,
+    version_number_column=None,
+):
+    """
+    Return a dictionary mapping given identities to (transaction id, version
+    number) pairs of their latest rows in given version table. Identities
+    without version rows are left out. Rows are looked up with one SELECT per
+    `batch_size` identities.
+
+    :param connection: SQLAlchemy Connection object
+    :param table: version table
+    :param tx_column: transaction column of the version table
+    :param pk_columns: primary key columns without the transaction column
+    :param identities: list of primary key value tuples
+    :param batch_size: maximum number of identities per SELECT
+    :param transaction_id:
+        If given only transactions preceding this transaction are considered
+    :param version_number_column:
+        Version number column of the version table. If not given the version
+        numbers are None.
+    """
+    if len(pk_columns) == 1:
+        values = [identity[0] for identity in identities]
+        pk_expr = pk_columns[0]
+    else:
+        values = identities
+        pk_expr = sa.tuple_(*pk_columns)
+
+    if version_number_column is None:
+        version_number = sa.null()
+    else:
+        version_number = sa.func.max(version_number_column)
+    stmt = (
+        sa.select(*pk_columns, sa.func.max(tx_column), version_number)
+        .select_from(table)
+        .group_by(*pk_columns)
+    )
+    if transaction_id is not None:
+        stmt = stmt.where(tx_column < transaction_id)
+
+    latest = {}
+    for index in range(0, len(values), batch_size):
+        chunk = values[index : index + batch_size]
+        for row in connection.execute(stmt.where(pk_expr.in_(chunk))):
+            latest[tuple(row[:-2])] = (row[-2], row[-1])
+    return latest
+
+
+def group_by_keys(rows):
+    """
+    Group given list of parameter dictionaries by their key sets, preserving
+    the original order within each group. Each group can be executed as a
+    single executemany statement.
+
+    :param rows: list of parameter dictionaries
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row), []).append(row)
+    return groups.values()
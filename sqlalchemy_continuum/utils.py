@@ -1,4 +1,5 @@
 from collections import defaultdict
+from datetime import datetime
 from inspect import isclass
 from itertools import chain
 
@@ -54,6 +55,14 @@ def end_tx_column_name(obj):
     return option(obj, 'end_transaction_column_name')
 
 
+def previous_tx_column_name(obj):
+    return option(obj, 'previous_transaction_column_name')
+
+
+def version_number_column_name(obj):
+    return option(obj, 'version_number_column_name')
+
+
 def end_tx_attr(obj):
     return getattr(obj.__class__, end_tx_column_name(obj))
 
@@ -94,7 +103,7 @@ def transaction_class(cls):
 def version_obj(session, parent_obj):
     manager = get_versioning_manager(parent_obj)
     uow = manager.unit_of_work(session)
-    for version_obj in uow.version_session:
+    for version_obj in uow.version_objs.values():
         if parent_class(version_obj.__class__) == parent_obj.__class__ and identity(
             version_obj
         )[:-1] == identity(parent_obj):
@@ -276,6 +285,8 @@ def is_internal_column(model, column_name):
     return column_name in (
         option(model, 'transaction_column_name'),
         option(model, 'end_transaction_column_name'),
+        option(model, 'previous_transaction_column_name'),
+        option(model, 'version_number_column_name'),
         option(model, 'operation_type_column_name'),
     )
 
@@ -314,20 +325,14 @@ def is_modified(obj):
     .. seealso:: :func:`is_modified_or_deleted`
     .. seealso:: :func:`is_session_modified`
     """
-    column_names = sa.inspect(obj.__class__).columns.keys()
-    versioned_column_keys = [prop.key for prop in versioned_column_properties(obj)]
-    versioned_relationship_keys = [
-        prop.key for prop in versioned_relationships(obj, versioned_column_keys)
-    ]
-    for key, attr in sa.inspect(obj).attrs.items():
-        if key in column_names:
-            if key not in versioned_column_keys:
-                continue
-            if attr.history.has_changes():
-                return True
-        if key in versioned_relationship_keys:
-            if attr.history.has_changes():
-                return True
+    plan = get_versioning_manager(obj).plan(obj.__class__)
+    attrs = sa.inspect(obj).attrs
+    for key in plan.versioned_keys:
+        if attrs[key].history.has_changes():
+            return True
+    for key in plan.versioned_relationship_keys:
+        if attrs[key].history.has_changes():
+            return True
     return False
 
 
@@ -336,12 +341,19 @@ def is_session_modified(session):
     Return whether or not any of the versioned objects in given session have
     been either modified or deleted.
 
+    Only the new, dirty and deleted collections of the session are inspected,
+    so the cost of this function depends on the number of changed objects
+    rather than the size of the session's identity map.
+
     :param session: SQLAlchemy session object
 
     .. seealso:: :func:`is_versioned`
     .. seealso:: :func:`versioned_objects`
     """
-    return any(is_modified_or_deleted(obj) for obj in versioned_objects(session))
+    for obj in chain(session.new, session.deleted):
+        if is_versioned(obj):
+            return True
+    return any(is_versioned(obj) and is_modified(obj) for obj in session.dirty)
 
 
 def count_versions(obj):
@@ -419,6 +431,180 @@ def changeset(obj):
     return data
 
 
+def resolve_transaction_id(session, model, moment):
+    """
+    Return the id of the last transaction issued at or before given point in
+    time or None if no transaction was issued by then. Resolutions of points
+    in time in the past are cached.
+
+    ::
+
+        from sqlalchemy_continuum import resolve_transaction_id
+
+
+        resolve_transaction_id(session, Article, datetime(2024, 3, 5, 14))
+
+
+    :param session: SQLAlchemy session object
+    :param model: SQLAlchemy declarative model class or version class
+    :param moment: datetime object
+    """
+    return get_versioning_manager(model).resolve_transaction_id(session, moment)
+
+
+def as_of_criteria(model, transaction_id):
+    """
+    Return the criteria matching the versions of given class that were
+    current at given transaction, i.e. the state of the table of given class
+    as of that transaction. Versions of deleted objects are included; filter
+    them out by their operation type if needed.
+
+    The form of the criteria depends on the versioning strategy. With the
+    'validity' strategy the criteria only compares the transaction columns of
+    each version::
+
+        article_version.transaction_id <= 5 AND (
+            article_version.end_transaction_id > 5 OR
+            article_version.end_transaction_id IS NULL
+        )
+
+    With the 'subquery' and 'append_only' strategies an anti-join on the
+    primary key of the version table checks that no later version precedes
+    given transaction::
+
+        article_version.transaction_id <= 5 AND NOT EXISTS (
+            SELECT 1
+            FROM article_version AS article_version_1
+            WHERE article_version_1.id = article_version.id
+            AND article_version_1.transaction_id > article_version.transaction_id
+            AND article_version_1.transaction_id <= 5
+        )
+
+    :param model: SQLAlchemy declarative model class or version class
+    :param transaction_id: transaction id
+    """
+    version_cls = version_class(model)
+    return _as_of_criteria(version_cls, version_cls, transaction_id)
+
+
+def _as_of_criteria(version_cls, entity, transaction_id):
+    tx_column = getattr(entity, tx_column_name(version_cls))
+
+    if option(version_cls, 'strategy') == 'validity':
+        end_tx_column = getattr(entity, end_tx_column_name(version_cls))
+        return sa.and_(
+            tx_column <= transaction_id,
+            sa.or_(end_tx_column > transaction_id, end_tx_column.is_(None)),
+        )
+
+    next_cls = sa.orm.aliased(version_cls)
+    next_tx_column = getattr(next_cls, tx_column_name(version_cls))
+    criteria = [
+        getattr(next_cls, key) == getattr(entity, key)
+        for key in get_primary_keys(version_cls).keys()
+        if key != tx_column_name(version_cls)
+    ]
+    criteria.append(next_tx_column > tx_column)
+
+    return sa.and_(
+        tx_column <= transaction_id,
+        ~sa.exists(
+            sa.select(1)
+            .where(sa.and_(next_tx_column <= transaction_id, *criteria))
+            .correlate_except(next_cls)
+        ),
+    )
+
+
+def as_of_option(model, transaction_id, session=None):
+    """
+    Return a query option which limits the versions of given class loaded by
+    a query, including versions joined to it, to those that were current at
+    given transaction.
+
+    Given a datetime instead of a transaction id the versions current as of
+    the last transaction issued at or before that point in time are loaded.
+    The point in time is resolved with :func:`resolve_transaction_id`, which
+    needs the session the query is executed with.
+
+    ::
+
+        from sqlalchemy_continuum import as_of_option, version_class
+
+
+        ArticleVersion = version_class(Article)
+        TagVersion = version_class(Tag)
+
+        query = (
+            sa.select(ArticleVersion, TagVersion)
+            .join(TagVersion, TagVersion.article_id == ArticleVersion.id)
+            .options(as_of_option(Article, 5), as_of_option(Tag, 5))
+        )
+
+        query = sa.select(ArticleVersion).options(
+            as_of_option(Article, datetime(2024, 3, 5), session=session)
+        )
+
+    :param model: SQLAlchemy declarative model class or version class
+    :param transaction_id: transaction id or datetime object
+    :param session: SQLAlchemy session, required for datetime objects
+    """
+    version_cls = version_class(model)
+    if isinstance(transaction_id, datetime):
+        if session is None:
+            raise ValueError('A session is required for resolving datetimes')
+        # Transaction ids start from 1, so nothing is current at 0.
+        transaction_id = resolve_transaction_id(session, model, transaction_id) or 0
+    return sa.orm.with_loader_criteria(
+        version_cls,
+        lambda cls: _as_of_criteria(version_cls, cls, transaction_id),
+        include_aliases=True,
+    )
+
+
+def as_of(session, model, transaction_id, yield_per=1000):
+    """
+    Return a query of the versions of given class that represent the state of
+    its table as of given transaction. Versions of objects that were deleted
+    at that point are left out. Results are fetched `yield_per` rows at a time
+    so that whole tables can be iterated over.
+
+    Given a datetime instead of a transaction id the state as of the last
+    transaction issued at or before that point in time is returned, see
+    :func:`resolve_transaction_id`.
+
+    ::
+
+        from sqlalchemy_continuum import as_of
+
+
+        for article_version in as_of(session, Article, 5).filter_by(
+            author_id=3
+        ):
+            print(article_version.name)
+
+
+    :param session: SQLAlchemy session object
+    :param model: SQLAlchemy declarative model class or version class
+    :param transaction_id: transaction id or datetime object
+    :param yield_per: how many rows to fetch at a time
+    """
+    from .operation import Operation
+
+    version_cls = version_class(model)
+    if isinstance(transaction_id, datetime):
+        # Transaction ids start from 1, so nothing is current at 0.
+        transaction_id = resolve_transaction_id(session, model, transaction_id) or 0
+    return (
+        session.query(version_cls)
+        .filter(
+            as_of_criteria(version_cls, transaction_id),
+            version_cls.operation_type != Operation.DELETE,
+        )
+        .yield_per(yield_per)
+    )
+
+
 class VersioningClauseAdapter(sa.sql.visitors.ReplacingCloningVisitor):
     def replace(self, col):
         if isinstance(col, sa.Column):
@@ -1,10 +1,38 @@
 import sqlalchemy as sa
+from sqlalchemy.util import greenlet_spawn
 
 from .reverter import Reverter
 from .utils import get_versioning_manager, is_internal_column, parent_class
 
 
+class AwaitableAttrs:
+    """
+    Wraps a version object so that any of its attributes can be awaited.
+    Attribute access that needs to query the database is run in a greenlet,
+    which lets the history properties of version objects be used with
+    AsyncSession.
+    """
+
+    __slots__ = ('_version',)
+
+    def __init__(self, version):
+        self._version = version
+
+    def __getattr__(self, name):
+        return greenlet_spawn(getattr, self._version, name)
+
+
 class VersionClassBase:
+    @property
+    def awaitable_attrs(self):
+        """
+        Return an accessor for awaiting attributes of this version that would
+        otherwise emit implicit IO, for example::
+
+            previous = await version.awaitable_attrs.previous
+        """
+        return AwaitableAttrs(self)
+
     @property
     def previous(self):
         """
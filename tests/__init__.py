@@ -68,6 +68,16 @@ class TestCase:
     transaction_cls = TransactionFactory()
     user_cls = None
     should_create_models = True
+    bulk_insert = False
+    transaction_id_block_size = None
+    streaming = False
+    deferred_versions = False
+    outbox = False
+    audit_bind = None
+    read_router = None
+    version_chain = False
+    index_policy = None
+    partition_size = None
 
     @property
     def options(self):
@@ -78,6 +88,16 @@ class TestCase:
             'strategy': self.versioning_strategy,
             'transaction_column_name': self.transaction_column_name,
             'end_transaction_column_name': self.end_transaction_column_name,
+            'bulk_insert': self.bulk_insert,
+            'transaction_id_block_size': self.transaction_id_block_size,
+            'streaming': self.streaming,
+            'deferred_versions': self.deferred_versions,
+            'outbox': self.outbox,
+            'audit_bind': self.audit_bind,
+            'read_router': self.read_router,
+            'version_chain': self.version_chain,
+            'index_policy': self.index_policy,
+            'partition_size': self.partition_size,
         }
 
     def setup_method(self, method):
@@ -126,6 +146,7 @@ class TestCase:
         self.session.rollback()
         uow_leaks = versioning_manager.units_of_work
         session_map_leaks = versioning_manager.session_connection_map
+        connection_map_leaks = versioning_manager.connection_session_map
 
         remove_versioning()
         QueryPool.queries = []
@@ -147,6 +168,7 @@ class TestCase:
 
         assert not uow_leaks
         assert not session_map_leaks
+        assert not connection_map_leaks
 
     def create_models(self):
         class Article(self.Model):
@@ -206,6 +228,7 @@ setting_variants = {
     'versioning_strategy': [
         'subquery',
         'validity',
+        'append_only',
     ],
     'transaction_column_name': ['transaction_id', 'tx_id'],
     'end_transaction_column_name': ['end_transaction_id', 'end_tx_id'],
@@ -4,6 +4,7 @@ from datetime import datetime
 import sqlalchemy as sa
 
 from sqlalchemy_continuum import version_class
+from sqlalchemy_continuum.table_builder import VersionIndexPolicy
 from tests import TestCase
 
 
@@ -97,3 +98,82 @@ class TestTableBuilderInOtherSchema(TestCase):
         table = version_class(self.Article).__table__
         assert table.schema is not None
         assert table.schema == self.Article.__table__.schema
+
+
+def index_columns(table):
+    return {index.name: [c.name for c in index.columns] for index in table.indexes}
+
+
+class TestDefaultIndexPolicy(TestCase):
+    versioning_strategy = 'validity'
+
+    def test_indexes_internal_columns_separately(self):
+        indexes = index_columns(version_class(self.Article).__table__)
+        assert indexes['ix_article_version_transaction_id'] == ['transaction_id']
+        assert indexes['ix_article_version_end_transaction_id'] == [
+            'end_transaction_id'
+        ]
+        assert 'ix_article_version_current' not in indexes
+
+
+class TestTemporalIndexPolicy(TestCase):
+    versioning_strategy = 'validity'
+    version_chain = True
+    index_policy = VersionIndexPolicy(
+        copy_parent_indexes=False,
+        temporal_indexes=True,
+        current_version_index=True,
+        brin_transaction_index=True,
+    )
+
+    def create_models(self):
+        class Article(self.Model):
+            __tablename__ = 'article'
+            __versioned__ = {}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255), index=True)
+
+        self.Article = Article
+
+    def test_does_not_copy_parent_indexes(self):
+        assert self.Article.__table__.c.name.index
+        table = version_class(self.Article).__table__
+        assert not table.c.name.index
+        assert 'ix_article_version_name' not in index_columns(table)
+
+    def test_composite_temporal_indexes(self):
+        indexes = index_columns(version_class(self.Article).__table__)
+        assert indexes['ix_article_version_end_transaction_id'] == [
+            'id',
+            'end_transaction_id',
+        ]
+        assert indexes['ix_article_version_previous_transaction_id'] == [
+            'id',
+            'previous_transaction_id',
+        ]
+
+    def test_partial_current_version_index(self):
+        table = version_class(self.Article).__table__
+        index = next(i for i in table.indexes if i.name == 'ix_article_version_current')
+        assert [c.name for c in index.columns] == ['id']
+        assert str(index.dialect_options['postgresql']['where']) == (
+            'article_version.end_transaction_id IS NULL'
+        )
+
+    def test_brin_transaction_index(self):
+        table = version_class(self.Article).__table__
+        index = next(
+            i for i in table.indexes if i.name == 'ix_article_version_transaction_id'
+        )
+        assert index.dialect_options['postgresql']['using'] == 'brin'
+
+    def test_versions_are_written_and_read(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+        first, second = article.versions.all()
+        assert first.end_transaction_id == second.transaction_id
+        assert second.previous == first
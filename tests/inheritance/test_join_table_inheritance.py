@@ -107,7 +107,7 @@ class JoinTableInheritanceTestCase(TestCase):
 
     @pytest.mark.skipif('uses_native_versioning()')
     def test_updates_end_transaction_id_to_all_tables(self):
-        if self.options['strategy'] == 'subquery':
+        if self.options['strategy'] != 'validity':
             pytest.skip()
 
         end_tx_column = self.options['end_transaction_column_name']
@@ -36,6 +36,28 @@ class ActivityTestCase(TestCase):
         return activity
 
 
+class TestActivitySessionModified(ActivityTestCase):
+    def test_new_activity_modifies_session(self):
+        article = self.create_article()
+        self.session.flush()
+        self.create_activity(article)
+        plugin = versioning_manager.plugins[0]
+        assert plugin.is_session_modified(self.session)
+
+    def test_persisted_activity_does_not_modify_session(self):
+        article = self.create_article()
+        self.session.flush()
+        activity = self.create_activity(article)
+        self.session.commit()
+        transaction_id = activity.transaction_id
+        plugin = versioning_manager.plugins[0]
+        assert not plugin.is_session_modified(self.session)
+
+        article.name = 'Updated article'
+        self.session.commit()
+        assert activity.transaction_id == transaction_id
+
+
 class TestActivityNotId(ActivityTestCase):
     def create_models(self):
         TestCase.create_models(self)
@@ -0,0 +1,155 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import load_version_relationships
+from tests import QueryPool, TestCase, create_test_cases
+
+
+class LoadVersionRelationshipsTestCase(TestCase):
+    def create_models(self):
+        class Article(self.Model):
+            __tablename__ = 'article'
+            __versioned__ = {'base_classes': (self.Model,)}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+
+        article_category = sa.Table(
+            'article_category',
+            self.Model.metadata,
+            sa.Column(
+                'article_id', sa.Integer, sa.ForeignKey('article.id'), primary_key=True
+            ),
+            sa.Column(
+                'category_id',
+                sa.Integer,
+                sa.ForeignKey('category.id'),
+                primary_key=True,
+            ),
+        )
+
+        class Category(self.Model):
+            __tablename__ = 'category'
+            __versioned__ = {'base_classes': (self.Model,)}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+            articles = sa.orm.relationship(
+                Article, secondary=article_category, backref='categories'
+            )
+
+        class Tag(self.Model):
+            __tablename__ = 'tag'
+            __versioned__ = {'base_classes': (self.Model,)}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+            article_id = sa.Column(sa.Integer, sa.ForeignKey(Article.id))
+            article = sa.orm.relationship(Article, backref='tags')
+
+        self.Article = Article
+        self.Category = Category
+        self.Tag = Tag
+
+    def create_history(self):
+        category = self.Category(name='Category')
+        articles = []
+        for i in range(3):
+            article = self.Article(name=f'Article {i}')
+            article.tags = [self.Tag(name=f'Tag {i}.{j}') for j in range(i)]
+            article.categories.append(category)
+            articles.append(article)
+        self.session.add_all(articles)
+        self.session.commit()
+        for article in articles:
+            article.name += ' updated'
+            for tag in article.tags:
+                tag.name += ' updated'
+        self.session.commit()
+        return articles
+
+    def versions(self):
+        ArticleVersion = self.ArticleVersion
+        return (
+            self.session.query(ArticleVersion)
+            .order_by(
+                getattr(ArticleVersion, self.transaction_column_name), ArticleVersion.id
+            )
+            .all()
+        )
+
+    def snapshot(self, versions):
+        return [
+            (
+                version.name,
+                sorted(tag.name for tag in version.tags),
+                [category.name for category in version.categories],
+            )
+            for version in versions
+        ]
+
+    def test_matches_lazy_loading(self):
+        self.create_history()
+        versions = self.versions()
+        expected = self.snapshot(versions)
+        self.session.expire_all()
+
+        versions = self.versions()
+        load_version_relationships(versions, 'tags', 'categories')
+        assert self.snapshot(versions) == expected
+
+    def test_one_query_per_relationship(self):
+        self.create_history()
+        versions = self.versions()
+        QueryPool.queries = []
+        load_version_relationships(versions, 'tags', 'categories')
+        assert len(QueryPool.queries) == 2
+        self.snapshot(versions)
+        assert len(QueryPool.queries) == 2
+
+    def test_many_to_one(self):
+        self.create_history()
+        TagVersion = self.TagVersion
+        versions = (
+            self.session.query(TagVersion)
+            .order_by(getattr(TagVersion, self.transaction_column_name), TagVersion.id)
+            .all()
+        )
+        load_version_relationships(versions, 'article')
+        assert [version.article.name for version in versions] == [
+            'Article 1',
+            'Article 2',
+            'Article 2',
+            'Article 1 updated',
+            'Article 2 updated',
+            'Article 2 updated',
+        ]
+
+    def test_expire_discards_loaded_relationships(self):
+        self.create_history()
+        versions = self.versions()
+        load_version_relationships(versions, 'tags')
+        self.session.expire(versions[-1])
+        QueryPool.queries = []
+        versions[-2].tags
+        assert not QueryPool.queries
+        assert len(versions[-1].tags) == 2
+        assert QueryPool.queries
+
+    def test_batches(self, monkeypatch):
+        from sqlalchemy_continuum import relationship_builder
+
+        monkeypatch.setattr(relationship_builder, 'batch_size', 2)
+        self.create_history()
+        versions = self.versions()
+        QueryPool.queries = []
+        load_version_relationships(versions, 'tags')
+        assert len(QueryPool.queries) == 3
+
+    def test_unknown_relationship(self):
+        self.create_history()
+        with pytest.raises(ValueError):
+            load_version_relationships(self.versions(), 'name')
+
+
+create_test_cases(LoadVersionRelationshipsTestCase)
@@ -2,7 +2,7 @@ import pytest
 import sqlalchemy as sa
 
 from sqlalchemy_continuum import versioning_manager
-from tests import TestCase, create_test_cases
+from tests import QueryPool, TestCase, create_test_cases
 
 
 class ManyToManyRelationshipsTestCase(TestCase):
@@ -204,6 +204,28 @@ class ManyToManyRelationshipsTestCase(TestCase):
         assert tag1.versions[2] in article.versions[2].tags
         assert tag2.versions[0] in article.versions[2].tags
 
+    def test_replaced_collection_uses_single_insert_per_table(self):
+        article = self.Article(name='Some article')
+        article.tags = [self.Tag(name=f'tag {i}') for i in range(5)]
+        self.session.add(article)
+        self.session.commit()
+
+        article.name = 'Updated article'
+        article.tags = [self.Tag(name=f'new tag {i}') for i in range(5)]
+        QueryPool.queries = []
+        self.session.commit()
+        inserts = [
+            query
+            for query in QueryPool.queries
+            if query.startswith('INSERT INTO') and 'article_tag_version' in query
+        ]
+        assert len(inserts) == 1
+        version = article.versions[1]
+        assert len(version.tags) == 5
+        assert sorted(tag.name for tag in version.tags) == [
+            f'new tag {i}' for i in range(5)
+        ]
+
 
 create_test_cases(ManyToManyRelationshipsTestCase)
 
@@ -0,0 +1,85 @@
+import sqlalchemy as sa
+
+from tests import QueryPool, TestCase, create_test_cases
+
+
+class MemoizedRelationshipsTestCase(TestCase):
+    def create_history(self):
+        article = self.Article(name='Article')
+        article.tags = [self.Tag(name='Tag 1'), self.Tag(name='Tag 2')]
+        self.session.add(article)
+        self.session.commit()
+        return article
+
+    def test_repeated_access_queries_once(self):
+        version = self.create_history().versions[0]
+        QueryPool.queries = []
+        assert len(version.tags) == 2
+        assert version.tags is version.tags
+        assert version.tags[0].article is version
+        assert len(QueryPool.queries) == 2
+
+    def test_expire_discards_memoized_results(self):
+        version = self.create_history().versions[0]
+        version.tags
+        self.session.expire(version)
+        QueryPool.queries = []
+        assert len(version.tags) == 2
+        assert QueryPool.queries
+
+    def test_refresh_discards_memoized_results(self):
+        version = self.create_history().versions[0]
+        version.tags
+        self.session.refresh(version)
+        QueryPool.queries = []
+        assert len(version.tags) == 2
+        assert any('tag_version' in query for query in QueryPool.queries)
+
+    def test_not_memoized_with_uncommitted_versions(self):
+        article = self.create_history()
+        article.name = 'Updated'
+        self.session.flush()
+        version = article.versions[1]
+        assert len(version.tags) == 2
+        article.tags.append(self.Tag(name='Tag 3'))
+        self.session.flush()
+        assert len(version.tags) == 3
+        self.session.commit()
+        assert len(article.versions[1].tags) == 3
+
+
+create_test_cases(MemoizedRelationshipsTestCase)
+
+
+class TestMemoizedDynamicRelationships(TestCase):
+    def create_models(self):
+        class Article(self.Model):
+            __tablename__ = 'article'
+            __versioned__ = {}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+
+        class Tag(self.Model):
+            __tablename__ = 'tag'
+            __versioned__ = {}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+            article_id = sa.Column(sa.Integer, sa.ForeignKey(Article.id))
+            article = sa.orm.relationship(
+                Article, backref=sa.orm.backref('tags', lazy='dynamic')
+            )
+
+        self.Article = Article
+        self.Tag = Tag
+
+    def test_dynamic_relationships_return_queries(self):
+        article = self.Article(name='Article')
+        article.tags.append(self.Tag(name='Tag'))
+        self.session.add(article)
+        self.session.commit()
+        version = article.versions[0]
+        assert version.tags.count() == 1
+        assert version.tags is not version.tags
+        assert version.tags.all()[0].name == 'Tag'
@@ -0,0 +1,41 @@
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import version_class
+from sqlalchemy_continuum.schema import update_version_chain_columns
+from tests import TestCase
+
+
+class TestUpdateVersionChainColumns(TestCase):
+    version_chain = True
+
+    def _insert(self, values):
+        table = version_class(self.Article).__table__
+        stmt = table.insert().values(values)
+        self.session.execute(stmt)
+
+    def test_update_version_chain_columns(self):
+        table = version_class(self.Article).__table__
+        for article_id, transaction_id in [(1, 1), (1, 2), (2, 3), (1, 4), (2, 5)]:
+            self._insert(
+                {
+                    'id': article_id,
+                    'transaction_id': transaction_id,
+                    'name': f'Article {article_id}',
+                    'operation_type': 1,
+                }
+            )
+
+        update_version_chain_columns(table, conn=self.session, chunk_size=2)
+        rows = self.session.execute(
+            sa.text(
+                'SELECT transaction_id, previous_transaction_id, version_number '
+                'FROM article_version ORDER BY transaction_id'
+            )
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [
+            (1, None, 1),
+            (2, 1, 2),
+            (3, None, 1),
+            (4, 2, 3),
+            (5, 3, 2),
+        ]
@@ -0,0 +1,105 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from sqlalchemy_continuum import version_class
+from sqlalchemy_continuum.schema import (
+    create_version_partitions,
+    detach_version_partitions,
+    version_partitions,
+)
+from tests import QueryPool, TestCase
+
+
+class TestVersionPartitions(TestCase):
+    partition_size = 100
+
+    def _insert(self, transaction_id):
+        table = version_class(self.Article).__table__
+        self.session.execute(
+            table.insert().values(
+                id=1, transaction_id=transaction_id, name='Article', operation_type=1
+            )
+        )
+
+    def test_partitions_by_transaction_column_on_postgresql(self):
+        table = version_class(self.Article).__table__
+        ddl = str(sa.schema.CreateTable(table).compile(dialect=postgresql.dialect()))
+        assert 'PARTITION BY RANGE (transaction_id)' in ddl
+
+    def test_all_version_tables_are_partitioned(self):
+        tables = [
+            version_class(self.Article).__table__,
+            version_class(self.Tag).__table__,
+        ]
+        for table in tables:
+            assert table.dialect_options['postgresql']['partition_by'] == (
+                'RANGE (transaction_id)'
+            )
+
+    def test_versions_are_written_and_read(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+        first, second = article.versions.all()
+        assert first.next == second
+        assert second.previous == first
+
+    def test_other_dialects_use_plain_tables(self):
+        if self.driver == 'postgres':
+            pytest.skip('plain table fallback')
+        table = version_class(self.Article).__table__
+        assert create_version_partitions(table, 100, conn=self.session) == []
+        assert version_partitions(table, conn=self.session) == []
+        assert detach_version_partitions(table, 1000, conn=self.session) == []
+
+    def test_other_dialects_skip_partition_creation(self):
+        if self.driver == 'postgres':
+            pytest.skip('plain table fallback')
+        table = version_class(self.Article).__table__
+        connection = self.session.connection()
+        table.drop(connection)
+        QueryPool.queries = []
+        table.create(connection)
+        assert QueryPool.queries
+        assert all(query.strip().startswith('CREATE') for query in QueryPool.queries)
+
+    def test_creates_initial_partitions(self):
+        if self.driver != 'postgres':
+            pytest.skip('partitioning requires PostgreSQL')
+        table = version_class(self.Article).__table__
+        partitions = version_partitions(table, conn=self.session)
+        assert partitions[0] == ('article_version_p0', 0, 100)
+        assert len(partitions) == 5
+
+    def test_creates_partitions_ahead(self):
+        if self.driver != 'postgres':
+            pytest.skip('partitioning requires PostgreSQL')
+        table = version_class(self.Article).__table__
+        names = create_version_partitions(
+            table, 100, count=2, transaction_id=750, conn=self.session
+        )
+        assert names == [
+            'article_version_p700',
+            'article_version_p800',
+            'article_version_p900',
+        ]
+        self._insert(950)
+        # Existing partitions are left untouched.
+        create_version_partitions(
+            table, 100, count=2, transaction_id=750, conn=self.session
+        )
+        assert len(version_partitions(table, conn=self.session)) == 8
+
+    def test_detaches_old_partitions(self):
+        if self.driver != 'postgres':
+            pytest.skip('partitioning requires PostgreSQL')
+        table = version_class(self.Article).__table__
+        self._insert(50)
+        self._insert(150)
+        names = detach_version_partitions(table, 150, drop=True, conn=self.session)
+        assert names == ['article_version_p0']
+        rows = self.session.execute(sa.select(table.c.transaction_id)).fetchall()
+        assert [row[0] for row in rows] == [150]
@@ -0,0 +1,191 @@
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import version_class, versioning_manager
+from sqlalchemy_continuum.outbox import OutboxWorker
+from tests import QueryPool, TestCase
+
+
+class TestAppendOnlyStrategy(TestCase):
+    versioning_strategy = 'append_only'
+
+    def test_schema_contains_previous_transaction_id(self):
+        table = version_class(self.Article).__table__
+        assert 'previous_transaction_id' in table.c
+        assert table.c.previous_transaction_id.nullable
+        assert not table.c.previous_transaction_id.primary_key
+        assert 'end_transaction_id' not in table.c
+
+    def test_previous_transaction_id_none_for_first_version(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        assert article.versions[0].previous_transaction_id is None
+        assert article.versions[0].end_transaction_id is None
+
+    def test_previous_transaction_id_points_at_previous_version(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+
+        first, second = article.versions.all()
+        assert second.previous_transaction_id == first.transaction_id
+        assert first.end_transaction_id == second.transaction_id
+        assert second.end_transaction_id is None
+        assert second.previous == first
+        assert first.next == second
+        assert second.index == 1
+
+    def test_never_updates_version_rows(self):
+        articles = [self.Article(name=f'Article {i}') for i in range(10)]
+        self.session.add_all(articles)
+        self.session.commit()
+
+        for article in articles:
+            article.name += ' updated'
+        QueryPool.queries = []
+        self.session.commit()
+        assert not [
+            query
+            for query in QueryPool.queries
+            if query.startswith('UPDATE article_version')
+        ]
+        lookups = [
+            query
+            for query in QueryPool.queries
+            if query.startswith('SELECT article_version')
+        ]
+        assert len(lookups) == 1
+        for article in articles:
+            first, second = article.versions.all()
+            assert second.previous_transaction_id == first.transaction_id
+
+    def test_multiple_flushes_in_one_transaction(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated'
+        self.session.flush()
+        article.name = 'Updated again'
+        self.session.commit()
+
+        first, second = article.versions.all()
+        assert second.name == 'Updated again'
+        assert second.previous_transaction_id == first.transaction_id
+
+    def test_end_transaction_id_in_queries(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+
+        current = (
+            self.session.query(self.ArticleVersion)
+            .filter(self.ArticleVersion.end_transaction_id.is_(None))
+            .all()
+        )
+        assert [version.name for version in current] == ['Some other thing']
+
+    def test_changeset_excludes_previous_transaction_id(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+        assert article.versions[1].changeset == {
+            'name': ['Something', 'Some other thing']
+        }
+
+    def test_relationships(self):
+        article = self.Article(name='Something')
+        article.tags.append(self.Tag(name='Some tag'))
+        self.session.add(article)
+        self.session.commit()
+        article.tags[0].name = 'Updated tag'
+        self.session.commit()
+        article.name = 'Updated article'
+        self.session.commit()
+
+        first, second = article.versions.all()
+        assert [tag.name for tag in first.tags] == ['Some tag']
+        assert [tag.name for tag in second.tags] == ['Updated tag']
+        assert first.tags[0].article == first
+
+
+class TestAppendOnlyStrategyWithBulkInsert(TestAppendOnlyStrategy):
+    bulk_insert = True
+
+
+class TestAppendOnlyStrategyWithOutbox(TestCase):
+    versioning_strategy = 'append_only'
+    outbox = True
+
+    def test_worker_assigns_previous_transaction_ids(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        worker = OutboxWorker(versioning_manager, self.engine)
+        worker.drain()
+        for i in range(3):
+            article.name = f'Update {i}'
+            self.session.commit()
+        worker.drain()
+
+        versions = article.versions.all()
+        assert versions[0].previous_transaction_id is None
+        for previous, version in zip(versions, versions[1:]):
+            assert version.previous_transaction_id == previous.transaction_id
+
+
+class TestJoinTableInheritanceWithAppendOnlyVersioning(TestCase):
+    def create_models(self):
+        class TextItem(self.Model):
+            __tablename__ = 'text_item'
+            __versioned__ = {
+                'base_classes': (self.Model,),
+                'strategy': 'append_only',
+            }
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+
+            discriminator = sa.Column(sa.Unicode(100))
+
+            __mapper_args__ = {
+                'polymorphic_on': discriminator,
+            }
+
+        class Article(TextItem):
+            __tablename__ = 'article'
+            __mapper_args__ = {'polymorphic_identity': 'article'}
+            id = sa.Column(
+                sa.Integer,
+                sa.ForeignKey(TextItem.id),
+                autoincrement=True,
+                primary_key=True,
+            )
+
+        self.TextItem = TextItem
+        self.Article = Article
+
+    def test_previous_transaction_id_is_written_to_all_tables(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+
+        for table_name in ('text_item_version', 'article_version'):
+            rows = self.session.execute(
+                sa.text(
+                    'SELECT transaction_id, previous_transaction_id '
+                    f'FROM {table_name} ORDER BY transaction_id'
+                )
+            ).all()
+            assert rows[0][1] is None
+            assert rows[1][1] == rows[0][0]
+
+        first, second = article.versions.all()
+        assert second.previous == first
+        assert first.end_transaction_id == second.transaction_id
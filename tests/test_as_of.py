@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import as_of, as_of_option, versioning_manager
+from tests import TestCase, create_test_cases
+
+
+class AsOfTestCase(TestCase):
+    def create_history(self):
+        first = self.Article(name='First')
+        second = self.Article(name='Second')
+        first.tags.append(self.Tag(name='Tag'))
+        self.session.add_all([first, second])
+        self.session.commit()
+        self.tx1 = first.versions[0].transaction.id
+
+        first.name = 'First updated'
+        first.tags[0].name = 'Tag updated'
+        self.session.commit()
+        self.tx2 = first.versions[1].transaction.id
+
+        self.session.delete(second)
+        third = self.Article(name='Third')
+        self.session.add(third)
+        self.session.commit()
+        self.tx3 = third.versions[0].transaction.id
+
+    def names(self, versions):
+        return sorted(version.name for version in versions)
+
+    def test_state_as_of_transaction(self):
+        self.create_history()
+        assert self.names(as_of(self.session, self.Article, self.tx1)) == [
+            'First',
+            'Second',
+        ]
+        assert self.names(as_of(self.session, self.Article, self.tx2)) == [
+            'First updated',
+            'Second',
+        ]
+        assert self.names(as_of(self.session, self.Article, self.tx3)) == [
+            'First updated',
+            'Third',
+        ]
+
+    def test_accepts_version_class(self):
+        self.create_history()
+        assert self.names(as_of(self.session, self.ArticleVersion, self.tx1)) == [
+            'First',
+            'Second',
+        ]
+
+    def test_before_first_transaction(self):
+        self.create_history()
+        assert as_of(self.session, self.Article, self.tx1 - 1).all() == []
+
+    def test_filters(self):
+        self.create_history()
+        query = as_of(self.session, self.Article, self.tx2).filter(
+            self.ArticleVersion.name.like('First%')
+        )
+        assert self.names(query) == ['First updated']
+
+    def test_query_option_with_joins(self):
+        self.create_history()
+        TagVersion = sa.orm.aliased(versioning_manager.version_class_map[self.Tag])
+
+        def query(transaction_id):
+            return self.session.execute(
+                sa.select(self.ArticleVersion.name, TagVersion.name)
+                .join(TagVersion, TagVersion.article_id == self.ArticleVersion.id)
+                .options(
+                    as_of_option(self.Article, transaction_id),
+                    as_of_option(self.Tag, transaction_id),
+                )
+            ).all()
+
+        assert query(self.tx1) == [('First', 'Tag')]
+        assert query(self.tx2) == [('First updated', 'Tag updated')]
+
+    def test_query_option_with_datetimes(self):
+        self.create_history()
+        Transaction = versioning_manager.transaction_cls
+        for transaction_id, hour in [(self.tx1, 12), (self.tx2, 14), (self.tx3, 16)]:
+            self.session.execute(
+                sa.update(Transaction)
+                .where(Transaction.id == transaction_id)
+                .values(issued_at=datetime(2024, 3, 5, hour))
+            )
+        self.session.commit()
+
+        def names(moment):
+            return sorted(
+                self.session.scalars(
+                    sa.select(self.ArticleVersion.name).options(
+                        as_of_option(self.Article, moment, session=self.session)
+                    )
+                )
+            )
+
+        assert names(datetime(2024, 3, 5, 11)) == []
+        assert names(datetime(2024, 3, 5, 13)) == ['First', 'Second']
+        assert names(datetime(2024, 3, 5, 15)) == ['First updated', 'Second']
+
+    def test_query_option_requires_session_for_datetimes(self):
+        with pytest.raises(ValueError):
+            as_of_option(self.Article, datetime(2024, 3, 5))
+
+
+create_test_cases(AsOfTestCase)
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.asyncio import (
+    fetch_changeset,
+    fetch_index,
+    fetch_next,
+    fetch_previous,
+    fetch_versions,
+    load_versions,
+)
+from tests import QueryPool, TestCase
+
+pytest.importorskip('aiosqlite')
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+
+class AsyncTestCase(TestCase):
+    def setup_method(self, method):
+        # Skip before the base setup creates any schema; teardown is not run
+        # for skipped tests.
+        if os.environ.get('DB', 'sqlite') != 'sqlite':
+            pytest.skip('asyncio tests run against aiosqlite')
+        TestCase.setup_method(self, method)
+
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.async_engine = create_async_engine(f'sqlite+aiosqlite:///{self.path}')
+        self.run(self.create_tables())
+
+    def teardown_method(self, method):
+        if hasattr(self, 'async_engine'):
+            self.run(self.async_engine.dispose())
+            os.remove(self.path)
+        TestCase.teardown_method(self, method)
+
+    def run(self, coroutine):
+        return asyncio.run(coroutine)
+
+    async def create_tables(self):
+        async with self.async_engine.begin() as conn:
+            await conn.run_sync(self.Model.metadata.create_all)
+
+    def async_session(self):
+        return AsyncSession(self.async_engine, expire_on_commit=False)
+
+    async def create_article(self, session, name='Article'):
+        article = self.Article(name=name, content='Content')
+        session.add(article)
+        await session.commit()
+        return article
+
+
+class TestAsyncVersioning(AsyncTestCase):
+    def test_versions_are_written_on_commit(self):
+        async def scenario():
+            async with self.async_session() as session:
+                article = await self.create_article(session)
+                article.name = 'Updated article'
+                await session.commit()
+
+                versions = await fetch_versions(article)
+                return [version.name for version in versions]
+
+        assert self.run(scenario()) == ['Article', 'Updated article']
+
+    def test_end_transaction_id_of_previous_version(self):
+        if versioning_manager.options['strategy'] != 'validity':
+            pytest.skip('end_transaction_id is only set by validity strategy')
+
+        async def scenario():
+            async with self.async_session() as session:
+                article = await self.create_article(session)
+                article.name = 'Updated article'
+                await session.commit()
+                first, second = await fetch_versions(article)
+                return first.end_transaction_id, second.transaction_id
+
+        end_transaction_id, transaction_id = self.run(scenario())
+        assert end_transaction_id == transaction_id
+
+    def test_registry_does_not_leak(self):
+        async def scenario():
+            async with self.async_session() as session:
+                await self.create_article(session)
+
+        self.run(scenario())
+        assert not versioning_manager.units_of_work
+        assert not versioning_manager.session_connection_map
+
+    def test_concurrent_tasks(self):
+        async def write(name):
+            async with self.async_session() as session:
+                article = await self.create_article(session, name)
+                for i in range(3):
+                    article.name = f'{name} {i}'
+                    await asyncio.sleep(0)
+                    await session.commit()
+                return len(await fetch_versions(article))
+
+        async def scenario():
+            return await asyncio.gather(*(write(f'Task {i}') for i in range(5)))
+
+        assert self.run(scenario()) == [4] * 5
+
+
+class TestAsyncVersioningWithValidityStrategy(TestAsyncVersioning):
+    versioning_strategy = 'validity'
+
+
+class TestAsyncHistoryAccessors(AsyncTestCase):
+    def test_awaitable_attrs(self):
+        async def scenario():
+            async with self.async_session() as session:
+                article = await self.create_article(session)
+                article.name = 'Updated article'
+                await session.commit()
+                first, second = await fetch_versions(article)
+                return (
+                    await second.awaitable_attrs.previous is first,
+                    await first.awaitable_attrs.next is second,
+                    await second.awaitable_attrs.index,
+                )
+
+        assert self.run(scenario()) == (True, True, 1)
+
+    def test_fetch_helpers(self):
+        async def scenario():
+            async with self.async_session() as session:
+                article = await self.create_article(session)
+                article.name = 'Updated article'
+                await session.commit()
+                first, second = await fetch_versions(article)
+                return (
+                    await fetch_previous(first),
+                    await fetch_next(second),
+                    await fetch_index(first),
+                    await fetch_changeset(second),
+                )
+
+        previous, next_, index, changeset = self.run(scenario())
+        assert previous is None
+        assert next_ is None
+        assert index == 0
+        assert changeset == {'name': ['Article', 'Updated article']}
+
+    def test_history_property_raises_without_await(self):
+        async def scenario():
+            async with self.async_session() as session:
+                await self.create_article(session)
+                version = (await session.scalars(sa.select(self.ArticleVersion))).one()
+                version.previous
+
+        with pytest.raises(sa.exc.MissingGreenlet):
+            self.run(scenario())
+
+
+class TestLoadVersions(AsyncTestCase):
+    def test_loads_versions_with_single_query(self):
+        async def scenario():
+            async with self.async_session() as session:
+                articles = [self.Article(name=f'Article {i}') for i in range(10)]
+                session.add_all(articles)
+                await session.commit()
+                for article in articles[:5]:
+                    article.name += ' updated'
+                await session.commit()
+
+                QueryPool.queries = []
+                versions = await load_versions(session, articles)
+                return versions, len(QueryPool.queries)
+
+        versions, query_count = self.run(scenario())
+        assert query_count == 1
+        assert [len(article_versions) for article_versions in versions] == (
+            [2] * 5 + [1] * 5
+        )
+        assert versions[0][1].name == 'Article 0 updated'
+
+    def test_objects_without_versions(self):
+        async def scenario():
+            async with self.async_session() as session:
+                return await load_versions(session, [])
+
+        assert self.run(scenario()) == []
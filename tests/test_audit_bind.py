@@ -0,0 +1,113 @@
+import os
+import tempfile
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from tests import TestCase, create_test_cases
+
+
+class AuditBindTestCase(TestCase):
+    def setup_method(self, method):
+        # Skipped before the schema is created, teardown_method is not run
+        # for skipped tests.
+        if os.environ.get('DB', 'sqlite') != 'sqlite':
+            pytest.skip('audit bind tests use SQLite files')
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.audit_engine = self.audit_bind = sa.create_engine(f'sqlite:///{self.path}')
+        TestCase.setup_method(self, method)
+
+        # Move the audit tables from the business database to the audit
+        # database.
+        tables = versioning_manager.audit_tables()
+        self.Model.metadata.drop_all(self.engine, tables=tables)
+        self.Model.metadata.create_all(self.audit_engine, tables=tables)
+
+    def teardown_method(self, method):
+        TestCase.teardown_method(self, method)
+        self.audit_engine.dispose()
+        os.remove(self.path)
+
+    def audit_count(self, table):
+        with self.audit_engine.connect() as connection:
+            return connection.execute(
+                sa.select(sa.func.count()).select_from(table)
+            ).scalar()
+
+    def test_audit_tables(self):
+        tables = {table.name for table in versioning_manager.audit_tables()}
+        assert {
+            'article_version',
+            'tag_version',
+            'transaction',
+            'transaction_changes',
+            'transaction_meta',
+        } <= tables
+        assert 'article' not in tables
+
+    def test_versions_are_written_to_audit_bind(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+
+        assert self.audit_count(self.ArticleVersion.__table__) == 1
+        assert self.audit_count(versioning_manager.transaction_cls.__table__) == 1
+        assert not sa.inspect(self.engine).has_table('article_version')
+
+    def test_plugin_rows_are_written_to_audit_bind(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.commit()
+        changes_table = self.TransactionChanges.__table__
+        assert self.audit_count(changes_table) == 1
+
+    def test_history_is_read_from_audit_bind(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated article'
+        self.session.commit()
+
+        first, second = article.versions.all()
+        assert second.previous == first
+        assert first.next == second
+        assert second.index == 1
+        assert second.changeset == {'name': ['Some article', 'Updated article']}
+        assert second.transaction.id == getattr(second, self.transaction_column_name)
+
+    def test_relationships_are_read_from_audit_bind(self):
+        article = self.Article(name='Some article')
+        article.tags.append(self.Tag(name='Some tag'))
+        self.session.add(article)
+        self.session.commit()
+
+        version = article.versions[0]
+        assert [tag.name for tag in version.tags] == ['Some tag']
+        assert version.tags[0].article == version
+
+    def test_rollback_discards_audit_rows(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        self.session.rollback()
+        assert self.audit_count(self.ArticleVersion.__table__) == 0
+
+    @property
+    def TransactionChanges(self):
+        return self.plugins[0].model_class
+
+
+create_test_cases(AuditBindTestCase)
+
+
+class TestAuditBindWithPreallocatedTransactionIds(TestCase):
+    transaction_id_block_size = 10
+    setup_method = AuditBindTestCase.setup_method
+    teardown_method = AuditBindTestCase.teardown_method
+
+    def test_inserts_transactions_without_postgresql_audit_bind(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        assert versioning_manager.transaction_id_allocator.blocks == {}
+        assert article.versions[0].transaction.id == 1
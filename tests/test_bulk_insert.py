@@ -0,0 +1,108 @@
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.plugins import PropertyModTrackerPlugin
+from tests import QueryPool, TestCase, create_test_cases
+
+
+class BulkInsertTestCase(TestCase):
+    bulk_insert = True
+
+    def test_insert_creates_versions(self):
+        articles = [self.Article(name=f'Article {i}') for i in range(5)]
+        self.session.add_all(articles)
+        self.session.commit()
+        for article in articles:
+            assert article.versions.count() == 1
+            assert article.versions[0].name == article.name
+            assert article.versions[0].operation_type == 0
+
+    def test_uses_single_insert_per_version_table(self):
+        self.session.add_all([self.Article(name=f'Article {i}') for i in range(5)])
+        QueryPool.queries = []
+        self.session.flush()
+        inserts = [
+            query
+            for query in QueryPool.queries
+            if query.startswith('INSERT INTO article_version')
+        ]
+        assert len(inserts) == 1
+
+    def test_version_objects_are_not_added_to_version_session(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        uow = versioning_manager.unit_of_work(self.session)
+        assert uow.version_objs
+        for version_obj in uow.version_objs.values():
+            assert version_obj not in uow.version_session
+
+    def test_multiple_flushes_update_written_version(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.flush()
+        article.name = 'Updated name'
+        self.session.flush()
+        self.session.commit()
+        assert article.versions.count() == 1
+        assert article.versions[0].name == 'Updated name'
+
+    def test_update_and_delete(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated name'
+        self.session.commit()
+        self.session.delete(article)
+        self.session.commit()
+        versions = (
+            self.session.query(self.ArticleVersion)
+            .order_by(getattr(self.ArticleVersion, self.transaction_column_name))
+            .all()
+        )
+        assert [v.operation_type for v in versions] == [0, 1, 2]
+        assert versions[1].name == 'Updated name'
+        assert versions[0].next == versions[1]
+        assert versions[1].previous == versions[0]
+
+
+create_test_cases(BulkInsertTestCase)
+
+
+class TestBulkInsertWithPropertyModTracker(TestCase):
+    bulk_insert = True
+    plugins = [PropertyModTrackerPlugin()]
+
+    def test_plugin_assigned_values_are_written(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.content = 'Some content'
+        self.session.commit()
+        version = article.versions[1]
+        assert version.content_mod
+        assert not version.name_mod
+
+    def test_column_defaults_apply_to_unassigned_attributes(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.content = 'Some content'
+        self.session.flush()
+        article.name = 'Updated name'
+        self.session.commit()
+        version = article.versions[1]
+        assert version.name_mod
+        assert version.content_mod
+        assert not version.description_mod
+
+    def test_executes_core_insert(self):
+        self.session.add(self.Article(name='Some article'))
+        QueryPool.queries = []
+        self.session.commit()
+        statements = [
+            query
+            for query in QueryPool.queries
+            if query.startswith('INSERT INTO article_version')
+        ]
+        assert len(statements) == 1
+        assert self.session.query(sa.func.count(self.ArticleVersion.id)).scalar() == 1
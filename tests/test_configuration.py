@@ -112,3 +112,29 @@ class TestWithoutAnyVersionedModels(TestCase):
         article = self.Article(name='Some article')
         self.session.add(article)
         self.session.commit()
+
+
+class TestOperationTrackingListeners(TestCase):
+    def create_models(self):
+        TestCase.create_models(self)
+
+        class TextItem(self.Model):
+            __tablename__ = 'text_item'
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+
+        self.TextItem = TextItem
+
+    def test_attaches_listeners_to_versioned_mappers(self):
+        mapper = sa.inspect(self.Article)
+        assert mapper in versioning_manager.versioned_mappers
+        for event_name, listener in versioning_manager.mapper_listeners.items():
+            assert sa.event.contains(mapper, event_name, listener)
+
+    def test_does_not_attach_listeners_to_unversioned_mappers(self):
+        for model in (self.TextItem, self.ArticleVersion):
+            mapper = sa.inspect(model)
+            assert mapper not in versioning_manager.versioned_mappers
+            assert not mapper.dispatch.after_insert
+            assert not mapper.dispatch.after_update
+            assert not mapper.dispatch.after_delete
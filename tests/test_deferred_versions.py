@@ -0,0 +1,120 @@
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.plugins import PropertyModTrackerPlugin
+from tests import QueryPool, TestCase, create_test_cases
+
+
+def version_table_writes():
+    return [
+        query
+        for query in QueryPool.queries
+        if query.startswith(('INSERT INTO article_version', 'UPDATE article_version'))
+    ]
+
+
+class DeferredVersionsTestCase(TestCase):
+    deferred_versions = True
+
+    def test_insert_creates_versions(self):
+        articles = [self.Article(name=f'Article {i}') for i in range(5)]
+        self.session.add_all(articles)
+        self.session.commit()
+        for article in articles:
+            assert article.versions.count() == 1
+            assert article.versions[0].name == article.name
+            assert article.versions[0].operation_type == 0
+
+    def test_flush_does_not_write_versions(self):
+        self.session.add(self.Article(name='Some article'))
+        QueryPool.queries = []
+        self.session.flush()
+        assert version_table_writes() == []
+        uow = versioning_manager.unit_of_work(self.session)
+        assert uow.version_objs == {}
+
+    def test_versions_are_written_once_per_transaction(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        QueryPool.queries = []
+        for i in range(10):
+            article.name = f'Name {i}'
+            self.session.flush()
+        self.session.commit()
+        assert len(version_table_writes()) <= 2
+        assert article.versions.count() == 2
+        assert article.versions[1].name == 'Name 9'
+
+    def test_querying_versions_writes_deferred_versions(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.flush()
+        assert article.versions.count() == 1
+        article.name = 'Updated name'
+        self.session.flush()
+        version = self.session.execute(sa.select(self.ArticleVersion)).scalar_one()
+        assert version.name == 'Updated name'
+        self.session.commit()
+
+    def test_flush_versions(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        versioning_manager.flush_versions(self.session)
+        table = self.ArticleVersion.__table__
+        query = sa.select(sa.func.count()).select_from(table)
+        assert self.session.connection().execute(query).scalar() == 1
+        self.session.commit()
+
+    def test_rollback_discards_deferred_versions(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        self.session.rollback()
+        self.session.add(self.Article(name='Another article'))
+        self.session.commit()
+        versions = self.session.query(self.ArticleVersion).all()
+        assert [version.name for version in versions] == ['Another article']
+
+    def test_delete_after_update_in_same_transaction(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated name'
+        self.session.flush()
+        self.session.delete(article)
+        self.session.commit()
+        versions = self.session.query(self.ArticleVersion).all()
+        assert sorted(version.operation_type for version in versions) == [0, 2]
+
+
+create_test_cases(DeferredVersionsTestCase)
+
+
+class TestDeferredVersionsWithPropertyModTracker(TestCase):
+    deferred_versions = True
+    plugins = [PropertyModTrackerPlugin()]
+
+    def test_modification_flags_survive_flushes(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.content = 'Some content'
+        self.session.flush()
+        article.name = 'Updated name'
+        self.session.flush()
+        self.session.commit()
+        version = article.versions[1]
+        assert version.name_mod
+        assert version.content_mod
+        assert not version.description_mod
+
+    def test_deleted_object_flags(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        self.session.delete(article)
+        self.session.flush()
+        self.session.commit()
+        version = self.session.query(self.ArticleVersion).all()[1]
+        assert version.name_mod
+        assert version.content_mod
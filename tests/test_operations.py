@@ -0,0 +1,41 @@
+import pytest
+
+from sqlalchemy_continuum import Operation, versioning_manager
+from tests import TestCase
+
+
+class TestOperations(TestCase):
+    def test_operation_uses_slots(self):
+        operation = Operation(self.Article(), Operation.INSERT)
+        with pytest.raises(AttributeError):
+            operation.some_attribute = 1
+
+    def test_pending_operations_are_drained_on_flush(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.flush()
+        uow = versioning_manager.unit_of_work(self.session)
+        assert not uow.operations.pending
+        assert article in uow.operations
+        assert uow.operations.entities == {self.Article}
+
+    def test_processes_only_new_operations_on_each_flush(self, monkeypatch):
+        uow_cls = versioning_manager.uow_class
+        processed = []
+        original = uow_cls.process_operation
+
+        def process_operation(uow, operation):
+            processed.append(operation.target)
+            original(uow, operation)
+
+        monkeypatch.setattr(uow_cls, 'process_operation', process_operation)
+        articles = [self.Article(name=f'Article {i}') for i in range(3)]
+        self.session.add_all(articles)
+        self.session.flush()
+        assert processed == articles
+
+        processed[:] = []
+        articles[1].name = 'Updated article'
+        self.session.flush()
+        assert processed == [articles[1]]
+        self.session.commit()
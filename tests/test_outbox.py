@@ -0,0 +1,305 @@
+import enum
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.outbox import OutboxPayload, OutboxWorker
+from tests import QueryPool, TestCase, create_test_cases
+
+
+def version_table_writes():
+    return [
+        query
+        for query in QueryPool.queries
+        if query.startswith(('INSERT INTO article_version', 'UPDATE article_version'))
+    ]
+
+
+def outbox_inserts():
+    return [
+        query
+        for query in QueryPool.queries
+        if query.startswith('INSERT INTO version_outbox')
+    ]
+
+
+class OutboxTestCase(TestCase):
+    outbox = True
+
+    def setup_method(self, method):
+        TestCase.setup_method(self, method)
+        self.worker = OutboxWorker(versioning_manager, self.engine)
+
+    def outbox_count(self):
+        table = versioning_manager.outbox_cls.__table__
+        return self.session.execute(
+            sa.select(sa.func.count()).select_from(table)
+        ).scalar()
+
+    def test_commit_writes_single_outbox_entry(self):
+        QueryPool.queries = []
+        self.session.add_all([self.Article(name=f'Article {i}') for i in range(5)])
+        self.session.commit()
+        assert version_table_writes() == []
+        assert len(outbox_inserts()) == 1
+        assert self.session.query(self.ArticleVersion).count() == 0
+        assert self.outbox_count() == 1
+
+    def test_worker_writes_versions(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated article'
+        self.session.commit()
+
+        assert self.worker.drain() == 2
+        assert self.outbox_count() == 0
+        versions = article.versions.all()
+        assert [version.name for version in versions] == [
+            'Some article',
+            'Updated article',
+        ]
+        assert [version.operation_type for version in versions] == [0, 1]
+        if self.versioning_strategy == 'validity':
+            end_tx_column = self.end_transaction_column_name
+            tx_column = self.transaction_column_name
+            assert getattr(versions[0], end_tx_column) == getattr(
+                versions[1], tx_column
+            )
+            assert getattr(versions[1], end_tx_column) is None
+
+    def test_multiple_flushes_in_one_transaction(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.flush()
+        article.name = 'Updated article'
+        self.session.flush()
+        self.session.commit()
+
+        assert self.outbox_count() == 2
+        self.worker.drain()
+        versions = article.versions.all()
+        assert len(versions) == 1
+        assert versions[0].name == 'Updated article'
+
+    def test_batches(self):
+        article = self.Article(name='Article')
+        self.session.add(article)
+        self.session.commit()
+        for i in range(4):
+            article.name = f'Article {i}'
+            self.session.commit()
+
+        self.worker.batch_size = 2
+        assert self.worker.process() == 2
+        assert self.worker.process() == 2
+        assert self.worker.process() == 1
+        assert self.worker.process() == 0
+        assert self.worker.processed_entries == 5
+        assert article.versions.count() == 5
+        if self.versioning_strategy == 'validity':
+            end_tx_column = getattr(
+                self.ArticleVersion, self.end_transaction_column_name
+            )
+            assert (
+                self.session.query(self.ArticleVersion)
+                .filter(end_tx_column.is_(None))
+                .count()
+                == 1
+            )
+
+    def test_delete(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        self.session.delete(article)
+        self.session.commit()
+
+        self.worker.drain()
+        versions = (
+            self.session.query(self.ArticleVersion)
+            .order_by(getattr(self.ArticleVersion, self.transaction_column_name))
+            .all()
+        )
+        assert [version.operation_type for version in versions] == [0, 2]
+
+    def test_rollback_discards_outbox_entries(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        self.session.rollback()
+        assert self.outbox_count() == 0
+
+    def test_lag(self):
+        assert self.worker.lag().entries == 0
+        assert self.worker.lag().oldest_issued_at is None
+
+        self.session.add(self.Article(name='Some article'))
+        self.session.commit()
+        lag = self.worker.lag()
+        assert lag.entries == 1
+        assert lag.oldest_issued_at is not None
+        assert lag.seconds >= 0
+
+        self.worker.drain()
+        assert self.worker.lag().entries == 0
+
+
+create_test_cases(OutboxTestCase)
+
+
+class TestOutboxAssociationVersions(TestCase):
+    outbox = True
+
+    def create_models(self):
+        class Article(self.Model):
+            __tablename__ = 'article'
+            __versioned__ = {'base_classes': (self.Model,)}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+
+        article_tag = sa.Table(
+            'article_tag',
+            self.Model.metadata,
+            sa.Column(
+                'article_id',
+                sa.Integer,
+                sa.ForeignKey('article.id'),
+                primary_key=True,
+            ),
+            sa.Column('tag_id', sa.Integer, sa.ForeignKey('tag.id'), primary_key=True),
+        )
+
+        class Tag(self.Model):
+            __tablename__ = 'tag'
+            __versioned__ = {'base_classes': (self.Model,)}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+
+        Tag.articles = sa.orm.relationship(
+            Article, secondary=article_tag, backref='tags'
+        )
+
+        self.Article = Article
+        self.Tag = Tag
+
+    def test_association_versions_are_written_by_worker(self):
+        article = self.Article(name='Some article')
+        article.tags.append(self.Tag(name='Some tag'))
+        self.session.add(article)
+        self.session.commit()
+
+        table = versioning_manager.association_version_tables.copy().pop()
+        query = sa.select(sa.func.count()).select_from(table)
+        assert self.session.execute(query).scalar() == 0
+
+        OutboxWorker(versioning_manager, self.engine).drain()
+        assert self.session.execute(query).scalar() == 1
+        assert len(article.versions[0].tags) == 1
+
+
+class Color(enum.Enum):
+    red = 1
+    green = 2
+
+
+class Tags(sa.types.TypeDecorator):
+    impl = sa.String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return ','.join(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.split(',')
+
+
+class TestOutboxValueTypes(TestCase):
+    outbox = True
+
+    def create_models(self):
+        class Event(self.Model):
+            __tablename__ = 'event'
+            __versioned__ = {'base_classes': (self.Model,)}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            starts_at = sa.Column(sa.DateTime)
+            day = sa.Column(sa.Date)
+            time_of_day = sa.Column(sa.Time)
+            duration = sa.Column(sa.Interval)
+            price = sa.Column(sa.Numeric(10, 2))
+            key = sa.Column(sa.Uuid)
+            data = sa.Column(sa.LargeBinary)
+            color = sa.Column(sa.Enum(Color))
+            tags = sa.Column(Tags(100))
+
+        self.Event = Event
+
+    def test_payload_round_trip(self):
+        payload = {
+            'values': [
+                datetime(2024, 1, 2, 3, 4, 5, 6),
+                datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                date(2024, 1, 2),
+                time(3, 4, 5),
+                timedelta(days=1, seconds=2, microseconds=3),
+                Decimal('12.30'),
+                uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                b'\x00\xff',
+            ]
+        }
+        column_type = OutboxPayload()
+        dialect = self.engine.dialect
+        value = column_type.process_bind_param(payload, dialect)
+        assert isinstance(value, str)
+        assert column_type.process_result_value(value, dialect) == payload
+
+    def test_payload_rejects_unknown_types(self):
+        with pytest.raises(TypeError):
+            OutboxPayload().process_bind_param({'value': object()}, None)
+
+    def test_versions_keep_value_types(self):
+        values = {
+            'starts_at': datetime(2024, 1, 2, 3, 4, 5, 6),
+            'day': date(2024, 1, 2),
+            'time_of_day': time(3, 4, 5),
+            'duration': timedelta(hours=2),
+            'price': Decimal('12.30'),
+            'key': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'data': b'\x00\xff',
+        }
+        event = self.Event(**values)
+        self.session.add(event)
+        self.session.commit()
+        event.price = Decimal('15.00')
+        self.session.commit()
+
+        OutboxWorker(versioning_manager, self.engine).drain()
+        first, second = event.versions.all()
+        for key, value in values.items():
+            assert getattr(first, key) == value
+        assert second.price == Decimal('15.00')
+
+    def test_versions_keep_custom_type_values(self):
+        event = self.Event(color=Color.red, tags=['a', 'b'])
+        self.session.add(event)
+        self.session.commit()
+        event.color = Color.green
+        event.tags = ['c']
+        self.session.commit()
+
+        OutboxWorker(versioning_manager, self.engine).drain()
+        first, second = event.versions.all()
+        assert first.color == Color.red
+        assert first.tags == ['a', 'b']
+        assert second.color == Color.green
+        assert second.tags == ['c']
@@ -0,0 +1,80 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import version_class, versioning_manager
+from sqlalchemy_continuum.plan import VersioningPlan
+from sqlalchemy_continuum.plugins import PropertyModTrackerPlugin
+from tests import TestCase
+
+
+class TestVersioningPlan(TestCase):
+    def create_models(self):
+        class Article(self.Model):
+            __tablename__ = 'article'
+            __versioned__ = {'exclude': ['content'], 'strategy': 'validity'}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+            content = sa.Column(sa.UnicodeText)
+
+        class Tag(self.Model):
+            __tablename__ = 'tag'
+            __versioned__ = {}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            article_id = sa.Column(sa.Integer, sa.ForeignKey(Article.id))
+            article = sa.orm.relationship(Article, backref='tags')
+
+        self.Article = Article
+        self.Tag = Tag
+
+    def test_compiled_when_classes_are_configured(self):
+        assert isinstance(versioning_manager.plans[self.Article], VersioningPlan)
+        assert (
+            versioning_manager.plan(self.Article)
+            is (versioning_manager.plans[self.Article])
+        )
+
+    def test_versioned_keys(self):
+        plan = versioning_manager.plan(self.Article)
+        assert plan.versioned_keys == ('id', 'name')
+        assert plan.version_cls is version_class(self.Article)
+        assert plan.strategy == 'validity'
+        assert plan.validity
+
+    def test_relationship_keys(self):
+        plan = versioning_manager.plan(self.Tag)
+        assert 'article' in plan.versioned_relationship_keys
+        plan = versioning_manager.plan(self.Article)
+        assert plan.collection_relationship_keys == {'tags', 'versions'}
+
+    def test_version_tables(self):
+        plan = versioning_manager.plan(self.Article)
+        (layout,) = plan.version_tables
+        assert layout.table is version_class(self.Article).__table__
+        assert layout.pk_keys == ('id',)
+        assert layout.end_tx_column is not None
+
+    def test_identity(self):
+        article = self.Article(id=3)
+        assert versioning_manager.plan(self.Article).identity(article) == (3,)
+
+    def test_immutable(self):
+        plan = versioning_manager.plan(self.Article)
+        with pytest.raises(AttributeError):
+            plan.strategy = 'subquery'
+
+    def test_invalidated_by_reset(self):
+        versioning_manager.reset()
+        assert versioning_manager.plans == {}
+
+    def test_recompiled_when_plugins_change(self):
+        plan = versioning_manager.plan(self.Article)
+        assert plan.version_object_hooks == ()
+        versioning_manager.plugins.append(PropertyModTrackerPlugin())
+        try:
+            new_plan = versioning_manager.plan(self.Article)
+            assert new_plan is not plan
+            assert len(new_plan.version_object_hooks) == 1
+        finally:
+            del versioning_manager.plugins[-1]
@@ -0,0 +1,105 @@
+import os
+import tempfile
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.routing import ReplicaReadRouter
+from tests import TestCase, create_test_cases
+
+
+class ReadRouterTestCase(TestCase):
+    def setup_method(self, method):
+        # Skipped before the schema is created, teardown_method is not run
+        # for skipped tests.
+        if os.environ.get('DB', 'sqlite') != 'sqlite':
+            pytest.skip('read router tests use a SQLite file as replica')
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.replica = sa.create_engine(f'sqlite:///{self.path}')
+        self.replica_queries = []
+        sa.event.listen(self.replica, 'before_cursor_execute', self.log_replica)
+        self.read_router = ReplicaReadRouter(self.replica)
+        TestCase.setup_method(self, method)
+        self.Model.metadata.create_all(self.replica)
+
+    def teardown_method(self, method):
+        TestCase.teardown_method(self, method)
+        self.replica.dispose()
+        os.remove(self.path)
+
+    def log_replica(self, conn, cursor, statement, *args):
+        self.replica_queries.append(statement)
+
+    def replicate(self):
+        tables = versioning_manager.audit_tables()
+        with self.engine.connect() as source, self.replica.begin() as target:
+            for table in tables:
+                target.execute(table.delete())
+                rows = [row._asdict() for row in source.execute(table.select())]
+                if rows:
+                    target.execute(table.insert(), rows)
+        self.replica_queries = []
+
+    def create_article(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        return article
+
+    def test_history_is_read_from_replica(self):
+        article = self.create_article()
+        self.replicate()
+        with self.replica.begin() as connection:
+            connection.execute(
+                self.ArticleVersion.__table__.update().values(name='Replica')
+            )
+
+        assert article.versions[0].name == 'Replica'
+        assert self.replica_queries
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        article = self.create_article()
+        assert [version.name for version in article.versions] == ['Some article']
+
+    def test_uncommitted_versions_are_read_from_primary(self):
+        article = self.create_article()
+        self.replicate()
+        article.name = 'Updated article'
+        self.session.flush()
+        assert article.versions.count() == 2
+        assert not self.replica_queries
+
+    def test_replicated_write_switches_back_to_replica(self):
+        article = self.create_article()
+        article.versions.all()
+        self.replicate()
+        article.versions.all()
+        assert self.replica_queries
+        self.replica_queries = []
+        article.versions.all()
+        # The replication check is not repeated once the write has been
+        # replicated.
+        assert not any('FROM "transaction"' in q for q in self.replica_queries)
+
+    def test_version_traversal_is_read_from_replica(self):
+        article = self.create_article()
+        article.name = 'Updated article'
+        self.session.commit()
+        self.replicate()
+
+        version = article.versions[1]
+        assert version.previous.name == 'Some article'
+        assert version.changeset == {'name': ['Some article', 'Updated article']}
+        assert version.transaction.changed_entities
+        assert self.replica_queries
+
+    def test_parent_objects_are_read_from_primary(self):
+        self.create_article()
+        self.replicate()
+        self.session.query(self.Article).all()
+        assert not self.replica_queries
+
+
+create_test_cases(ReadRouterTestCase)
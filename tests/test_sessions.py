@@ -1,3 +1,5 @@
+import pytest
+import sqlalchemy as sa
 from sqlalchemy.orm.session import Session
 
 from sqlalchemy_continuum import UnitOfWork, versioning_manager
@@ -31,6 +33,27 @@ class TestSessions(TestCase):
             > list(article.versions)[-1].transaction_id
         )
 
+    def test_multiple_connections_get_own_units_of_work(self):
+        self.session2 = Session(bind=self.engine.connect())
+        article = self.Article(name='Session1 article')
+        article2 = self.Article(name='Session2 article')
+        self.session.add(article)
+        self.session2.add(article2)
+        self.session.flush()
+        self.session2.flush()
+
+        assert versioning_manager.unit_of_work(
+            self.session
+        ) is not versioning_manager.unit_of_work(self.session2)
+        assert set(versioning_manager.session_connection_map) == {
+            self.session,
+            self.session2,
+        }
+        self.session.commit()
+        self.session2.commit()
+        assert versioning_manager.units_of_work == {}
+        assert article.versions[0].transaction.id != article2.versions[0].transaction.id
+
     def test_manual_transaction_creation(self):
         uow = versioning_manager.unit_of_work(self.session)
         transaction = uow.create_transaction(self.session)
@@ -48,11 +71,114 @@ class TestSessions(TestCase):
         self.session.commit()
 
 
+class TestSessionsWithoutVersionedChanges(TestCase):
+    def create_models(self):
+        TestCase.create_models(self)
+
+        class TextItem(self.Model):
+            __tablename__ = 'text_item'
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+
+        self.TextItem = TextItem
+
+    def test_flush_does_not_create_unit_of_work(self):
+        item = self.TextItem(name='Some item')
+        self.session.add(item)
+        self.session.flush()
+        item.name = 'Updated name'
+        self.session.flush()
+        assert versioning_manager.units_of_work == {}
+        assert versioning_manager.session_connection_map == {}
+        self.session.commit()
+
+    def test_before_flush_does_not_begin_transaction(self):
+        begins = []
+
+        def begin(conn):
+            begins.append(conn)
+
+        sa.event.listen(self.engine, 'begin', begin)
+        session = Session(bind=self.engine)
+        session.add(self.TextItem(name='Some item'))
+        versioning_manager.before_flush(session, None, None)
+        session.close()
+        sa.event.remove(self.engine, 'begin', begin)
+        assert begins == []
+
+    def test_versioned_change_after_unversioned_flush(self):
+        self.session.add(self.TextItem(name='Some item'))
+        self.session.flush()
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        assert article.versions.count() == 1
+
+    def test_versioned_flush_checks_session_once(self, monkeypatch):
+        checks = []
+        is_session_modified = versioning_manager.is_session_modified
+
+        def count_checks(session):
+            checks.append(session)
+            return is_session_modified(session)
+
+        monkeypatch.setattr(versioning_manager, 'is_session_modified', count_checks)
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        assert checks.count(self.session) == 1
+
+
 class TestUnitOfWork(TestCase):
     def test_with_session_arg(self):
         uow = versioning_manager.unit_of_work(self.session)
         assert isinstance(uow, UnitOfWork)
 
+    def test_cloned_connection_shares_unit_of_work(self):
+        uow = versioning_manager.unit_of_work(self.session)
+        clone = self.session.connection().execution_options(foo='bar')
+        assert versioning_manager._uow_from_conn(clone) is uow
+
+    def test_connection_clones_share_unit_of_work(self):
+        uow = versioning_manager.unit_of_work(self.session)
+        connection = self.session.connection()
+        # Connection.execution_options clones connections like this on
+        # SQLAlchemy 1.4.
+        clone = sa.engine.Connection.__new__(sa.engine.Connection)
+        clone.__dict__ = connection.__dict__.copy()
+        versioning_manager.track_cloned_connections(clone, {})
+        assert versioning_manager._uow_from_conn(clone) is uow
+        self.session.rollback()
+        assert versioning_manager.units_of_work == {}
+        assert versioning_manager.connection_clones == {}
+
+    def test_connections_sharing_dbapi_connection_are_kept_apart(self):
+        engine = sa.create_engine('sqlite://', poolclass=sa.pool.StaticPool)
+        connection = engine.connect()
+        other = engine.connect()
+        assert connection.connection.dbapi_connection is (
+            other.connection.dbapi_connection
+        )
+        session = Session(bind=connection)
+        session.begin()
+        uow = versioning_manager.unit_of_work(session)
+        assert versioning_manager._uow_from_conn(connection) is uow
+        with pytest.raises(KeyError):
+            versioning_manager._uow_from_conn(other)
+        session.close()
+        other.close()
+        connection.close()
+        engine.dispose()
+
+    def test_commit_clears_registry(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        assert versioning_manager.units_of_work
+        self.session.commit()
+        assert versioning_manager.units_of_work == {}
+        assert versioning_manager.session_connection_map == {}
+        assert versioning_manager.connection_session_map == {}
+
 
 class TestExternalTransactionSession(TestCase):
     def test_session_with_external_transaction(self):
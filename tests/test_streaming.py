@@ -0,0 +1,125 @@
+import gc
+import tracemalloc
+import weakref
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.plugins import PropertyModTrackerPlugin
+from tests import TestCase, create_test_cases
+
+
+class StreamingTestCase(TestCase):
+    streaming = True
+
+    def test_insert_creates_versions(self):
+        articles = [self.Article(name=f'Article {i}') for i in range(5)]
+        self.session.add_all(articles)
+        self.session.commit()
+        for article in articles:
+            assert article.versions.count() == 1
+            assert article.versions[0].name == article.name
+
+    def test_releases_version_objects_after_each_flush(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.flush()
+        uow = versioning_manager.unit_of_work(self.session)
+        assert uow.version_objs == {}
+        assert len(uow.written_version_keys) == 1
+
+    def test_written_version_objects_are_garbage_collected(self):
+        refs = []
+        uow_cls = versioning_manager.uow_class
+        original = uow_cls.get_or_create_version_object
+
+        def get_or_create_version_object(uow, target, plan=None):
+            version_obj = original(uow, target, plan)
+            refs.append(weakref.ref(version_obj))
+            return version_obj
+
+        uow_cls.get_or_create_version_object = get_or_create_version_object
+        try:
+            for i in range(10):
+                self.session.add(self.Article(name=f'Article {i}'))
+                self.session.flush()
+        finally:
+            uow_cls.get_or_create_version_object = original
+        gc.collect()
+        assert len(refs) == 10
+        assert all(ref() is None for ref in refs)
+        self.session.commit()
+
+    def test_changes_in_later_flush_update_written_version(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.flush()
+        article.name = 'Updated name'
+        self.session.flush()
+        article.content = 'Some content'
+        self.session.commit()
+        assert article.versions.count() == 1
+        version = article.versions[0]
+        assert version.name == 'Updated name'
+        assert version.content == 'Some content'
+
+    def test_delete_in_later_flush(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated name'
+        self.session.flush()
+        self.session.delete(article)
+        self.session.commit()
+        versions = self.session.query(self.ArticleVersion).all()
+        assert sorted(version.operation_type for version in versions) == [0, 2]
+
+
+create_test_cases(StreamingTestCase)
+
+
+class TestStreamingMemory(TestCase):
+    streaming = True
+
+    def test_memory_does_not_grow_with_flushed_versions(self):
+        # Captured SQL log records would otherwise dominate the measurement.
+        self.engine.echo = False
+
+        def import_rows(count):
+            for i in range(count):
+                self.session.add(self.Article(name=f'Article {i}'))
+                if i % 100 == 99:
+                    self.session.flush()
+                    self.session.expunge_all()
+
+        import_rows(200)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            import_rows(500)
+            gc.collect()
+            small = tracemalloc.get_traced_memory()[0]
+            import_rows(2000)
+            gc.collect()
+            large = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        # Only the compact keys of the written rows are retained.
+        assert (large - small) / 2000 < 1024
+        self.session.commit()
+
+
+class TestStreamingWithPropertyModTracker(TestCase):
+    streaming = True
+    plugins = [PropertyModTrackerPlugin()]
+
+    def test_modification_flags_accumulate_over_flushes(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.content = 'Some content'
+        self.session.flush()
+        article.name = 'Updated name'
+        self.session.commit()
+        version = article.versions[1]
+        assert version.name_mod
+        assert version.content_mod
+        assert not version.description_mod
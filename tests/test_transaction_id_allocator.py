@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.transaction import (
+    LockClaim,
+    TransactionIdAllocator,
+    logger,
+)
+from tests import QueryPool, TestCase
+
+
+@pytest.mark.skipif("os.environ.get('DB') != 'postgres'")
+class TestTransactionIdPreallocation(TestCase):
+    transaction_id_block_size = 10
+
+    def test_assigns_id_on_creation(self):
+        uow = versioning_manager.unit_of_work(self.session)
+        transaction = uow.create_transaction(self.session)
+        assert transaction.id == 1
+        assert transaction in self.session.new
+
+    def test_consecutive_transactions(self):
+        articles = []
+        for i in range(3):
+            article = self.Article(name=f'Article {i}')
+            self.session.add(article)
+            self.session.commit()
+            articles.append(article)
+        assert [article.versions[0].transaction_id for article in articles] == [
+            1,
+            2,
+            3,
+        ]
+        assert [article.versions[0].transaction.id for article in articles] == [1, 2, 3]
+
+    def test_fetches_one_block_per_block_size(self):
+        QueryPool.queries = []
+        for i in range(12):
+            self.session.add(self.Article(name=f'Article {i}'))
+            self.session.commit()
+        block_queries = [
+            query for query in QueryPool.queries if 'generate_series' in query.lower()
+        ]
+        assert len(block_queries) == 2
+
+    def test_transaction_row_written_by_session_flush(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.flush()
+        uow = versioning_manager.unit_of_work(self.session)
+        assert uow.current_transaction not in uow.version_session
+        assert self.session.get(versioning_manager.transaction_cls, 1) is (
+            uow.current_transaction
+        )
+
+
+class TestTransactionIdAllocator(TestCase):
+    def test_other_dialects_are_not_preallocated(self):
+        if self.engine.dialect.name == 'postgresql':
+            pytest.skip('allocation is supported on PostgreSQL')
+        allocator = TransactionIdAllocator(versioning_manager.transaction_cls, 3)
+        assert allocator(self.session.connection()) is None
+        assert allocator.claims == {}
+        assert allocator.lock_connections == {}
+
+    @pytest.mark.skipif("os.environ.get('DB') != 'postgres'")
+    def test_second_writer_process_falls_back(self, monkeypatch):
+        warnings = []
+        monkeypatch.setattr(logger, 'warning', warnings.append)
+        transaction_cls = versioning_manager.transaction_cls
+        allocator = TransactionIdAllocator(transaction_cls, 3)
+        allocator(self.session.connection())
+        # A second engine stands in for the engine of another process.
+        engine = sa.create_engine(self.engine.url)
+        other = TransactionIdAllocator(transaction_cls, 3)
+        try:
+            with engine.connect() as connection:
+                assert other(connection) is None
+                assert other(connection) is None
+            assert len(warnings) == 1
+            assert other.lock_connections == {engine: None}
+        finally:
+            other.close()
+            allocator.close()
+            engine.dispose()
+
+    @pytest.mark.skipif("os.environ.get('DB') != 'postgres'")
+    def test_threads_wait_for_lock(self, monkeypatch):
+        allocator = TransactionIdAllocator(versioning_manager.transaction_cls, 3)
+        acquiring = threading.Event()
+        release = threading.Event()
+        acquire_lock = allocator.acquire_lock
+
+        def slow_acquire_lock(engine):
+            acquiring.set()
+            release.wait()
+            return acquire_lock(engine)
+
+        monkeypatch.setattr(allocator, 'acquire_lock', slow_acquire_lock)
+        ids = []
+
+        def allocate():
+            with self.engine.connect() as connection:
+                ids.append(allocator(connection))
+
+        claiming = threading.Thread(target=allocate)
+        waiting = threading.Thread(target=allocate)
+        try:
+            claiming.start()
+            acquiring.wait()
+            waiting.start()
+            waiting.join(0.2)
+            assert waiting.is_alive()
+            assert ids == []
+        finally:
+            release.set()
+            claiming.join()
+            waiting.join()
+            allocator.close()
+        assert sorted(ids) == [1, 2]
+
+    @pytest.mark.skipif("os.environ.get('DB') != 'postgres'")
+    def test_coroutines_of_claiming_thread_do_not_wait(self):
+        allocator = TransactionIdAllocator(versioning_manager.transaction_cls, 3)
+        allocator.claims[self.engine] = LockClaim(
+            threading.get_ident(), threading.Event()
+        )
+        assert allocator(self.session.connection()) is None
+
+    @pytest.mark.skipif("os.environ.get('DB') != 'postgres'")
+    def test_sequence_block_prefetch(self):
+        allocator = TransactionIdAllocator(versioning_manager.transaction_cls, 5)
+        connection = self.session.connection()
+        ids = allocator.fetch_block(connection)
+        assert len(ids) == 5
+        assert ids == sorted(set(ids))
+
+
+@pytest.mark.skipif("os.environ.get('DB') == 'postgres'")
+class TestTransactionIdPreallocationFallback(TestCase):
+    transaction_id_block_size = 10
+
+    def test_inserts_transactions_right_away(self):
+        QueryPool.queries = []
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        assert article.versions[0].transaction.id == 1
+        assert not any(
+            'generate_series' in query.lower() for query in QueryPool.queries
+        )
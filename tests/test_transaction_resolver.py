@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import as_of, resolve_transaction_id, versioning_manager
+from sqlalchemy_continuum.transaction import TransactionResolver
+from tests import QueryPool, TestCase
+
+
+class TestTransactionResolver(TestCase):
+    def setup_method(self, method):
+        TestCase.setup_method(self, method)
+        Transaction = versioning_manager.transaction_cls
+        self.article = self.Article(name='First')
+        self.session.add(self.article)
+        self.session.commit()
+        self.article.name = 'Second'
+        self.session.commit()
+        self.tx1, self.tx2 = [
+            version.transaction.id for version in self.article.versions
+        ]
+        for transaction_id, issued_at in [
+            (self.tx1, datetime(2024, 3, 5, 12)),
+            (self.tx2, datetime(2024, 3, 5, 14)),
+        ]:
+            self.session.execute(
+                sa.update(Transaction)
+                .where(Transaction.id == transaction_id)
+                .values(issued_at=issued_at)
+            )
+        self.session.commit()
+
+    def resolve(self, moment):
+        return resolve_transaction_id(self.session, self.Article, moment)
+
+    def test_issued_at_is_indexed(self):
+        table = versioning_manager.transaction_cls.__table__
+        assert table.c.issued_at.index
+
+    def test_resolves_last_transaction_issued_at_or_before(self):
+        assert self.resolve(datetime(2024, 3, 5, 11)) is None
+        assert self.resolve(datetime(2024, 3, 5, 12)) == self.tx1
+        assert self.resolve(datetime(2024, 3, 5, 13)) == self.tx1
+        assert self.resolve(datetime(2024, 3, 5, 14)) == self.tx2
+        assert self.resolve(datetime(2024, 3, 6)) == self.tx2
+
+    def test_caches_past_resolutions(self):
+        self.resolve(datetime(2024, 3, 5, 13))
+        QueryPool.queries = []
+        assert self.resolve(datetime(2024, 3, 5, 13)) == self.tx1
+        assert not QueryPool.queries
+
+    def test_does_not_cache_recent_points_in_time(self):
+        moment = datetime.now(timezone.utc)
+        self.resolve(moment)
+        QueryPool.queries = []
+        assert self.resolve(moment) == self.tx2
+        assert QueryPool.queries
+
+    def test_resolves_aware_datetimes_as_utc(self):
+        if self.engine.dialect.name == 'postgresql':
+            self.session.execute(sa.text("SET TIME ZONE 'Asia/Tokyo'"))
+        moment = datetime(2024, 3, 5, 15, tzinfo=timezone(timedelta(hours=2)))
+        assert self.resolve(moment) == self.tx1
+        resolver = versioning_manager.transaction_resolver
+        assert (self.engine, datetime(2024, 3, 5, 13)) in resolver.cache
+        assert self.resolve(datetime(2024, 3, 5, 13)) == self.tx1
+
+    def test_cache_is_bounded(self):
+        resolver = TransactionResolver(versioning_manager.transaction_cls, cache_size=2)
+        for hour in range(12, 16):
+            resolver(self.session, datetime(2024, 3, 5, hour))
+        assert list(resolver.cache) == [
+            (self.engine, datetime(2024, 3, 5, 14)),
+            (self.engine, datetime(2024, 3, 5, 15)),
+        ]
+
+    def test_as_of_accepts_datetimes(self):
+        versions = as_of(self.session, self.Article, datetime(2024, 3, 5, 13)).all()
+        assert [version.name for version in versions] == ['First']
+        assert as_of(self.session, self.Article, datetime(2024, 3, 5, 11)).all() == []
+        versions = as_of(
+            self.session, self.Article, datetime.now(timezone.utc) - timedelta(days=1)
+        ).all()
+        assert [version.name for version in versions] == ['Second']
@@ -0,0 +1,72 @@
+import sqlalchemy as sa
+
+from tests import QueryPool, TestCase
+
+
+def article_selects():
+    return [
+        query
+        for query in QueryPool.queries
+        if query.startswith('SELECT') and 'FROM article' in query.split('WHERE')[0]
+    ]
+
+
+class TestUnloadedAttributes(TestCase):
+    def create_models(self):
+        class Article(self.Model):
+            __tablename__ = 'article'
+            __versioned__ = {}
+
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=False)
+            content = sa.orm.deferred(sa.Column(sa.UnicodeText))
+            description = sa.orm.deferred(sa.Column(sa.UnicodeText))
+
+        self.Article = Article
+
+    def test_loads_deferred_attributes_with_single_select(self):
+        self.session.add_all(
+            [
+                self.Article(
+                    name=f'Article {i}',
+                    content=f'Content {i}',
+                    description=f'Description {i}',
+                )
+                for i in range(5)
+            ]
+        )
+        self.session.commit()
+        self.session.expunge_all()
+
+        articles = self.session.query(self.Article).order_by(self.Article.id).all()
+        for article in articles:
+            article.name = 'Updated name'
+        QueryPool.queries = []
+        self.session.flush()
+        assert len(article_selects()) == 1
+        self.session.commit()
+
+        for i, article in enumerate(articles):
+            version = article.versions[1]
+            assert version.name == 'Updated name'
+            assert version.content == f'Content {i}'
+            assert version.description == f'Description {i}'
+
+    def test_loads_expired_attributes(self):
+        article = self.Article(name='Some article', content='Some content')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated name'
+        self.session.expire(article, ['content'])
+        self.session.commit()
+        assert article.versions[1].content == 'Some content'
+
+    def test_skips_deleted_objects(self):
+        article = self.Article(name='Some article', content='Some content')
+        self.session.add(article)
+        self.session.commit()
+        self.session.expire(article, ['content'])
+        self.session.delete(article)
+        self.session.commit()
+        versions = self.session.query(self.ArticleVersion).all()
+        assert versions[1].operation_type == 2
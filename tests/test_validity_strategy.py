@@ -1,7 +1,7 @@
 import sqlalchemy as sa
 
 from sqlalchemy_continuum import version_class
-from tests import TestCase
+from tests import QueryPool, TestCase
 
 
 class TestValidityStrategy(TestCase):
@@ -48,6 +48,37 @@ class TestValidityStrategy(TestCase):
             == list(article.versions)[-1].transaction_id
         )
 
+    def test_closes_previous_versions_with_single_update(self):
+        articles = [self.Article(name=f'Article {i}') for i in range(10)]
+        self.session.add_all(articles)
+        self.session.commit()
+
+        for article in articles:
+            article.name += ' updated'
+        QueryPool.queries = []
+        self.session.commit()
+        statements = [
+            query
+            for query in QueryPool.queries
+            if query.startswith('UPDATE article_version')
+            or query.startswith('SELECT article_version')
+        ]
+        assert len(statements) == 1
+        for article in articles:
+            versions = list(article.versions)
+            assert versions[0].end_transaction_id == versions[1].transaction_id
+            assert versions[1].end_transaction_id is None
+
+    def test_does_not_close_versions_of_other_entities(self):
+        article = self.Article(name='Something')
+        article2 = self.Article(name='Something else')
+        self.session.add_all([article, article2])
+        self.session.commit()
+
+        article.name = 'Some other thing'
+        self.session.commit()
+        assert list(article2.versions)[-1].end_transaction_id is None
+
 
 class TestJoinTableInheritanceWithValidityVersioning(TestCase):
     def create_models(self):
@@ -99,3 +130,31 @@ class TestJoinTableInheritanceWithValidityVersioning(TestCase):
         assert 'end_transaction_id' in self.TextItemVersion.__table__.c
         assert 'end_transaction_id' in self.ArticleVersion.__table__.c
         assert 'end_transaction_id' in self.BlogPostVersion.__table__.c
+
+    def test_closes_previous_versions_with_one_update_per_table(self):
+        article = self.Article()
+        blogpost = self.BlogPost()
+        self.session.add_all([article, blogpost])
+        self.session.commit()
+
+        self.session.delete(article)
+        self.session.delete(blogpost)
+        QueryPool.queries = []
+        self.session.commit()
+        updates = [
+            query
+            for query in QueryPool.queries
+            if query.startswith('UPDATE') and '_version' in query
+        ]
+        assert sorted(query.split()[1] for query in updates) == [
+            'article_version',
+            'blog_post_version',
+            'text_item_version',
+        ]
+        versions = (
+            self.session.query(self.TextItemVersion)
+            .filter_by(id=article.id)
+            .order_by(self.TextItemVersion.transaction_id)
+            .all()
+        )
+        assert versions[0].end_transaction_id == versions[1].transaction_id
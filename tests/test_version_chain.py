@@ -0,0 +1,178 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_continuum import version_class, versioning_manager
+from sqlalchemy_continuum.outbox import OutboxWorker
+from tests import QueryPool, TestCase, create_test_cases
+
+
+class VersionChainTestCase(TestCase):
+    version_chain = True
+
+    def test_schema_contains_chain_columns(self):
+        table = version_class(self.Article).__table__
+        assert 'previous_transaction_id' in table.c
+        assert 'version_number' in table.c
+        assert table.c.version_number.nullable
+
+    def test_chain_columns_are_assigned(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+        self.session.delete(article)
+        self.session.commit()
+
+        versions = (
+            self.session.query(self.ArticleVersion)
+            .order_by(getattr(self.ArticleVersion, self.transaction_column_name))
+            .all()
+        )
+        tx_column = self.transaction_column_name
+        assert [version.version_number for version in versions] == [1, 2, 3]
+        assert [version.previous_transaction_id for version in versions] == [
+            None,
+            getattr(versions[0], tx_column),
+            getattr(versions[1], tx_column),
+        ]
+
+    def test_multiple_flushes_in_one_transaction(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.flush()
+        article.name = 'Some other thing'
+        self.session.commit()
+        assert article.versions[0].version_number == 1
+
+    def test_index_previous_and_next_are_point_lookups(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        for i in range(3):
+            article.name = f'Update {i}'
+            self.session.commit()
+        versions = article.versions.all()
+
+        QueryPool.queries = []
+        assert [version.index for version in versions] == [0, 1, 2, 3]
+        assert QueryPool.queries == []
+
+        assert versions[2].previous == versions[1]
+        assert versions[2].next == versions[3]
+        assert versions[0].previous is None
+        assert versions[3].next is None
+        assert not any('max(' in query.lower() for query in QueryPool.queries)
+
+    def test_changeset_excludes_chain_columns(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+        assert article.versions[1].changeset == {
+            'name': ['Something', 'Some other thing']
+        }
+
+
+create_test_cases(VersionChainTestCase)
+
+
+class TestVersionChainWithUnnumberedVersions(TestCase):
+    version_chain = True
+
+    def test_index_falls_back_to_counting(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Some other thing'
+        self.session.commit()
+        table = self.ArticleVersion.__table__
+        self.session.execute(table.update().values(version_number=None))
+        self.session.expire_all()
+        assert article.versions[1].index == 1
+
+
+class VersionChainWithPreexistingVersionsTestCase(TestCase):
+    version_chain = True
+
+    def test_previous_and_next_fall_back_to_subqueries(self):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        for i in range(2):
+            article.name = f'Update {i}'
+            self.session.commit()
+        # Version rows written before the option was enabled.
+        table = self.ArticleVersion.__table__
+        self.session.execute(
+            table.update().values(previous_transaction_id=None, version_number=None)
+        )
+        self.session.commit()
+        article.name = 'Update after enabling'
+        self.session.commit()
+
+        versions = article.versions.all()
+        assert len(versions) == 4
+        assert versions[0].previous is None
+        assert versions[0].next == versions[1]
+        assert versions[1].previous == versions[0]
+        assert versions[1].next == versions[2]
+        assert versions[2].previous == versions[1]
+        assert versions[2].next == versions[3]
+        assert versions[3].previous == versions[2]
+        assert versions[3].next is None
+
+
+create_test_cases(VersionChainWithPreexistingVersionsTestCase)
+
+
+class TestVersionChainWithOutbox(TestCase):
+    version_chain = True
+    outbox = True
+
+    @pytest.mark.parametrize('batch_size', [1, 1000])
+    def test_worker_assigns_chain_columns(self, batch_size):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        for i in range(3):
+            article.name = f'Update {i}'
+            self.session.commit()
+        OutboxWorker(versioning_manager, self.engine, batch_size=batch_size).drain()
+
+        versions = article.versions.all()
+        assert [version.version_number for version in versions] == [1, 2, 3, 4]
+        assert versions[0].previous_transaction_id is None
+        for previous, version in zip(versions, versions[1:]):
+            assert version.previous_transaction_id == previous.transaction_id
+
+    @pytest.mark.parametrize('batch_size', [1, 1000])
+    def test_worker_bounds_lookups_by_transaction(self, batch_size):
+        article = self.Article(name='Something')
+        self.session.add(article)
+        self.session.commit()
+        worker = OutboxWorker(versioning_manager, self.engine, batch_size=batch_size)
+        worker.drain()
+        article.name = 'Update 1'
+        self.session.commit()
+        article.name = 'Update 2'
+        self.session.commit()
+
+        # Make the entry of the earlier transaction visible after the later.
+        table = versioning_manager.outbox_cls.__table__
+        entries = self.session.execute(
+            sa.select(table.c.id, table.c.transaction_id).order_by(table.c.id)
+        ).all()
+        self.session.execute(
+            table.update()
+            .where(table.c.id == entries[0].id)
+            .values(id=entries[1].id + 1)
+        )
+        self.session.commit()
+        worker.drain()
+
+        first, second, _ = article.versions.all()
+        assert second.transaction_id == entries[0].transaction_id
+        assert second.previous_transaction_id == first.transaction_id
+        assert second.version_number == 2
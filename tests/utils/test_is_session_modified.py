@@ -0,0 +1,45 @@
+from sqlalchemy_continuum import is_session_modified, utils
+from tests import TestCase
+
+
+class TestIsSessionModified(TestCase):
+    def test_clean_session(self):
+        self.session.add(self.Article(name='Some article'))
+        self.session.commit()
+        assert not is_session_modified(self.session)
+
+    def test_new_object(self):
+        self.session.add(self.Article(name='Some article'))
+        assert is_session_modified(self.session)
+
+    def test_deleted_object(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        self.session.delete(article)
+        assert is_session_modified(self.session)
+
+    def test_modified_object(self):
+        article = self.Article(name='Some article')
+        self.session.add(article)
+        self.session.commit()
+        article.name = 'Updated name'
+        assert is_session_modified(self.session)
+
+    def test_only_inspects_dirty_objects(self, monkeypatch):
+        articles = [self.Article(name=f'Article {i}') for i in range(20)]
+        self.session.add_all(articles)
+        self.session.commit()
+        for article in articles:
+            article.name
+        articles[0].name = 'Updated name'
+
+        inspected = []
+
+        def is_modified(obj):
+            inspected.append(obj)
+            return True
+
+        monkeypatch.setattr(utils, 'is_modified', is_modified)
+        assert is_session_modified(self.session)
+        assert inspected == [articles[0]]